@@ -0,0 +1,141 @@
+"""
+Fixtures for benchmarks of execute -> DataFrame -> history pipeline.
+
+Synthetic datasets are described by column kind (numeric, text, datetime), shape (narrow, wide)
+and number of rows. Row counts are read from SQLDBCLIENT_BENCH_ROWS environment variable
+(comma-separated, e.g. ``1000,100000,10000000``). Benchmarks run against SQLite, and also
+against PostgreSQL when SQLDBCLIENT_BENCH_PG_URL environment variable contains a connection string.
+"""
+import os
+import tracemalloc
+from typing import Callable, Any
+
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, MetaData, Table, Column, BigInteger, Float, Text, DateTime
+
+try:
+    import pytest_benchmark  # noqa
+except ImportError:
+    collect_ignore_glob = ['test_*.py']
+
+from sqldbclient.sql_executor import SqlExecutor
+from sqldbclient.sql_history_manager import SqlHistoryManager
+
+ROW_COUNTS = [int(n) for n in os.environ.get('SQLDBCLIENT_BENCH_ROWS', '1000,100000').split(',')]
+PG_URL = os.environ.get('SQLDBCLIENT_BENCH_PG_URL')
+SHAPES = {'narrow': 3, 'wide': 50}
+KINDS = ('numeric', 'text', 'datetime')
+ROUNDS = int(os.environ.get('SQLDBCLIENT_BENCH_ROUNDS', '3'))
+
+
+def make_frame(kind: str, n_columns: int, n_rows: int, seed: int = 0) -> pd.DataFrame:
+    """Creates synthetic pandas DataFrame with columns of the given kind"""
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for i in range(n_columns):
+        if kind == 'numeric':
+            values = rng.integers(0, 1_000_000, n_rows) if i % 2 == 0 else rng.random(n_rows)
+        elif kind == 'text':
+            alphabet = np.array(list('abcdefghijklmnopqrstuvwxyz'))
+            values = [''.join(chars) for chars in alphabet[rng.integers(0, len(alphabet), (n_rows, 12))]]
+        elif kind == 'datetime':
+            values = pd.Timestamp('2020-01-01') + pd.to_timedelta(rng.integers(0, 10 ** 8, n_rows), unit='s')
+        else:
+            raise ValueError(f'Unknown column kind {kind}')
+        columns[f'{kind}_{i}'] = values
+    return pd.DataFrame(columns)
+
+
+def measure_peak_memory(func: Callable[..., Any], *args, **kwargs) -> int:
+    """Runs func once and returns peak memory in bytes allocated during the run"""
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_benchmark(benchmark, n_rows: int, func: Callable[..., Any], *args, setup=None, **kwargs) -> Any:
+    """Benchmarks func, and records peak memory and throughput in rows per second to benchmark extra info"""
+    if setup is None:
+        benchmark.extra_info['peak_memory_bytes'] = measure_peak_memory(func, *args, **kwargs)
+        result = benchmark.pedantic(func, args=args, kwargs=kwargs, rounds=ROUNDS, iterations=1)
+    else:
+        setup_args, setup_kwargs = setup()
+        benchmark.extra_info['peak_memory_bytes'] = measure_peak_memory(func, *setup_args, **setup_kwargs)
+        result = benchmark.pedantic(func, setup=setup, rounds=ROUNDS)
+    benchmark.extra_info['rows'] = n_rows
+    if benchmark.stats:  # not collected with --benchmark-disable
+        benchmark.extra_info['rows_per_second'] = n_rows / benchmark.stats.stats.mean
+    return result
+
+
+def fill_table(engine, table_name: str, frame: pd.DataFrame, chunk_size: int = 10_000) -> None:
+    """Creates table with columns matching frame and inserts frame rows into it"""
+    column_types = {'i': BigInteger, 'f': Float, 'M': DateTime}
+    table = Table(table_name, MetaData(), *(
+        Column(name, column_types.get(dtype.kind, Text)) for name, dtype in frame.dtypes.items()
+    ))
+    table.create(engine)
+    with engine.begin() as connection:
+        for start in range(0, len(frame), chunk_size):
+            chunk = frame.iloc[start:start + chunk_size].astype(object)
+            connection.execute(table.insert(), chunk.to_dict(orient='records'))
+
+
+@pytest.fixture(params=ROW_COUNTS, ids=lambda n: f'{n}rows')
+def n_rows(request) -> int:
+    return request.param
+
+
+@pytest.fixture(params=list(SHAPES), ids=str)
+def shape(request) -> str:
+    return request.param
+
+
+@pytest.fixture(params=KINDS, ids=str)
+def kind(request) -> str:
+    return request.param
+
+
+@pytest.fixture
+def frame(kind, shape, n_rows) -> pd.DataFrame:
+    return make_frame(kind, SHAPES[shape], n_rows)
+
+
+@pytest.fixture(params=['sqlite', 'postgresql'])
+def database_url(request, tmp_path_factory) -> str:
+    if request.param == 'postgresql':
+        if not PG_URL:
+            pytest.skip('SQLDBCLIENT_BENCH_PG_URL is not set')
+        return PG_URL
+    return f"sqlite:///{tmp_path_factory.getbasetemp() / 'bench_source.db'}"
+
+
+@pytest.fixture
+def sql_executor(database_url, tmp_path) -> SqlExecutor:
+    return SqlExecutor(
+        engine=create_engine(database_url),
+        max_rows_read=max(ROW_COUNTS),
+        history_db_name=str(tmp_path / 'bench_history.db'),
+    )
+
+
+@pytest.fixture
+def history_manager(tmp_path) -> SqlHistoryManager:
+    return SqlHistoryManager(str(tmp_path / 'bench_history.db'))
+
+
+@pytest.fixture
+def source_table(sql_executor, frame, kind, shape, n_rows) -> str:
+    """Name of a table in source database filled with synthetic frame (created once per dataset)"""
+    table_name = f'bench_{kind}_{shape}_{n_rows}'
+    engine = sql_executor._engine
+    with engine.connect() as connection:
+        exists = engine.dialect.has_table(connection, table_name)
+    if not exists:
+        fill_table(engine, table_name, frame)
+    return table_name
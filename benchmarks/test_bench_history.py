@@ -0,0 +1,44 @@
+from datetime import datetime
+
+from sqldbclient.sql_history_manager.tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery
+from sqldbclient.sql_history_manager.tables.executed_sql_query_result.custom_sqlalchemy_types.data_frame \
+    import DataFrame
+from benchmarks.conftest import run_benchmark
+
+
+def _executed_query() -> ExecutedSqlQuery:
+    now = datetime.now()
+    return ExecutedSqlQuery(query='SELECT * FROM bench', start_time=now, finish_time=now)
+
+
+def test_dump(benchmark, history_manager, frame, n_rows):
+    def setup():
+        return (_executed_query(), frame), {}
+
+    run_benchmark(benchmark, n_rows, history_manager.dump, setup=setup)
+
+
+def test_get_result(benchmark, history_manager, frame, n_rows):
+    executed_query = _executed_query()
+    history_manager.dump(executed_query, frame)
+    result = run_benchmark(benchmark, n_rows, history_manager.get_result, executed_query.uuid, reload=True)
+    assert len(result) == n_rows
+
+
+def test_data_frame_type_serialization(benchmark, frame, n_rows):
+    run_benchmark(benchmark, n_rows, DataFrame().process_bind_param, frame, None)
+
+
+def test_data_frame_type_deserialization(benchmark, frame, n_rows):
+    value = DataFrame().process_bind_param(frame, None)
+    result = run_benchmark(benchmark, n_rows, DataFrame().process_result_value, value, None)
+    assert len(result) == n_rows
+
+
+def test_get_result_first_column_head(benchmark, history_manager, frame, n_rows):
+    executed_query = _executed_query()
+    history_manager.dump(executed_query, frame)
+    first_column = frame.columns[0]
+    result = run_benchmark(benchmark, n_rows, history_manager.get_result, executed_query.uuid,
+                           reload=True, columns=[first_column], rows=slice(0, 100))
+    assert result.shape == (min(100, n_rows), 1)
@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _import_time_us(statement: str) -> int:
+    """Runs statement in a fresh interpreter and returns cumulative import time of sqldbclient in microseconds."""
+    completed = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        check=True, capture_output=True, text=True,
+    )
+    for line in completed.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        columns = line.split('|')
+        if len(columns) == 3 and columns[2].strip() == 'sqldbclient':
+            return int(columns[1])
+    raise ValueError(f'No sqldbclient import found in output of {statement!r}')
+
+
+@pytest.mark.parametrize('statement', [
+    'import sqldbclient',
+    'from sqldbclient import SqlExecutor',
+])
+def test_import_time(benchmark, statement):
+    result = benchmark.pedantic(subprocess.run, args=([sys.executable, '-c', statement],),
+                                kwargs={'check': True}, rounds=5, iterations=1)
+    assert result.returncode == 0
+    benchmark.extra_info['sqldbclient_import_us'] = _import_time_us(statement)
@@ -0,0 +1,19 @@
+from sqldbclient.utils.pandas.cursor_result_to_df import rows_to_df
+from sqldbclient.utils.pandas.parse_dates import parse_dates
+from benchmarks.conftest import run_benchmark
+
+
+def test_rows_to_df(benchmark, frame, n_rows):
+    rows = list(frame.itertuples(index=False, name=None))
+    columns = list(frame.columns)
+    result = run_benchmark(benchmark, n_rows, rows_to_df, rows, columns)
+    assert len(result) == n_rows
+
+
+def test_parse_dates(benchmark, frame, n_rows):
+    text_frame = frame.astype(str)
+
+    def setup():
+        return (text_frame.copy(),), {}
+
+    run_benchmark(benchmark, n_rows, parse_dates, setup=setup)
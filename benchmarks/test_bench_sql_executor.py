@@ -0,0 +1,37 @@
+import pytest
+
+from sqldbclient.sql_query_preparator import SqlQueryPreparator
+from benchmarks.conftest import run_benchmark
+
+
+def test_execute_without_history(benchmark, sql_executor, source_table, n_rows):
+    result = run_benchmark(
+        benchmark, n_rows, sql_executor.execute, f'SELECT * FROM {source_table}',
+        add_limit=False, dump_execution_info=False, dump_result=False,
+    )
+    assert len(result) == n_rows
+
+
+def test_execute_with_history(benchmark, sql_executor, source_table, n_rows):
+    result = run_benchmark(
+        benchmark, n_rows, sql_executor.execute, f'SELECT * FROM {source_table}', add_limit=False,
+    )
+    assert len(result) == n_rows
+
+
+@pytest.mark.parametrize('output', ['arrow', 'pandas_pyarrow'])
+def test_execute_arrow_with_history(benchmark, sql_executor, source_table, n_rows, output):
+    pytest.importorskip('pyarrow')
+    options = dict(output='arrow') if output == 'arrow' else dict(dtype_backend='pyarrow')
+    result = run_benchmark(
+        benchmark, n_rows, sql_executor.execute, f'SELECT * FROM {source_table}', add_limit=False, **options,
+    )
+    assert len(result) == n_rows
+
+
+@pytest.mark.parametrize('n_columns', [10, 200])
+def test_prepare(benchmark, n_columns):
+    columns = ',\n'.join(f'c{i} + {i} AS c{i}' for i in range(n_columns))
+    query = f"SELECT {columns} FROM bench WHERE c0 IN ({', '.join(map(str, range(n_columns)))}) LIMIT 100000"
+    prepared_sql_query = benchmark(SqlQueryPreparator(10_000).prepare, query)
+    assert prepared_sql_query.text.endswith('LIMIT 10000')
@@ -37,6 +37,10 @@ setuptools.setup(
     install_requires=dependencies,
     extras_require={
         'jupyter': ('jupyter', 'notebook', 'ipykernel'),
+        'benchmarks': ('pytest', 'pytest-benchmark'),
+        'duckdb': ('duckdb', 'pyarrow'),
+        'arrow': ('pyarrow',),
+        'polars': ('polars', 'pyarrow'),
     },
     license='MIT',
     license_files=('LICENSE',),
@@ -20,6 +20,7 @@ additional functionalities:
 - keeping track of all executed queries, their execution information and results
 - parsing SQL queries (e.g. automatically adding LIMIT clause to prevent memory overflow)
 - performing transaction by simply using ``with`` operator
+- retrying queries and transactions that failed with transient errors
 
 :mod:`sqldbclient` is especially helpful for data analysts and engineers
 who are used to work with Python and its packages
@@ -37,20 +38,40 @@ further information about this project.
 
 __version__ = '0.1.2'
 
+import importlib
 import logging
 
-from sqldbclient.sql_history_manager import SqlHistoryManager
-from sqldbclient.sql_query_preparator import SqlQueryPreparator
-from sqldbclient.sql_transaction_manager import SqlTransactionManager
-
-from sqldbclient.sql_executor import SqlExecutor, SqlExecutorConf
-
-from sqldbclient.sql_engine_factory import sql_engine_factory
-
-try:
-    from sqldbclient.utils.pandas.set_full_display import set_full_display
-except ImportError:
-    pass
+# public names are imported on first access (PEP 562), so that importing the package
+# does not pull in pandas, sqlalchemy ORM, sqlparse and IPython
+_LAZY_ATTRIBUTES = {
+    'SqlHistoryManager': 'sqldbclient.sql_history_manager',
+    'SqlQueryPreparator': 'sqldbclient.sql_query_preparator',
+    'SqlTransactionManager': 'sqldbclient.sql_transaction_manager',
+    'SqlRetryPolicy': 'sqldbclient.sql_retry_policy',
+    'SqlExecutor': 'sqldbclient.sql_executor',
+    'SqlExecutorConf': 'sqldbclient.sql_executor',
+    'sql_engine_factory': 'sqldbclient.sql_engine_factory',
+    'set_full_display': 'sqldbclient.utils.pandas.set_full_display',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    try:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name])
+    except ImportError as e:
+        # set_full_display requires optional IPython
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r} ({e})') from e
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
 
 
 logging.getLogger(__name__)
@@ -2,8 +2,11 @@ from typing import Optional, List
 import types
 
 import sqlalchemy
+from sqlalchemy.engine.base import Engine
 from sqlalchemy.engine.reflection import Inspector
 
+from sqldbclient.sql_metadata_cache.sql_metadata_cache import SqlMetadataCache
+
 
 class DBInspector(Inspector):
     def get_columns_repr(self, table: str, schema: Optional[str] = None) -> str:
@@ -16,7 +19,9 @@ class DBInspector(Inspector):
         if schema:
             output = f'"{schema}".' + output
         prefix = ' |-- '
-        for c in self.get_columns(table, schema):
+        metadata_cache = SqlMetadataCache.get_or_create(self.bind.engine)
+        columns = metadata_cache.get('columns', (schema, table), lambda: self.get_columns(table, schema))
+        for c in columns:
             output += f"{prefix}{c['name']}: {c['type']} "
             output += f"({', '.join(f'{k}={v}' for k, v in c.items() if k not in ('name', 'type'))})\n"
         return output
@@ -36,18 +41,28 @@ class DBInspector(Inspector):
         :param schema: schema in database
         :return: list of view names
         """
-        views = self.get_view_names()
-        if hasattr(self, 'get_materialized_view_names'):
-            try:
-                views += self.get_materialized_view_names()
-            except NotImplementedError:
-                pass
-        return views
-
-
-def inspect(*args, **kwargs) -> DBInspector:
-    """Wrapper around sqlalchemy inspect function, that adds custom methods."""
-    inspector = sqlalchemy.inspect(*args, **kwargs)
+        def load_views() -> List[str]:
+            views = self.get_view_names(schema)
+            if hasattr(self, 'get_materialized_view_names'):
+                try:
+                    views += self.get_materialized_view_names(schema)
+                except NotImplementedError:
+                    pass
+            return views
+
+        return SqlMetadataCache.get_or_create(self.bind.engine).get('views', schema, load_views)
+
+
+def inspect(subject, *args, **kwargs) -> DBInspector:
+    """Wrapper around sqlalchemy inspect function, that adds custom methods.
+    Inspector of an engine is created once and shared with the engine metadata cache,
+    see :class:`~sqldbclient.sql_metadata_cache.SqlMetadataCache`.
+    """
+    if isinstance(subject, Engine):
+        inspector = SqlMetadataCache.get_or_create(subject).get_inspector(
+            lambda engine: sqlalchemy.inspect(engine, *args, **kwargs))
+    else:
+        inspector = sqlalchemy.inspect(subject, *args, **kwargs)
     setattr(inspector, 'get_columns_repr', types.MethodType(DBInspector.get_columns_repr, inspector))
     setattr(inspector, 'print_columns', types.MethodType(DBInspector.print_columns, inspector))
     setattr(inspector, 'get_views', types.MethodType(DBInspector.get_views, inspector))
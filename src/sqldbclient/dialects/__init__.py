@@ -0,0 +1,34 @@
+"""
+Database specific functionality.
+
+``SqlViewFactory`` and ``SqlViewMaterializer`` recreate views along with their dependency trees
+in any database, which has implementation of ``SqlViewDialect``: PostgreSQL and SQLite.
+"""
+
+import importlib
+
+# imported on first access (PEP 562), so that importing a dialect does not import the others
+_LAZY_ATTRIBUTES = {
+    'SqlViewFactory': 'sqldbclient.dialects.sql_view_factory.sql_view_factory',
+    'SqlViewMaterializer': 'sqldbclient.dialects.sql_view_materializer.sql_view_materializer',
+    'SqlViewMaterializerUtils': 'sqldbclient.dialects.sql_view_materializer.sql_view_materializer_utils',
+    'MaterializationPlan': 'sqldbclient.dialects.sql_view_materializer.materialization_plan',
+    'SqlViewDialect': 'sqldbclient.dialects.sql_view_dialect.sql_view_dialect',
+    'get_view_dialect': 'sqldbclient.dialects.sql_view_dialect.sql_view_dialect',
+    'View': 'sqldbclient.dialects.sql_view_dialect.view',
+    'ViewType': 'sqldbclient.dialects.sql_view_dialect.view',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
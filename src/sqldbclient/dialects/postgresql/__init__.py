@@ -12,6 +12,10 @@ and its dependencies.
 Note that all the necessary steps will be executed in a separate transaction,
 which ensures that the whole operation either will be completed fully
 or will not be done at all.
+Changes can be previewed with ``SqlViewMaterializer.plan``, which returns a ``MaterializationPlan``
+with the script, that would be executed, and refresh cost estimates.
+Catalog queries and statements are provided by ``SqlViewDialect`` of the engine,
+so regular views can be recreated in SQLite the same way.
 
 
 .. warning::
@@ -20,8 +24,10 @@ or will not be done at all.
 
 """
 
-from sqldbclient.dialects.postgresql.sql_view_factory.sql_view_factory import SqlViewFactory
-from sqldbclient.dialects.postgresql.sql_view_materializer.sql_view_materializer_utils import SqlViewMaterializerUtils
-from sqldbclient.dialects.postgresql.sql_view_materializer.sql_view_materializer import SqlViewMaterializer
+from sqldbclient.dialects.sql_view_factory.sql_view_factory import SqlViewFactory
+from sqldbclient.dialects.sql_view_materializer.sql_view_materializer_utils import SqlViewMaterializerUtils
+from sqldbclient.dialects.sql_view_materializer.sql_view_materializer import SqlViewMaterializer
+from sqldbclient.dialects.sql_view_materializer.materialization_plan import MaterializationPlan
+from sqldbclient.dialects.postgresql.postgresql_view_dialect import PostgresqlViewDialect
 
 from sqldbclient.dialects.postgresql.utils import grant_access
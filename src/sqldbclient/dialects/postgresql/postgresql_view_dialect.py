@@ -0,0 +1,205 @@
+import logging
+import re
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+import pandas as pd
+
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import SqlViewDialect, ObjectKey, DependencyEdges, \
+    sort_dependant_objects, execute_catalog_query
+from sqldbclient.dialects.postgresql.sql_view_factory.pg_info_queries import PG_OBJECTS_INFO_TEMPLATE, \
+    PG_OBJECT_DEPENDENCIES_TEMPLATE, PG_OBJECTS_PRIVILEGES_TEMPLATE, PG_OBJECTS_INDEXES_TEMPLATE, \
+    PG_OBJECTS_STATS_TEMPLATE, PG_INDEX_BUILD_PROGRESS_TEMPLATE
+from sqldbclient.dialects.postgresql.utils import escape_literal, quote_identifier
+
+if TYPE_CHECKING:
+    from sqldbclient.sql_executor import SqlExecutor
+
+logger = logging.getLogger(__name__)
+
+# maximum length of identifiers in PostgreSQL
+MAX_IDENTIFIER_LENGTH = 63
+
+_IDENTIFIER = r'(?:"(?:[^"]|"")+"|[^\s."]+)'
+INDEX_DEFINITION_PATTERN = re.compile(
+    rf'^CREATE (?P<unique>UNIQUE )?INDEX (?P<name>{_IDENTIFIER}) ON (?P<only>ONLY )?'
+    rf'(?P<table>{_IDENTIFIER}\.{_IDENTIFIER}) (?P<rest>USING .*)$',
+    re.DOTALL,
+)
+
+
+def is_unique_column_index(index: Dict[str, str]) -> bool:
+    """Checks whether index is unique, built on columns only (without expressions) and not partial,
+    that is whether it allows refreshing materialized view concurrently"""
+    match = INDEX_DEFINITION_PATTERN.match(index['definition'])
+    if match is None or not match['unique']:
+        return False
+    columns = re.match(r'^USING \w+ \((?P<columns>[^()]*)\)$', match['rest'].strip())
+    return columns is not None
+
+
+def get_concurrent_index_definition(index: Dict[str, str]) -> str:
+    """Returns definition of index, which is built without locking out writes to the table"""
+    match = INDEX_DEFINITION_PATTERN.match(index['definition'])
+    if match is None:
+        raise ValueError(f'Unable to parse index definition: {index["definition"]}')
+    return (f'CREATE {match["unique"] or ""}INDEX CONCURRENTLY {match["name"]} '
+            f'ON {match["only"] or ""}{match["table"]} {match["rest"]}')
+
+
+def get_dependency_edges(name: str, schema: str, sql_executor: 'SqlExecutor') -> DependencyEdges:
+    """Collects object dependencies, dependencies of its dependencies, and etc. with a single recursive query.
+
+    :param name: object name
+    :param schema: object schema
+    :param sql_executor: instance of SqlExecutor
+    :return: list of pairs ((source_schema, source_table), (dependent_schema, dependent_view))
+    """
+    df = execute_catalog_query(PG_OBJECT_DEPENDENCIES_TEMPLATE.format(
+        name=escape_literal(name),
+        schema=escape_literal(schema),
+    ), sql_executor)
+    edges = [
+        ((row.source_schema, row.source_table), (row.dependent_schema, row.dependent_view))
+        for row in df.itertuples(index=False)
+    ]
+    logger.info(f'Found {len(edges)} dependencies in dependency tree of "{schema}"."{name}"')
+    return edges
+
+
+def extract_dependant_objects(name: str, schema: str, sql_executor: 'SqlExecutor') -> pd.DataFrame:
+    """Extracts dependencies ordered from parents to children.
+
+    :param name: object name
+    :param schema: object schema
+    :param sql_executor: instance of SqlExecutor
+    :return:
+    """
+    edges = get_dependency_edges(name, schema, sql_executor)
+    return pd.DataFrame(
+        sort_dependant_objects(name, schema, edges),
+        columns=['dependent_schema', 'dependent_view'],
+    )
+
+
+def load_views(name: str, schema: str, sql_executor: 'SqlExecutor') -> Dict[ObjectKey, View]:
+    """Creates View objects for the object and all objects depending on it at once,
+    using a few set-based catalog queries for the whole dependency tree.
+
+    :param name: object name
+    :param schema: object schema
+    :param sql_executor: instance of SqlExecutor
+    :return: dict of View objects by (schema, name) pairs
+    """
+    edges = get_dependency_edges(name, schema, sql_executor)
+    keys = [(schema, name)] + sort_dependant_objects(name, schema, edges)
+
+    objects = ', '.join(f"('{escape_literal(key[0])}', '{escape_literal(key[1])}')" for key in keys)
+    info = execute_catalog_query(PG_OBJECTS_INFO_TEMPLATE.format(objects=objects), sql_executor)
+    info_by_key = {(row.schema, row.name): row for row in info.itertuples(index=False)}
+    for key in keys:
+        if key not in info_by_key:
+            raise Exception(f'View object "{key[0]}"."{key[1]}" not found')
+
+    oids = ', '.join(str(int(row.oid)) for row in info_by_key.values())
+    privileges_df = execute_catalog_query(PG_OBJECTS_PRIVILEGES_TEMPLATE.substitute(oids=oids), sql_executor)
+    privileges = defaultdict(dict)
+    for row in privileges_df.itertuples(index=False):
+        privileges[row.oid][row.grantee] = row.privileges
+    indexes_df = execute_catalog_query(PG_OBJECTS_INDEXES_TEMPLATE.format(oids=oids), sql_executor)
+    indexes = defaultdict(list)
+    for row in indexes_df.itertuples(index=False):
+        indexes[row.oid].append(dict(schema=row.schema, name=row.name, definition=row.definition))
+    logger.info(f'Loaded catalog information of {len(keys)} objects in dependency tree of "{schema}"."{name}"')
+
+    attributes = {
+        key: dict(
+            schema=row.schema,
+            name=row.name,
+            view_type=ViewType.MATERIALIZED_VIEW if row.kind == 'm' else ViewType.REGULAR_VIEW,
+            owner=row.owner,
+            definition=row.definition,
+            privileges=privileges[row.oid],
+            indexes=indexes[row.oid],
+            table_description=row.table_description,
+            col_descriptions=row.col_descriptions,
+        )
+        for key, row in info_by_key.items()
+    }
+    return SqlViewDialect.build_views(name, schema, edges, attributes)
+
+
+class PostgresqlViewDialect(SqlViewDialect):
+    """PostgreSQL implementation of SqlViewDialect, supporting materialized views, indexes, owners,
+    privileges and comments. Catalog of the whole dependency tree is read with a few set-based queries.
+    """
+    max_identifier_length = MAX_IDENTIFIER_LENGTH
+
+    def load_views(self, name: str, schema: str, sql_executor: 'SqlExecutor') -> Dict[ObjectKey, View]:
+        return load_views(name, schema, sql_executor)
+
+    def get_relation_stats(self, objects: List[View], sql_executor: 'SqlExecutor') -> pd.DataFrame:
+        if not objects:
+            return super().get_relation_stats(objects, sql_executor)
+        values = ', '.join(f"('{escape_literal(obj.schema)}', '{escape_literal(obj.name)}')" for obj in objects)
+        return execute_catalog_query(PG_OBJECTS_STATS_TEMPLATE.format(objects=values), sql_executor)
+
+    def create_statements(self, view: View) -> List[str]:
+        if view.view_type == ViewType.MATERIALIZED_VIEW:
+            return ['\n'.join([f'CREATE MATERIALIZED VIEW {view.full_name} AS',
+                               view.definition.replace(';', ''),
+                               'WITH NO DATA'])]
+        return ['\n'.join([f'CREATE {self.object_type(view)} {view.full_name} AS',
+                           view.definition.strip().rstrip(';')])]
+
+    def owner_statements(self, view: View) -> List[str]:
+        return [f'ALTER {self.object_type(view)} {view.full_name} OWNER TO {view.owner}']
+
+    def privileges_statements(self, view: View, target: View) -> List[str]:
+        # one GRANT per set of privileges, listing all grantees having it
+        grantees_by_privileges: Dict[Tuple[str, ...], List[str]] = {}
+        for grantee, privileges in view.privileges.items():
+            if privileges:
+                grantees_by_privileges.setdefault(tuple(privileges), []).append(grantee)
+        return [f'GRANT {", ".join(privileges)} ON {target.full_name} TO {", ".join(grantees)}'
+                for privileges, grantees in grantees_by_privileges.items()]
+
+    def descriptions_statements(self, view: View) -> List[str]:
+        statements = []
+        if view.table_description is not None:
+            statements.append(f"COMMENT ON {self.object_type(view)} {view.full_name} "
+                              f"IS '{escape_literal(view.table_description)}'")
+        for col, col_description in (view.col_descriptions or {}).items():
+            if col_description is not None:
+                statements.append(f"COMMENT ON COLUMN {view.full_name}.{quote_identifier(col)} "
+                                  f"IS '{escape_literal(col_description)}'")
+        return statements
+
+    def rename_statements(self, view: View, name: str) -> List[str]:
+        return [f'ALTER {self.object_type(view)} {view.full_name} RENAME TO {quote_identifier(name)}']
+
+    def refresh_statements(self, view: View, concurrently: bool = False) -> List[str]:
+        concurrently_clause = ' CONCURRENTLY' if concurrently else ''
+        return [f'REFRESH MATERIALIZED VIEW{concurrently_clause} {view.full_name}']
+
+    def get_temp_index(self, index: Dict[str, str], table_full_name: str) -> Dict[str, str]:
+        match = INDEX_DEFINITION_PATTERN.match(index['definition'])
+        if match is None:
+            raise ValueError(f'Unable to parse index definition: {index["definition"]}')
+        temp_name = self.get_temp_name(index['name'])
+        definition = f'CREATE {match["unique"] or ""}INDEX "{temp_name}" ON {table_full_name} {match["rest"]}'
+        return dict(schema=index['schema'], name=temp_name, definition=definition)
+
+    def is_unique_column_index(self, index: Dict[str, str]) -> bool:
+        return is_unique_column_index(index)
+
+    def create_index_statements(self, index: Dict[str, str], concurrently: bool = False) -> List[str]:
+        return [get_concurrent_index_definition(index) if concurrently else index['definition']]
+
+    def rename_index_statements(self, index: Dict[str, str], name: str) -> List[str]:
+        return [f'ALTER INDEX {quote_identifier(index["schema"])}.{quote_identifier(index["name"])} '
+                f'RENAME TO {quote_identifier(name)}']
+
+    def index_build_progress_query(self, full_name: str) -> Optional[str]:
+        return PG_INDEX_BUILD_PROGRESS_TEMPLATE.format(full_name=escape_literal(full_name))
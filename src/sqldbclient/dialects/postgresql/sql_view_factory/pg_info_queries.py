@@ -1,41 +1,67 @@
 from string import Template
 
 
-PG_VIEWS_INFO_TEMPLATE = '''
-    SELECT * 
-    FROM pg_views 
-    WHERE viewname = '{name}' AND schemaname = '{schema}'
-'''
-
-PG_MATVIEWS_INFO_TEMPLATE = '''
-    SELECT * 
-    FROM pg_matviews 
-    WHERE matviewname = '{name}' AND schemaname = '{schema}';
+PG_OBJECTS_INFO_TEMPLATE = '''
+    SELECT
+        c.oid,
+        n.nspname AS schema,
+        c.relname AS name,
+        c.relkind AS kind,
+        pg_catalog.pg_get_userbyid(c.relowner) AS owner,
+        pg_catalog.pg_get_viewdef(c.oid) AS definition,
+        pg_catalog.obj_description(c.oid, 'pg_class') AS table_description,
+        (
+            SELECT json_object_agg(a.attname, pg_catalog.col_description(c.oid, a.attnum))
+            FROM pg_attribute a
+            WHERE a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+        ) AS col_descriptions
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE c.relkind IN ('v', 'm')
+      AND (n.nspname, c.relname) IN ({objects})
 '''
 
 PG_OBJECT_DEPENDENCIES_TEMPLATE = '''
+WITH RECURSIVE dependencies AS (
+    SELECT 
+        pg_depend.refobjid AS source_oid,
+        pg_rewrite.ev_class AS dependent_oid
+    FROM pg_depend 
+    JOIN pg_rewrite ON pg_depend.objid = pg_rewrite.oid 
+    JOIN pg_class AS source_table ON pg_depend.refobjid = source_table.oid 
+    JOIN pg_namespace source_ns ON source_ns.oid = source_table.relnamespace
+    WHERE 
+        source_ns.nspname = '{schema}'
+        AND source_table.relname = '{name}'
+        AND pg_depend.refobjsubid > 0 
+        AND pg_rewrite.ev_class <> pg_depend.refobjid
+    UNION
+    SELECT 
+        pg_depend.refobjid AS source_oid,
+        pg_rewrite.ev_class AS dependent_oid
+    FROM dependencies
+    JOIN pg_depend ON pg_depend.refobjid = dependencies.dependent_oid
+    JOIN pg_rewrite ON pg_depend.objid = pg_rewrite.oid 
+    WHERE 
+        pg_depend.refobjsubid > 0 
+        AND pg_rewrite.ev_class <> pg_depend.refobjid
+)
 SELECT DISTINCT 
     dependent_ns.nspname as dependent_schema,
     dependent_view.relname as dependent_view,
     source_ns.nspname as source_schema,
     source_table.relname as source_table
-FROM pg_depend 
-JOIN pg_rewrite ON pg_depend.objid = pg_rewrite.oid 
-JOIN pg_class as dependent_view ON pg_rewrite.ev_class = dependent_view.oid 
-JOIN pg_class as source_table ON pg_depend.refobjid = source_table.oid 
-JOIN pg_attribute ON pg_depend.refobjid = pg_attribute.attrelid 
-    AND pg_depend.refobjsubid = pg_attribute.attnum 
+FROM dependencies
+JOIN pg_class as dependent_view ON dependencies.dependent_oid = dependent_view.oid 
+JOIN pg_class as source_table ON dependencies.source_oid = source_table.oid 
 JOIN pg_namespace dependent_ns ON dependent_ns.oid = dependent_view.relnamespace
 JOIN pg_namespace source_ns ON source_ns.oid = source_table.relnamespace
-WHERE 
-    source_ns.nspname = '{schema}'
-    AND source_table.relname = '{name}'
-    AND pg_attribute.attnum > 0 
-ORDER BY 1,2
+ORDER BY 1,2,3,4
 '''
 
-PG_OBJECT_PRIVILEGES_TEMPLATE = Template('''
+PG_OBJECTS_PRIVILEGES_TEMPLATE = Template('''
         SELECT 
+            pg_class.oid,
             coalesce(nullif(s[1], ''), 'public') grantee, 
             (SELECT ARRAY_AGG(privilege ORDER BY privilege ASC)
                 FROM (SELECT
@@ -53,34 +79,45 @@ PG_OBJECT_PRIVILEGES_TEMPLATE = Template('''
             ) AS privileges
         FROM 
             pg_class
-            JOIN pg_namespace ON pg_namespace.oid = relnamespace
             JOIN pg_roles ON pg_roles.oid = relowner,
             unnest(coalesce(relacl::text[], format('{%s=arwdDxt/%s}', rolname, rolname)::text[])) AS acl,
             regexp_split_to_array(acl, '=|/') AS s
-        WHERE nspname = '$schema' and relname='$name'
+        WHERE pg_class.oid IN ($oids)
 ''')
 
-PG_OBJECT_INDEXES_TEMPLATE = '''
+PG_OBJECTS_INDEXES_TEMPLATE = '''
     SELECT 
-        schemaname AS schema, 
-        indexname AS name, 
-        indexdef AS definition
-    FROM pg_indexes
-    WHERE tablename = '{name}' AND schemaname = '{schema}'
+        i.indrelid AS oid,
+        n.nspname AS schema, 
+        ic.relname AS name, 
+        pg_catalog.pg_get_indexdef(i.indexrelid) AS definition
+    FROM pg_index i
+    JOIN pg_class ic ON ic.oid = i.indexrelid
+    JOIN pg_namespace n ON n.oid = ic.relnamespace
+    WHERE i.indrelid IN ({oids})
+    ORDER BY 1, 3
+'''
+
+PG_OBJECTS_STATS_TEMPLATE = '''
+    SELECT
+        n.nspname AS schema,
+        c.relname AS name,
+        c.reltuples,
+        pg_catalog.pg_total_relation_size(c.oid) AS total_bytes
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE (n.nspname, c.relname) IN ({objects})
 '''
 
-PG_OBJECT_DESCRIPTIONS_TEMPLATE = '''
+PG_INDEX_BUILD_PROGRESS_TEMPLATE = '''
     SELECT
-        s.nspname AS table_schema,
-        t.relname AS table_name,
-        pg_catalog.obj_description(t.oid) AS table_description,
-        json_object_agg(a.attname, pg_catalog.col_description(t.oid,a.attnum)) AS col_descriptions
-    FROM pg_attribute a
-      JOIN pg_class t ON a.attrelid = t.oid
-      JOIN pg_namespace s ON t.relnamespace = s.oid
-    WHERE a.attnum > 0 
-      AND NOT a.attisdropped
-      AND t.relname = '{name}'
-      AND s.nspname = '{schema}'
-    GROUP BY 1,2,3
+        pid,
+        phase,
+        blocks_done,
+        blocks_total,
+        tuples_done,
+        tuples_total
+    FROM pg_stat_progress_create_index
+    WHERE relid = '{full_name}'::regclass
+    ORDER BY pid
 '''
@@ -1,6 +1,16 @@
 from sqldbclient.sql_executor import SqlExecutor
 
 
+def escape_literal(value: str) -> str:
+    """Escapes value to be used inside single-quoted string literal"""
+    return value.replace("'", "''")
+
+
+def quote_identifier(name: str) -> str:
+    """Encloses identifier in double quotes, escaping double quotes inside it"""
+    return '"' + name.replace('"', '""') + '"'
+
+
 def grant_access(
     object_name: str,
     object_schema: str,
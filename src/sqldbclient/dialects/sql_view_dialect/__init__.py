@@ -0,0 +1,2 @@
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import SqlViewDialect, get_view_dialect
@@ -0,0 +1,224 @@
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+import pandas as pd
+
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.utils.dependency_graph import DependencyGraph
+
+if TYPE_CHECKING:
+    from sqldbclient.sql_executor import SqlExecutor
+
+logger = logging.getLogger(__name__)
+
+ObjectKey = Tuple[str, str]
+DependencyEdges = List[Tuple[ObjectKey, ObjectKey]]
+
+TEMP_NAME_SUFFIX = '__swap'
+
+# implementations are imported on first use, so that dialects do not import each other
+VIEW_DIALECTS = {
+    'postgresql': 'sqldbclient.dialects.postgresql.postgresql_view_dialect.PostgresqlViewDialect',
+    'sqlite': 'sqldbclient.dialects.sqlite.sqlite_view_dialect.SqliteViewDialect',
+}
+
+
+def get_view_dialect(name: str) -> 'SqlViewDialect':
+    """Returns implementation of SqlViewDialect for sqlalchemy dialect name
+
+    :param name: sqlalchemy dialect name, e.g. 'postgresql' or 'sqlite'
+    """
+    if name not in VIEW_DIALECTS:
+        raise ValueError(f'Views are not supported for dialect {name}, supported dialects: {list(VIEW_DIALECTS)}')
+    module_name, class_name = VIEW_DIALECTS[name].rsplit('.', 1)
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def quote_name(name: str) -> str:
+    """Quotes identifier with double quotes"""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def execute_catalog_query(query: str, sql_executor: 'SqlExecutor') -> pd.DataFrame:
+    """Executes internal query to system catalog without limit and byte budget, so that the whole catalog
+    information is always returned, and without recording it in execution history.
+
+    :param query: query text
+    :param sql_executor: instance of SqlExecutor
+    :return: pandas DataFrame
+    """
+    return sql_executor.execute(query, add_limit=False, dump_execution_info=False, dump_result=False,
+                                limit_bytes=False)
+
+
+def sort_dependant_objects(name: str, schema: str, edges: DependencyEdges) -> List[ObjectKey]:
+    """Sorts objects depending on the object directly or indirectly from parents to children,
+    so that each object goes after all objects it depends on.
+    If dependencies contain a cycle, CyclicDependencyException is raised.
+
+    :param name: object name
+    :param schema: object schema
+    :param edges: list of pairs ((source_schema, source_name), (dependent_schema, dependent_name))
+    :return: list of (schema, name) pairs of dependant objects, not including the object itself
+    """
+    children: Dict[ObjectKey, Set[ObjectKey]] = defaultdict(set)
+    parents: Dict[ObjectKey, Set[ObjectKey]] = defaultdict(set)
+    for source, dependent in edges:
+        children[source].add(dependent)
+        parents[dependent].add(source)
+
+    root = (schema, name)
+    graph = DependencyGraph()
+    stack = [root]
+    while stack:
+        key = stack.pop()
+        if key in graph:
+            continue
+        graph.add(key, depends_on=parents[key])
+        stack.extend(sorted(children[key], reverse=True))
+    return [key for key in graph.topological_order() if key != root]
+
+
+class SqlViewDialect(ABC):
+    """Interface of database specific part of view recreation pipeline: reading views with their dependency tree
+    from catalog, and building statements, that restore them and their indexes. Statements, which are not applicable
+    to a database (e.g. GRANT in SQLite), are not built.
+    Implementation for engine is returned by :func:`~get_view_dialect`.
+    """
+    # whether several statements can be executed in one round trip
+    supports_statement_batches = True
+    # maximum length of identifiers, not limited when None
+    max_identifier_length: Optional[int] = None
+
+    @abstractmethod
+    def load_views(self, name: str, schema: str, sql_executor: 'SqlExecutor') -> Dict[ObjectKey, View]:
+        """Creates View objects for the object and all objects depending on it at once.
+
+        :param name: object name
+        :param schema: object schema
+        :param sql_executor: instance of SqlExecutor
+        :return: dict of View objects by (schema, name) pairs
+        """
+
+    @staticmethod
+    def build_views(name: str,
+                    schema: str,
+                    edges: DependencyEdges,
+                    attributes: Dict[ObjectKey, Dict[str, Any]]) -> Dict[ObjectKey, View]:
+        """Creates View objects for the object and all objects depending on it from catalog information,
+        each one referring to View objects of its own dependant objects.
+        If any object of dependency tree is not found in attributes, exception is raised.
+
+        :param name: object name
+        :param schema: object schema
+        :param edges: list of pairs ((source_schema, source_name), (dependent_schema, dependent_name))
+        :param attributes: dict of View attributes, except dependant objects, by (schema, name) pairs
+        :return: dict of View objects by (schema, name) pairs
+        """
+        keys = [(schema, name)] + sort_dependant_objects(name, schema, edges)
+        for key in keys:
+            if key not in attributes:
+                raise Exception(f'View object "{key[0]}"."{key[1]}" not found')
+        views = {}
+        # children are created first, so that they can be referenced by all their parents
+        for key in reversed(keys):
+            dependant_objects = [views[dep] for dep in sort_dependant_objects(key[1], key[0], edges)]
+            views[key] = View(**attributes[key], dependant_objects=dependant_objects)
+        return views
+
+    def get_relation_stats(self, objects: List[View], sql_executor: 'SqlExecutor') -> pd.DataFrame:
+        """Returns statistics of objects used for estimates: schema, name, number of rows and total size in bytes
+
+        :param objects: list of View objects
+        :param sql_executor: instance of SqlExecutor
+        """
+        return pd.DataFrame([], columns=['schema', 'name', 'reltuples', 'total_bytes'])
+
+    @staticmethod
+    def object_type(view: View) -> str:
+        if view.view_type == ViewType.REGULAR_VIEW:
+            return 'VIEW'
+        if view.view_type == ViewType.MATERIALIZED_VIEW:
+            return 'MATERIALIZED VIEW'
+        raise Exception('Unexpected error')
+
+    @abstractmethod
+    def create_statements(self, view: View) -> List[str]:
+        """Builds statements to create database object"""
+
+    def drop_statements(self, view: View, if_exists: bool = False) -> List[str]:
+        """Builds statements to drop database object
+
+        :param view: View object
+        :param if_exists: If ``True``, object is dropped only if it exists
+        """
+        return [f'DROP {self.object_type(view)}{" IF EXISTS" if if_exists else ""} {view.full_name}']
+
+    def owner_statements(self, view: View) -> List[str]:
+        """Builds statements to set owner"""
+        return []
+
+    def privileges_statements(self, view: View, target: View) -> List[str]:
+        """Builds statements to grant privileges of view on target object"""
+        return []
+
+    def descriptions_statements(self, view: View) -> List[str]:
+        """Builds statements to set comments of object and its columns"""
+        return []
+
+    def rename_statements(self, view: View, name: str) -> List[str]:
+        """Builds statements to rename database object"""
+        raise NotImplementedError(f'Renaming views is not supported by {type(self).__name__}')
+
+    def refresh_statements(self, view: View, concurrently: bool = False) -> List[str]:
+        """Builds statements to refresh materialized view"""
+        raise NotImplementedError(f'Materialized views are not supported by {type(self).__name__}')
+
+    def get_temp_name(self, name: str) -> str:
+        """Returns name for an object, that is built to replace the object with specified name"""
+        if self.max_identifier_length is not None:
+            name = name[:self.max_identifier_length - len(TEMP_NAME_SUFFIX)]
+        return name + TEMP_NAME_SUFFIX
+
+    def get_temp_index(self, index: Dict[str, str], table_full_name: str) -> Dict[str, str]:
+        """Returns index with temporary name on another table, having the same definition otherwise
+
+        :param index: dict with schema, name and definition of index, as collected by SqlViewFactory
+        :param table_full_name: full name of table (or materialized view) to create index on
+        :return: dict with schema, name and definition of temporary index
+        """
+        raise NotImplementedError(f'Indexes are not supported by {type(self).__name__}')
+
+    def is_unique_column_index(self, index: Dict[str, str]) -> bool:
+        """Checks whether index is unique, built on columns only (without expressions) and not partial,
+        that is whether it allows refreshing materialized view concurrently"""
+        return False
+
+    def create_index_statements(self, index: Dict[str, str], concurrently: bool = False) -> List[str]:
+        """Builds statements to create index
+
+        :param index: dict with schema, name and definition of index
+        :param concurrently: If ``True``, index is built without locking out writes to the table
+        """
+        if concurrently:
+            raise NotImplementedError(f'Concurrent index builds are not supported by {type(self).__name__}')
+        return [index['definition']]
+
+    def drop_index_statements(self, index: Dict[str, str]) -> List[str]:
+        """Builds statements to drop index"""
+        return [f'DROP INDEX {quote_name(index["schema"])}.{quote_name(index["name"])}']
+
+    def rename_index_statements(self, index: Dict[str, str], name: str) -> List[str]:
+        """Builds statements to rename index"""
+        raise NotImplementedError(f'Renaming indexes is not supported by {type(self).__name__}')
+
+    def index_build_progress_query(self, full_name: str) -> Optional[str]:
+        """Builds query returning progress of index builds on table, one row per build with pid, phase,
+        blocks_done, blocks_total, tuples_done and tuples_total columns. None if progress is not available.
+
+        :param full_name: full name of table (or materialized view)
+        """
+        return None
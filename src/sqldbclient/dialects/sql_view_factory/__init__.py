@@ -0,0 +1 @@
+from sqldbclient.dialects.sql_view_factory.sql_view_factory import SqlViewFactory
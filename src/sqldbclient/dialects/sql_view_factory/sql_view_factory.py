@@ -0,0 +1,40 @@
+from sqldbclient.dialects.sql_view_dialect.view import View
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import get_view_dialect
+from sqldbclient.sql_executor import SqlExecutor
+from sqldbclient.sql_metadata_cache.sql_metadata_cache import SqlMetadataCache
+
+
+class SqlViewFactory:
+    """Factory to create View objects, which store all information obout them
+    to be able to fully restore them in database, if necessary.
+    Catalog is read by SqlViewDialect of the engine, see :func:`~sqldbclient.dialects.get_view_dialect`.
+
+    Created objects are kept in metadata cache of the engine
+    (see :class:`~sqldbclient.sql_metadata_cache.SqlMetadataCache`), and each call of :func:`~create`
+    returns a new copy of cached View, which can be modified freely.
+
+    :param view_name: view name
+    :param view_schema: view schema
+    :param sql_executor: instance of SqlExecutor
+    :param use_cache: If ``False``, catalog is queried every time, and the result is not cached
+    """
+    def __init__(self, view_name: str, view_schema: str, sql_executor: SqlExecutor, use_cache: bool = True):
+        self.name = view_name
+        self.schema = view_schema
+        self.sql_executor = sql_executor
+        self.use_cache = use_cache
+
+    def _load(self) -> View:
+        view_dialect = get_view_dialect(self.sql_executor.engine.dialect.name)
+        views = view_dialect.load_views(self.name, self.schema, self.sql_executor)
+        return views[(self.schema, self.name)]
+
+    def create(self) -> View:
+        """Creates View object with all necessary information.
+
+        :return: View object
+        """
+        if not self.use_cache:
+            return self._load()
+        metadata_cache = SqlMetadataCache.get_or_create(self.sql_executor.engine)
+        return metadata_cache.get('view_trees', (self.schema, self.name), self._load)
@@ -0,0 +1,4 @@
+from sqldbclient.dialects.sql_view_materializer.sql_view_materializer_utils import SqlViewMaterializerUtils
+from sqldbclient.dialects.sql_view_materializer.sql_view_materializer import SqlViewMaterializer
+from sqldbclient.dialects.sql_view_materializer.materialization_plan import MaterializationPlan
+from sqldbclient.dialects.sql_view_materializer.sql_script_recorder import SqlScriptRecorder
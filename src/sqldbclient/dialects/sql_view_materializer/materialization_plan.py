@@ -0,0 +1,99 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+import pandas as pd
+
+from sqldbclient.dialects.sql_view_materializer.sql_script_recorder import PlannedStatement
+
+# separator of statements in batches executed by SqlViewMaterializerUtils
+STATEMENT_SEPARATOR = ';\n'
+
+# dropping of temporary objects left by failed swaps (IF EXISTS) does not drop existing objects
+DROP_PATTERN = re.compile(r'^DROP (?:MATERIALIZED )?VIEW (?!IF EXISTS )(?P<name>.+)$', re.DOTALL)
+CREATE_PATTERN = re.compile(r'^CREATE (?:MATERIALIZED )?VIEW (?P<name>.+?) AS\n', re.DOTALL)
+REFRESH_PATTERN = re.compile(r'^REFRESH MATERIALIZED VIEW (?:CONCURRENTLY )?(?P<name>.+)$', re.DOTALL)
+CREATE_INDEX_PATTERN = re.compile(r'^CREATE (?:UNIQUE )?INDEX (?:CONCURRENTLY )?(?P<name>.+?) ON ', re.DOTALL)
+
+
+@dataclass
+class MaterializationPlan:
+    """Statements, that materializing View would execute, in order of execution,
+    along with summary of changes and estimates of materialized views refresh cost.
+
+    Estimates contain a row per materialized view to refresh, with its number of rows and total size
+    according to statistics of the existing object, median duration of its latest refreshes recorded
+    in history database, and estimated refresh duration (median duration when known, otherwise
+    the size multiplied by the mean refresh speed of objects having known durations).
+    """
+    view_name: str
+    statements: List[PlannedStatement] = field(repr=False)
+    estimates: Optional[pd.DataFrame] = field(default=None, repr=False)
+
+    def _split_statements(self) -> List[str]:
+        return [statement.strip()
+                for planned in self.statements
+                for statement in planned.statement.split(STATEMENT_SEPARATOR)]
+
+    def _find(self, pattern: re.Pattern) -> List[str]:
+        matches = [pattern.match(statement) for statement in self._split_statements()]
+        return [match['name'] for match in matches if match is not None]
+
+    @property
+    def objects_to_drop(self) -> List[str]:
+        return self._find(DROP_PATTERN)
+
+    @property
+    def objects_to_create(self) -> List[str]:
+        return self._find(CREATE_PATTERN)
+
+    @property
+    def objects_to_refresh(self) -> List[str]:
+        return self._find(REFRESH_PATTERN)
+
+    @property
+    def indexes_to_create(self) -> List[str]:
+        return self._find(CREATE_INDEX_PATTERN)
+
+    @property
+    def grants(self) -> List[str]:
+        return [statement for statement in self._split_statements() if statement.startswith('GRANT ')]
+
+    @property
+    def estimated_seconds(self) -> Optional[float]:
+        """Estimated total duration of refreshes, None when it cannot be estimated"""
+        if self.estimates is None or self.estimates.empty or self.estimates['estimated_seconds'].isna().any():
+            return None
+        return float(self.estimates['estimated_seconds'].sum())
+
+    @property
+    def script(self) -> str:
+        """SQL script with statements in order of execution, where transactions are enclosed
+        in BEGIN and COMMIT, and statements executed in autocommit mode are marked with comment"""
+        lines = []
+        transaction = None
+        for planned in self.statements:
+            if planned.transaction != transaction:
+                if transaction is not None:
+                    lines.append('COMMIT;')
+                if planned.transaction is not None:
+                    lines.append('BEGIN;')
+                transaction = planned.transaction
+            if planned.transaction is None:
+                lines.append('-- autocommit')
+            lines.append(planned.statement.strip() + ';')
+        if transaction is not None:
+            lines.append('COMMIT;')
+        return '\n'.join(lines)
+
+    def __str__(self) -> str:
+        summary = [
+            f'-- Materialization plan of {self.view_name}',
+            f'-- objects to drop: {len(self.objects_to_drop)}, objects to create: {len(self.objects_to_create)}, '
+            f'objects to refresh: {len(self.objects_to_refresh)}, indexes to create: {len(self.indexes_to_create)}, '
+            f'grants: {len(self.grants)}',
+        ]
+        estimated_seconds = self.estimated_seconds
+        if estimated_seconds is not None:
+            summary.append(f'-- estimated refresh duration: {estimated_seconds:.1f} seconds')
+        return '\n'.join([*summary, self.script])
@@ -0,0 +1,65 @@
+import itertools
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Iterator
+
+from sqlalchemy.engine.base import Engine
+
+
+@dataclass
+class PlannedStatement:
+    """Statement (or batch of statements), that would be executed.
+    Statements with the same transaction number would be executed in a single transaction,
+    statements without transaction number would be executed in autocommit mode.
+    """
+    statement: str
+    transaction: Optional[int] = None
+
+
+class SqlScriptRecorder:
+    """Stand-in for SqlExecutor, which records statements instead of executing them.
+    It supports transactions and clones, so that code written for SqlExecutor can be run as a dry run.
+    Statements of a transaction are recorded all at once on commit, and discarded on rollback,
+    so that transactions of clones used in other threads do not interleave.
+
+    :param engine: engine of database, which statements are recorded for
+    """
+    def __init__(self,
+                 engine: Engine,
+                 statements: Optional[List[PlannedStatement]] = None,
+                 transaction_numbers: Optional[Iterator[int]] = None,
+                 lock: Optional[threading.Lock] = None):
+        self.engine = engine
+        self.statements: List[PlannedStatement] = [] if statements is None else statements
+        self._transaction_numbers = itertools.count(1) if transaction_numbers is None else transaction_numbers
+        self._lock = threading.Lock() if lock is None else lock
+        self._transaction: Optional[List[str]] = None
+
+    def clone(self, autocommit: bool = False) -> 'SqlScriptRecorder':
+        return SqlScriptRecorder(self.engine, self.statements, self._transaction_numbers, self._lock)
+
+    def execute(self, query: str, **kwargs) -> None:
+        if self._transaction is not None:
+            self._transaction.append(query)
+            return
+        with self._lock:
+            self.statements.append(PlannedStatement(query))
+
+    def __enter__(self):
+        if self._transaction is not None:
+            raise NotImplementedError('Nested transaction are not supported yet')
+        self._transaction = []
+        return self
+
+    def __exit__(self, exc_type, exc, exc_tb):
+        self._transaction = None
+
+    def commit(self) -> None:
+        with self._lock:
+            number = next(self._transaction_numbers)
+            self.statements.extend(PlannedStatement(query, number) for query in self._transaction)
+        # like SqlExecutor, executes statements in autocommit mode after transaction is ended
+        self._transaction = None
+
+    def rollback(self) -> None:
+        self._transaction = None
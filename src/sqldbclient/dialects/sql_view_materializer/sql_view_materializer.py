@@ -0,0 +1,303 @@
+import copy
+import logging
+from dataclasses import fields, replace
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from sqldbclient.sql_executor import SqlExecutor
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import get_view_dialect
+from sqldbclient.dialects.sql_view_factory.sql_view_factory import SqlViewFactory
+from sqldbclient.dialects.sql_view_materializer.sql_script_recorder import SqlScriptRecorder
+from sqldbclient.dialects.sql_view_materializer.materialization_plan import MaterializationPlan
+from sqldbclient.dialects.sql_view_materializer.sql_view_materializer_utils import SqlViewMaterializerUtils
+from sqldbclient.utils.dependency_graph import DependencyGraph
+
+logger = logging.getLogger(__name__)
+
+
+class SqlViewMaterializer:
+    """Class that is used to materialize in database changes that were made to corresponding View object.
+
+    When a view has to be recreated, one of the modes is used:
+
+    - 'drop': the view and all its dependant objects are dropped, recreated, refreshed and indexed
+      in a single transaction, which locks them out for the whole time
+    - 'swap': a materialized view is built and indexed under a temporary name first, then in a single
+      transaction the existing view is dropped and replaced by the new one, and dependant objects are recreated,
+      so that readers of the view are locked out only while dependant objects are rebuilt
+
+    With max_workers greater than 1, recreated objects are committed unpopulated first,
+    then materialized views are refreshed and indexed concurrently on separate connections,
+    each one as soon as all objects it depends on are done. This way independent branches of a wide
+    dependency tree are rebuilt in parallel, at the cost of objects being unpopulated until they are refreshed.
+
+    With index_workers greater than 1, indexes of each materialized view are built in parallel on separate
+    connections outside of transaction, once the materialized view is refreshed and committed
+    (in 'swap' mode, the new materialized view is indexed before it replaces the existing one).
+    Progress of builds is logged, when SqlViewDialect provides it (e.g. from pg_stat_progress_create_index).
+
+    Changes can be previewed with :func:`~plan`, which returns statements, that :func:`~materialize` would execute,
+    along with refresh cost estimates, without executing them.
+    """
+    # number of the latest refreshes in history database, which durations are used for estimates
+    REFRESH_TIMINGS_LIMIT = 5
+    RECREATE_MODES = ('drop', 'swap')
+
+    def __init__(
+        self,
+        view: View,
+        sql_executor: SqlExecutor,
+        recreate_mode: str = 'drop',
+        max_workers: int = 1,
+        index_workers: int = 1,
+    ):
+        if recreate_mode not in self.RECREATE_MODES:
+            raise ValueError(f'Argument recreate_mode should be one of {self.RECREATE_MODES}, got {recreate_mode}')
+        if max_workers < 1:
+            raise ValueError(f'Argument max_workers should be positive, got {max_workers}')
+        if index_workers < 1:
+            raise ValueError(f'Argument index_workers should be positive, got {index_workers}')
+        self.sql_executor = sql_executor
+        self.view = view
+        self.recreate_mode = recreate_mode
+        self.max_workers = max_workers
+        self.index_workers = index_workers
+        self.dialect = get_view_dialect(sql_executor.engine.dialect.name)
+        self._recreated = False
+        # cache is bypassed, since the database object may have been changed by another session
+        view_factory = SqlViewFactory(self.view.name, self.view.schema, self.sql_executor, use_cache=False)
+        self.existing_view = view_factory.create()
+
+    def _recreate(self):
+        if self.recreate_mode == 'swap' and self.view.view_type == ViewType.MATERIALIZED_VIEW:
+            self._swap()
+            return
+        with self.sql_executor:
+            # from children to parents
+            dependant_objects_reversed = self.existing_view.dependant_objects[::-1]
+            for obj in dependant_objects_reversed:
+                SqlViewMaterializerUtils(obj, self.sql_executor).drop()
+            SqlViewMaterializerUtils(self.existing_view, self.sql_executor).drop()
+
+            # from parents to children
+            SqlViewMaterializerUtils(self.view, self.sql_executor).restore()
+            for obj in self.view.dependant_objects:
+                SqlViewMaterializerUtils(obj, self.sql_executor).restore()
+
+            if self.max_workers == 1:
+                self._populate([self.view, *self.view.dependant_objects])
+            self.sql_executor.commit()
+        if self.max_workers > 1:
+            self._populate_in_parallel([self.view, *self.view.dependant_objects])
+        elif self.index_workers > 1:
+            self._create_indexes_in_parallel([self.view, *self.view.dependant_objects])
+        logger.info(f'View {self} recreated')
+
+    def _populate(self, objects: List[View]) -> None:
+        # from parents to children
+        for obj in objects:
+            SqlViewMaterializerUtils(obj, self.sql_executor).refresh()
+        if self.index_workers > 1:
+            # indexes are built outside of transaction, after it is committed
+            return
+        # from parents to children
+        for obj in objects:
+            SqlViewMaterializerUtils(obj, self.sql_executor).create_indexes()
+
+    def _create_indexes_in_parallel(self, objects: List[View]) -> None:
+        for obj in objects:
+            SqlViewMaterializerUtils(obj, self.sql_executor).create_indexes_in_parallel(self.index_workers)
+
+    def _populate_in_parallel(self, objects: List[View]) -> None:
+        graph = DependencyGraph()
+        for obj in objects:
+            # dependant objects are transitive, so there are redundant edges, which do not change the order
+            parents = [p.full_name for p in objects
+                       if any(d.full_name == obj.full_name for d in p.dependant_objects)]
+            graph.add(obj.full_name, obj, depends_on=parents)
+
+        def populate(obj: View) -> None:
+            sql_executor = self.sql_executor.clone()
+            obj_utils = SqlViewMaterializerUtils(obj, sql_executor)
+            with sql_executor:
+                obj_utils.refresh()
+                if self.index_workers == 1:
+                    obj_utils.create_indexes()
+                sql_executor.commit()
+            if self.index_workers > 1:
+                obj_utils.create_indexes_in_parallel(self.index_workers)
+
+        logger.info(f'Populating {len(graph)} objects with {self.max_workers} workers...')
+        graph.run(populate, max_workers=self.max_workers)
+
+    def _swap(self):
+        temp_name = self.dialect.get_temp_name(self.view.name)
+        temp_view = replace(self.view, name=temp_name, dependant_objects=[], indexes=[])
+        temp_view.indexes = [self.dialect.get_temp_index(index, temp_view.full_name) for index in self.view.indexes]
+        temp_view.indexes_number = len(temp_view.indexes)
+
+        # existing view and its dependant objects are still available while the new one is built
+        with self.sql_executor:
+            temp_view_utils = SqlViewMaterializerUtils(temp_view, self.sql_executor)
+            # temporary object may be left by a swap, that failed before
+            temp_view_utils.drop(if_exists=True)
+            temp_view_utils.restore()
+            temp_view_utils.refresh()
+            if self.index_workers == 1:
+                temp_view_utils.create_indexes()
+            self.sql_executor.commit()
+        if self.index_workers > 1:
+            try:
+                temp_view_utils.create_indexes_in_parallel(self.index_workers)
+            except Exception:
+                # temporary object is already committed, so it is not rolled back
+                with self.sql_executor:
+                    temp_view_utils.drop()
+                    self.sql_executor.commit()
+                raise
+        logger.info(f'View {temp_view.full_name} built')
+
+        with self.sql_executor:
+            # from children to parents
+            for obj in self.existing_view.dependant_objects[::-1]:
+                SqlViewMaterializerUtils(obj, self.sql_executor).drop()
+            SqlViewMaterializerUtils(self.existing_view, self.sql_executor).drop()
+
+            temp_view_utils.rename(self.view.name)
+            temp_view_utils.execute_statements([
+                statement
+                for temp_index, index in zip(temp_view.indexes, self.view.indexes)
+                for statement in self.dialect.rename_index_statements(temp_index, index['name'])
+            ])
+
+            # from parents to children
+            for obj in self.view.dependant_objects:
+                SqlViewMaterializerUtils(obj, self.sql_executor).restore()
+
+            if self.max_workers == 1:
+                self._populate(self.view.dependant_objects)
+            self.sql_executor.commit()
+        if self.max_workers > 1 and self.view.dependant_objects:
+            self._populate_in_parallel(self.view.dependant_objects)
+        elif self.index_workers > 1:
+            self._create_indexes_in_parallel(self.view.dependant_objects)
+        logger.info(f'View {self} recreated by swapping')
+
+    def refresh(self, concurrently: bool = True) -> None:
+        """Refreshes materialized view and all its dependant materialized views from parents to children
+        in a single transaction.
+
+        :param concurrently: If ``True``, materialized views having unique index (without WHERE clause)
+            are refreshed without locking out concurrent selects on them, others are refreshed regularly.
+        """
+        with self.sql_executor:
+            for obj in [self.existing_view, *self.existing_view.dependant_objects]:
+                SqlViewMaterializerUtils(obj, self.sql_executor).refresh(concurrently=concurrently)
+            self.sql_executor.commit()
+        logger.info(f'View {self.existing_view} refreshed')
+
+    def _parse_field(self, field):
+        existing_value = getattr(self.existing_view, field.name)
+        new_value = getattr(self.view, field.name)
+        if existing_value == new_value:
+            return
+        logger.info(f'Found different value for field: {field.name}')
+
+        if field.name in ['schema', 'name', 'full_name']:
+            raise Exception('Unexpected error')
+        if field.name in ['dependant_objects', 'dependant_objects_number', 'indexes', 'indexes_number']:
+            logger.warning(f'{field.name} cannot be changed')
+            return
+        if field.name in ('table_description', 'col_descriptions'):
+            raise NotImplementedError()
+
+        if field.name == 'privileges':
+            SqlViewMaterializerUtils(self.view, self.sql_executor).set_privileges()
+        elif field.name == 'owner':
+            SqlViewMaterializerUtils(self.view, self.sql_executor).set_owner()
+        elif field.name in ['definition', 'view_type']:
+            if self._recreated:
+                return
+            logger.warning(f'To change {field.name} view {self.view.full_name} will be fully recreated')
+            self._recreate()
+            self._recreated = True
+
+        logger.info(f'Field {field.name} set to {new_value}')
+
+    def materialize(self) -> None:
+        """Materializes in database changes that were made to corresponding View object.
+        """
+        if self.view == self.existing_view:
+            logger.warning("View already exists, nothing done")
+            return
+
+        if fields(self.view) != fields(self.existing_view):
+            raise ValueError(f'View {self.view} invalid')
+
+        # view is recreated once, even if both its definition and type are changed
+        self._recreated = False
+        for field in fields(self.view):
+            self._parse_field(field)
+
+    def plan(self) -> MaterializationPlan:
+        """Computes changes, that :func:`~materialize` would make, without executing them.
+
+        :return: MaterializationPlan with ordered statements, objects to drop, create and refresh,
+            indexes to create, grants to apply and refresh cost estimates
+        """
+        dry_run = copy.copy(self)
+        dry_run.sql_executor = SqlScriptRecorder(self.sql_executor.engine)
+        dry_run.materialize()
+        plan = MaterializationPlan(self.view.full_name, dry_run.sql_executor.statements)
+        plan.estimates = self._estimate_refreshes(plan.objects_to_refresh)
+        return plan
+
+    def _get_refresh_seconds(self, full_name: str) -> Optional[float]:
+        if not self.sql_executor.history_enabled:
+            return None
+        engine_url = repr(self.sql_executor.engine.url)
+        timings = pd.concat([
+            self.sql_executor.get_query_timings(
+                f'REFRESH MATERIALIZED VIEW{clause} {full_name}', engine_url, self.REFRESH_TIMINGS_LIMIT)
+            for clause in ('', ' CONCURRENTLY')
+        ])
+        if timings.empty:
+            return None
+        latest = timings.sort_values('start_time', ascending=False).head(self.REFRESH_TIMINGS_LIMIT)
+        return float(latest['elapsed_seconds'].median())
+
+    def _estimate_refreshes(self, full_names: List[str]) -> pd.DataFrame:
+        columns = ['full_name', 'reltuples', 'total_bytes', 'previous_refresh_seconds', 'estimated_seconds']
+        if not full_names:
+            return pd.DataFrame([], columns=columns)
+        # refreshed objects replace the existing ones, the new view may be built under temporary name
+        existing_objects: Dict[str, View] = {
+            obj.full_name: obj for obj in [self.existing_view, *self.existing_view.dependant_objects]
+        }
+        existing_objects[replace(self.view, name=self.dialect.get_temp_name(self.view.name)).full_name] = \
+            self.existing_view
+        objects = [existing_objects[full_name] for full_name in full_names if full_name in existing_objects]
+
+        stats_df = self.dialect.get_relation_stats(objects, self.sql_executor)
+        stats = {(row.schema, row.name): row for row in stats_df.itertuples(index=False)}
+
+        rows = []
+        for full_name in full_names:
+            obj = existing_objects.get(full_name)
+            row_stats = stats.get((obj.schema, obj.name)) if obj is not None else None
+            rows.append((
+                full_name,
+                row_stats.reltuples if row_stats is not None else None,
+                row_stats.total_bytes if row_stats is not None else None,
+                self._get_refresh_seconds(obj.full_name) if obj is not None else None,
+            ))
+        estimates = pd.DataFrame(rows, columns=columns[:-1])
+        estimates['estimated_seconds'] = estimates['previous_refresh_seconds']
+        known = estimates.dropna(subset=['total_bytes', 'previous_refresh_seconds'])
+        if not known.empty and known['total_bytes'].sum() > 0:
+            seconds_per_byte = known['previous_refresh_seconds'].sum() / known['total_bytes'].sum()
+            estimates['estimated_seconds'] = estimates['estimated_seconds'].fillna(
+                estimates['total_bytes'] * seconds_per_byte)
+        return estimates
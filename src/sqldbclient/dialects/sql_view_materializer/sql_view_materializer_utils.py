@@ -0,0 +1,242 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from sqldbclient.sql_executor import SqlExecutor
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import get_view_dialect, execute_catalog_query
+
+logger = logging.getLogger(__name__)
+
+
+def report_index_build_progress(
+    sql_executor: SqlExecutor,
+    query: str,
+    full_name: str,
+    stop: threading.Event,
+    interval: float,
+) -> None:
+    """Logs progress of index builds on table (or materialized view) until stop event is set.
+
+    :param sql_executor: instance of SqlExecutor, which is not used by other threads
+    :param query: query returning progress of builds, see :func:`~SqlViewDialect.index_build_progress_query`
+    :param full_name: full name of table
+    :param stop: event, that stops reporting
+    :param interval: number of seconds between reports
+    """
+    while not stop.wait(interval):
+        try:
+            df = execute_catalog_query(query, sql_executor)
+        except Exception as exc:
+            logger.warning(f'Unable to get progress of index builds on {full_name}: {exc}')
+            return
+        for row in df.itertuples(index=False):
+            blocks = f'{row.blocks_done}/{row.blocks_total}' if row.blocks_total else '-'
+            tuples = f'{row.tuples_done}/{row.tuples_total}' if row.tuples_total else '-'
+            logger.info(f'Building index on {full_name} (pid {row.pid}): {row.phase}, '
+                        f'blocks {blocks}, tuples {tuples}')
+
+
+class SqlViewMaterializerUtils:
+    """Class that performs standard database actions, such as
+    setting owner, granting privileges, dropping and creating objects and indices,
+    and refreshing materialized views. Statements are built by SqlViewDialect of the engine.
+
+    Statements of each action are built by ``*_statements`` methods, and executed as a single batch
+    in one round trip, e.g. :func:`~restore` creates object, sets its owner, privileges and comments at once.
+    """
+    def __init__(self, view: View, sql_executor: SqlExecutor):
+        self.view = view
+        self.sql_executor = sql_executor
+        self.dialect = get_view_dialect(sql_executor.engine.dialect.name)
+
+    def execute_statements(self, statements: List[str]) -> None:
+        """Executes statements as a single multi-statement batch, bypassing query preparation.
+        If database does not support batches, statements are executed one by one.
+
+        :param statements: list of statements without trailing semicolons
+        """
+        if not statements:
+            return
+        batches = [';\n'.join(statements)] if self.dialect.supports_statement_batches else statements
+        for batch in batches:
+            self.sql_executor.execute(batch, use_raw_query=True, add_limit=False)
+
+    def owner_statements(self) -> List[str]:
+        """Builds statement to set owner"""
+        return self.dialect.owner_statements(self.view)
+
+    def set_owner(self) -> None:
+        """Sets owner"""
+        self.execute_statements(self.owner_statements())
+        logger.info(f'View {self.view.full_name} owner set to {self.view.owner}')
+
+    def privileges_statements(self, obj: Optional[View] = None) -> List[str]:
+        """Builds GRANT statements, one per set of privileges, listing all grantees having it
+
+        :param obj: (optional) object to grant privileges on, by default privileges are granted on the view itself
+        """
+        return self.dialect.privileges_statements(self.view, self.view if obj is None else obj)
+
+    def set_privileges(self) -> None:
+        """Grants privileges"""
+        self.execute_statements(self.privileges_statements())
+        logger.info(f'View {self.view.full_name} privileges set')
+
+    def descriptions_statements(self) -> List[str]:
+        """Builds COMMENT statements for object and its columns"""
+        return self.dialect.descriptions_statements(self.view)
+
+    def set_descriptions(self) -> None:
+        """Sets description"""
+        self.execute_statements(self.descriptions_statements())
+
+    def create_statements(self) -> List[str]:
+        """Builds statement to create database object"""
+        return self.dialect.create_statements(self.view)
+
+    def restore_statements(self) -> List[str]:
+        """Builds statements to fully restore object in database"""
+        return [
+            *self.create_statements(),
+            *self.owner_statements(),
+            *self.privileges_statements(),
+            *self.descriptions_statements(),
+        ]
+
+    def restore(self) -> None:
+        """Fully restores object in database"""
+        self.execute_statements(self.restore_statements())
+        logger.info(f'Restored {self.view.full_name}')
+
+    def drop_statements(self, if_exists: bool = False) -> List[str]:
+        """Builds statement to drop database object
+
+        :param if_exists: If ``True``, object is dropped only if it exists
+        """
+        return self.dialect.drop_statements(self.view, if_exists)
+
+    def drop(self, if_exists: bool = False) -> None:
+        """Drops database object
+
+        :param if_exists: If ``True``, object is dropped only if it exists
+        """
+        self.execute_statements(self.drop_statements(if_exists))
+        logger.info(f'View {self.view.full_name} dropped')
+
+    def create(self) -> None:
+        """"Creates database object"""
+        self.execute_statements(self.create_statements())
+        logger.info(f'Created {self.view.full_name}')
+
+    def copy_privileges_to(self, obj: View):
+        """"Sets privileges, that is granted to one object, to another"""
+        self.execute_statements(self.privileges_statements(obj))
+
+    @property
+    def can_refresh_concurrently(self) -> bool:
+        """Whether materialized view has unique index on columns without WHERE clause,
+        which is required to refresh it concurrently"""
+        return any(self.dialect.is_unique_column_index(index) for index in self.view.indexes)
+
+    def refresh(self, concurrently: bool = False) -> None:
+        """Refreshes materialized view
+
+        :param concurrently: If ``True``, refreshes materialized view without locking out concurrent selects on it,
+            when it has unique index. Otherwise, falls back to regular refresh.
+            Note that the materialized view should already be populated.
+        """
+        logger.info(f'Refreshing {self.view.full_name}...')
+        if self.view.view_type == ViewType.REGULAR_VIEW:
+            logger.info(f'Skipping regular view {self.view.full_name}')
+        elif self.view.view_type == ViewType.MATERIALIZED_VIEW:
+            if concurrently and not self.can_refresh_concurrently:
+                logger.warning(f'No unique index found for {self.view.full_name}, it cannot be refreshed concurrently')
+                concurrently = False
+            for statement in self.dialect.refresh_statements(self.view, concurrently):
+                self.sql_executor.execute(statement)
+        else:
+            raise Exception('Unexpected error')
+        logger.info(f'Refreshed {self.view.full_name}')
+
+    def rename(self, name: str) -> None:
+        """Renames database object, its full name is not changed in View object"""
+        self.execute_statements(self.dialect.rename_statements(self.view, name))
+        logger.info(f'Renamed {self.view.full_name} to "{name}"')
+
+    def drop_indexes_statements(self) -> List[str]:
+        """Builds statements to drop indexes"""
+        return [statement for index in self.view.indexes for statement in self.dialect.drop_index_statements(index)]
+
+    def drop_indexes(self) -> None:
+        """Drops indexes"""
+        logger.info(f'Dropping indexes for {self.view.full_name}...')
+        self.execute_statements(self.drop_indexes_statements())
+        logger.info(f'Dropped indexes for {self.view.full_name}')
+
+    def create_indexes_statements(self, concurrently: bool = False) -> List[str]:
+        """Builds statements to create indexes
+
+        :param concurrently: If ``True``, indexes are built without locking out writes to the table
+        """
+        return [
+            statement
+            for index in self.view.indexes
+            for statement in self.dialect.create_index_statements(index, concurrently)
+        ]
+
+    def create_indexes(self) -> None:
+        """Creates indexes"""
+        logger.info(f'Creating indexes for {self.view.full_name}...')
+        self.execute_statements(self.create_indexes_statements())
+        logger.info(f'Created indexes for {self.view.full_name}')
+
+    def create_indexes_in_parallel(
+        self,
+        max_workers: int,
+        concurrently: bool = False,
+        progress_interval: Optional[float] = 30.0,
+    ) -> None:
+        """Creates indexes in parallel, each one on a separate connection in autocommit mode.
+        Object should be committed, since indexes are built outside of transaction.
+
+        :param max_workers: maximum number of indexes built at the same time
+        :param concurrently: If ``True``, indexes are created concurrently, that is without locking out writes
+            (e.g. refreshes of materialized view), but slower. Note that concurrent builds on the same object
+            wait for each other, and failed concurrent build leaves invalid index.
+        :param progress_interval: number of seconds between logging progress of builds
+            (e.g. from pg_stat_progress_create_index), progress is not logged when None
+            or when it is not provided by SqlViewDialect
+        """
+        definitions = self.create_indexes_statements(concurrently)
+        if not definitions:
+            return
+        logger.info(f'Creating {len(definitions)} indexes for {self.view.full_name} with {max_workers} workers...')
+
+        def create_index(definition: str) -> None:
+            self.sql_executor.clone(autocommit=True).execute(definition)
+
+        stop = threading.Event()
+        monitor = None
+        progress_query = self.dialect.index_build_progress_query(self.view.full_name)
+        if progress_interval is not None and progress_query is not None:
+            monitor = threading.Thread(
+                target=report_index_build_progress,
+                args=(self.sql_executor.clone(), progress_query, self.view.full_name, stop, progress_interval),
+                name='index_build_progress',
+                daemon=True,
+            )
+            monitor.start()
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='index_build') as pool:
+                futures = [pool.submit(create_index, definition) for definition in definitions]
+        finally:
+            stop.set()
+            if monitor is not None:
+                monitor.join()
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            logger.error(f'Failed to create {len(errors)} of {len(definitions)} indexes for {self.view.full_name}')
+            raise errors[0]
+        logger.info(f'Created indexes for {self.view.full_name}')
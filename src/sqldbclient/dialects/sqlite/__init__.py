@@ -0,0 +1,8 @@
+"""
+``SqliteViewDialect`` makes ``SqlViewFactory`` and ``SqlViewMaterializer`` work with SQLite databases,
+e.g. as a local stand-in of a server-side database in tests.
+SQLite has neither materialized views, nor owners, privileges and comments, and does not keep dependencies
+between views, so they are found by searching names of other views in view definitions.
+"""
+
+from sqldbclient.dialects.sqlite.sqlite_view_dialect import SqliteViewDialect
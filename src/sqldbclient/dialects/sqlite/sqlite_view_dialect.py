@@ -0,0 +1,112 @@
+import logging
+import re
+from typing import Dict, List, Set, TYPE_CHECKING
+
+import sqlparse
+from sqlparse import tokens as T
+
+from sqldbclient.dialects.sql_view_dialect.view import View, ViewType
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import SqlViewDialect, ObjectKey, DependencyEdges, \
+    sort_dependant_objects, execute_catalog_query, quote_name
+
+if TYPE_CHECKING:
+    from sqldbclient.sql_executor import SqlExecutor
+
+logger = logging.getLogger(__name__)
+
+SQLITE_VIEWS_QUERY_TEMPLATE = '''
+    SELECT name, sql
+    FROM {schema}.sqlite_master
+    WHERE type = 'view'
+    ORDER BY name
+'''
+
+VIEW_DEFINITION_PATTERN = re.compile(
+    r'^\s*CREATE\s+(?:TEMP(?:ORARY)?\s+)?VIEW\s+(?:IF\s+NOT\s+EXISTS\s+)?'
+    r'(?:"(?:[^"]|"")+"|\[[^\]]+\]|`[^`]+`|[^\s(]+)\s*AS\s+(?P<definition>.*)$',
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def normalize_name(name: str) -> str:
+    """Removes quotes from identifier and lowers its case, since SQLite names are case-insensitive"""
+    if len(name) > 1 and name[0] + name[-1] in ('""', '[]', '``'):
+        name = name[1:-1]
+    return name.lower()
+
+
+def get_view_definition(sql: str) -> str:
+    """Extracts SELECT statement from CREATE VIEW statement stored in sqlite_master"""
+    match = VIEW_DEFINITION_PATTERN.match(sql)
+    if match is None:
+        raise ValueError(f'Unable to parse view definition: {sql}')
+    return match['definition'].strip().rstrip(';')
+
+
+def get_referenced_names(definition: str) -> Set[str]:
+    """Returns normalized names of all identifiers (and keywords, which may be used as names) in definition"""
+    return {
+        normalize_name(token.value)
+        for token in sqlparse.parse(definition)[0].flatten()
+        if token.ttype in T.Name or token.ttype in T.String.Symbol or token.ttype in T.Keyword
+    }
+
+
+def get_dependency_edges(schema: str, definitions: Dict[str, str]) -> DependencyEdges:
+    """Finds dependencies between views by searching names of views in definitions of other views.
+    Since names are not resolved, a column named as a view gives redundant dependency.
+
+    :param schema: schema of views
+    :param definitions: dict of view definitions by view names
+    :return: list of pairs ((schema, source_view), (schema, dependent_view))
+    """
+    names = {normalize_name(name): name for name in definitions}
+    edges = []
+    for name, definition in definitions.items():
+        for referenced in get_referenced_names(definition):
+            source = names.get(referenced)
+            if source is not None and source != name:
+                edges.append(((schema, source), (schema, name)))
+    return edges
+
+
+class SqliteViewDialect(SqlViewDialect):
+    """SQLite implementation of SqlViewDialect, supporting regular views only.
+    Definitions of all views in schema are read with a single query.
+    """
+    # sqlite3 driver executes one statement at a time
+    supports_statement_batches = False
+
+    def load_views(self, name: str, schema: str, sql_executor: 'SqlExecutor') -> Dict[ObjectKey, View]:
+        query = SQLITE_VIEWS_QUERY_TEMPLATE.format(schema=quote_name(schema))
+        df = execute_catalog_query(query, sql_executor)
+        definitions = {row.name: get_view_definition(row.sql) for row in df.itertuples(index=False)}
+        names = {normalize_name(view_name): view_name for view_name in definitions}
+        if normalize_name(name) not in names:
+            raise Exception(f'View object "{schema}"."{name}" not found')
+        name = names[normalize_name(name)]
+
+        edges = get_dependency_edges(schema, definitions)
+        keys = [(schema, name)] + sort_dependant_objects(name, schema, edges)
+        logger.info(f'Loaded {len(keys)} objects in dependency tree of "{schema}"."{name}"')
+
+        attributes = {
+            key: dict(
+                schema=key[0],
+                name=key[1],
+                view_type=ViewType.REGULAR_VIEW,
+                owner=None,
+                definition=definitions[key[1]],
+                privileges={},
+                indexes=[],
+                table_description=None,
+                col_descriptions={},
+            )
+            for key in keys
+        }
+        return self.build_views(name, schema, edges, attributes)
+
+    def create_statements(self, view: View) -> List[str]:
+        if view.view_type != ViewType.REGULAR_VIEW:
+            raise ValueError(f'Only regular views are supported by SQLite, got {view.view_type} {view.full_name}')
+        return ['\n'.join([f'CREATE VIEW {view.full_name} AS', view.definition.strip().rstrip(';')])]
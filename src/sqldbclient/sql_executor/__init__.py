@@ -13,9 +13,10 @@ Main class, ``SqlExecutor``, inherits all functionalities from ``SqlHistoryManag
    - automatically adds LIMIT clause to query
 - ``SqlTransactionManager``
    - provides context manager for performing transactions
+   - replays transactions that failed with transient errors
 
 Moreover, ``SqlExecutor`` keeps configuration
-(sqlalchemy engine parameters, default LIMIT clause value, file name for history database)
+(sqlalchemy engine parameters, default LIMIT clause value, file name for history database, retry policy)
 and provides single method for executing SQL queries.
 
 """
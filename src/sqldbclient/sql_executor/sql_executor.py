@@ -1,8 +1,11 @@
 import logging
-from typing import Union, Optional, Tuple
+from typing import Union, Optional, Tuple, Any
 from datetime import datetime
+import time
 import pandas as pd
+import sqlparse
 
+import sqlalchemy
 from sqlalchemy.engine.base import Engine
 from sqlalchemy.sql.elements import TextClause
 
@@ -10,9 +13,22 @@ from sqldbclient.utils.log_decorators import class_logifier
 from sqldbclient.sql_transaction_manager.sql_transaction_manager import SqlTransactionManager
 from sqldbclient.sql_history_manager.sql_history_manager import SqlHistoryManager
 from sqldbclient.sql_history_manager.tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery
-from sqldbclient.utils.pandas.cursor_result_to_df import cursor_result_to_df
+from sqldbclient.sql_history_manager.tables.executed_sql_query_plan.executed_sql_query_plan \
+    import ExecutedSqlQueryPlan
+from sqldbclient.sql_history_manager.tables.executed_sql_query_payload.executed_sql_query_payload \
+    import ExecutedSqlQueryPayload
+from sqldbclient.utils.pandas.cursor_result_to_df import fetch_cursor_result, rows_to_df
+from sqldbclient.utils.arrow.arrow_result import fetch_arrow_table, supports_arrow_fetch, \
+    fetch_arrow_table_within_budget, DTYPE_BACKENDS
 from sqldbclient.utils.deprecated import deprecated
 from sqldbclient.sql_query_preparator.sql_query_preparator import SqlQueryPreparator
+from sqldbclient.sql_metadata_cache.sql_metadata_cache import SqlMetadataCache, is_schema_changing
+from sqldbclient.sql_retry_policy.sql_retry_policy import SqlRetryPolicy
+from sqldbclient.sql_query_explainer.sql_query_explainer import SqlQueryExplainer
+from sqldbclient.sql_instrumentation import sql_event_hooks, SqlEvent
+from sqldbclient.sql_result_converter import SqlResultConverter, sql_result_converters
+from sqldbclient.sql_result_converter.builtin_converters import PANDAS_CONVERTER, ARROW_BACKED_PANDAS_CONVERTER
+from sqldbclient.sql_result_handle.sql_result_handle import SqlResultHandle
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +55,96 @@ class SqlExecutor(SqlTransactionManager, SqlQueryPreparator, SqlHistoryManager):
     - storing queries results and accessing them anywhere from local file-based SQLite database via UUID::
 
         pg_executor['ce19362a9ac54e06b3be66d5cf858932']
+
+    - retrying queries that failed with transient errors (serialization failures, deadlocks,
+      dropped connections) according to :class:`SqlRetryPolicy <SqlRetryPolicy>`
+
+    - obtaining execution plans of queries, and capturing them automatically for slow queries::
+
+        pg_executor.explain('SELECT * FROM foo', analyze=True)
+
+    - limiting SELECT query results by size in memory instead of number of rows::
+
+        pg_executor.execute('SELECT * FROM foo', max_bytes_read=256 * 2 ** 20)
+
+    - spilling results too large to fit in memory to history database, while they are fetched,
+      and reading them lazily via :class:`SqlResultHandle <SqlResultHandle>`::
+
+        handle = pg_executor.execute('SELECT * FROM foo', max_bytes_read=256 * 2 ** 20, spill=True)
+        for df in handle.iter_chunks():
+            ...
+
+    - returning results as pandas DataFrames, Arrow tables, polars DataFrames or lists of dicts,
+      built directly from fetched rows, or from record batches when the driver supports Arrow fetch
+      (e.g. ADBC drivers and DuckDB)::
+
+        pg_executor.execute('SELECT * FROM foo', output='polars')
     """
     def __init__(self,
                  engine: Engine,
                  max_rows_read: int,
-                 history_db_name: str):
-        SqlTransactionManager.__init__(self, engine)
+                 history_db_name: Optional[str],
+                 retry_policy: Optional[SqlRetryPolicy] = None,
+                 plan_capture_threshold: Optional[float] = None,
+                 max_bytes_read: Optional[int] = None):
+        SqlTransactionManager.__init__(self, engine, retry_policy)
         SqlQueryPreparator.__init__(self, max_rows_read)
         SqlHistoryManager.__init__(self, history_db_name)
+        self._explainer = SqlQueryExplainer(engine.dialect.name)
+        self._plan_capture_threshold = plan_capture_threshold
+        self._max_bytes_read = max_bytes_read
+        # repr of sqlalchemy URL hides password
+        self._engine_url = repr(engine.url)
+        self._schema_changed_in_transaction = False
+
+    @property
+    def engine(self) -> Engine:
+        return self._engine
+
+    def _invalidate_metadata_cache(self) -> None:
+        metadata_cache = SqlMetadataCache.find(self._engine)
+        if metadata_cache is not None:
+            metadata_cache.invalidate()
+
+    def _on_query_executed(self, query_type: Optional[str]) -> None:
+        if not is_schema_changing(query_type):
+            return
+        self._invalidate_metadata_cache()
+        if super()._is_in_transaction:
+            # changes become visible to other connections only after commit
+            self._schema_changed_in_transaction = True
+
+    def commit(self):
+        """Commits transaction"""
+        super().commit()
+        if self._schema_changed_in_transaction:
+            self._schema_changed_in_transaction = False
+            self._invalidate_metadata_cache()
+
+    def rollback(self):
+        """Rolls transaction back"""
+        super().rollback()
+        self._schema_changed_in_transaction = False
+
+    def clone(self, autocommit: bool = False) -> 'SqlExecutor':
+        """Creates another executor with the same engine and parameters, sharing history database,
+        but having its own connection and transaction, e.g. to execute queries in another thread.
+
+        :param autocommit: If ``True``, queries executed outside ``with`` block are run in autocommit mode,
+            as required by statements, which cannot run inside a transaction block
+            (e.g. CREATE INDEX CONCURRENTLY in PostgreSQL).
+        """
+        engine = self._engine
+        if autocommit:
+            engine = engine.execution_options(isolation_level='AUTOCOMMIT')
+        return SqlExecutor(
+            engine=engine,
+            max_rows_read=self._limit_nrows,
+            history_db_name=self._history_db_name,
+            retry_policy=self._retry_policy,
+            plan_capture_threshold=self._plan_capture_threshold,
+            max_bytes_read=self._max_bytes_read,
+        )
 
     def _do_query_execution(
             self,
@@ -56,30 +154,159 @@ class SqlExecutor(SqlTransactionManager, SqlQueryPreparator, SqlHistoryManager):
             max_rows_read: Optional[int] = None,
             outside_transaction: bool = False,
             force_result_fetching: bool = False,
-    ) -> Tuple[Optional[pd.DataFrame], ExecutedSqlQuery]:
-        connection = super()._get_connection(outside_transaction=outside_transaction)
-
+            converter: SqlResultConverter = PANDAS_CONVERTER,
+            max_bytes_read: Optional[int] = None,
+            spill: bool = False,
+    ) -> Tuple[Optional[Any], Optional[Any], ExecutedSqlQuery]:
+        if max_bytes_read is not None and max_rows_read is None:
+            # byte budget replaces the default row limit
+            add_limit = False
+        timings = {}
         query_to_execute = query
         query_to_save = query
+        query_type = None
         if not use_raw_query:
+            phase_start = time.perf_counter()
             prepared_sql_query = super().prepare(query, add_limit, max_rows_read)
+            timings['prepare_seconds'] = time.perf_counter() - phase_start
             query_to_execute = prepared_sql_query.text_sa_clause
             query_to_save = prepared_sql_query.text
+            query_type = prepared_sql_query.query_type
+        if max_bytes_read is not None:
+            if query_type is None:
+                query_type = sqlparse.parse(query)[0].get_type()
+            if query_type != 'SELECT':
+                # budget applies to row-returning statements only, others are not executed with server-side
+                # cursors, which some drivers open by DECLARE CURSOR (e.g. psycopg2), that accepts queries only
+                max_bytes_read = None
+                spill = False
+
+        retries = 0
+        while True:
+            connection = None
+            try:
+                phase_start = time.perf_counter()
+                connection = super()._get_connection(outside_transaction=outside_transaction)
+                timings['checkout_seconds'] = time.perf_counter() - phase_start
+
+                start_time = datetime.now()
+                phase_start = time.perf_counter()
+                if max_bytes_read is not None:
+                    # rows are fetched from server by batches, instead of being loaded by driver at once
+                    cursor_result = connection.execution_options(stream_results=True).execute(query_to_execute)
+                else:
+                    cursor_result = connection.execute(query_to_execute)
+                timings['execution_seconds'] = time.perf_counter() - phase_start
 
-        start_time = datetime.now()
-        cursor_result = connection.execute(query_to_execute)
-        result = cursor_result_to_df(cursor_result, force_result_fetching)
-        finish_time = datetime.now()
+                phase_start = time.perf_counter()
+                use_arrow = max_bytes_read is not None or converter.requires_arrow \
+                    or supports_arrow_fetch(cursor_result)
+                truncated = None
+                spilled_payload = None
+                if max_bytes_read is not None:
+                    fetched = fetch_arrow_table_within_budget(cursor_result, max_bytes_read, force_result_fetching)
+                    if fetched is not None:
+                        fetched, remaining_batches = fetched
+                        truncated = remaining_batches is not None
+                        if truncated and spill:
+                            # the whole result is streamed to history database instead of being truncated,
+                            # and truncated table is released, so that its batches are freed once they are stored
+                            fetched = None
+                            spilled_payload = super().spill(remaining_batches, max_bytes_read)
+                            truncated = False
+                        elif truncated:
+                            cursor_result.close()
+                elif use_arrow:
+                    fetched = fetch_arrow_table(cursor_result, force_result_fetching)
+                else:
+                    fetched = fetch_cursor_result(cursor_result, force_result_fetching)
+                timings['fetch_seconds'] = time.perf_counter() - phase_start
+                finish_time = datetime.now()
+                # number of rows affected by DML statement, -1 when not applicable
+                affected_rows = cursor_result.rowcount if fetched is None and spilled_payload is None else -1
+                break
+            except Exception as exc:
+                if not self._can_retry_query(exc, query_to_save, query_type, retries):
+                    raise
+                retries += 1
+                logger.warning(f'Query failed with transient error, retrying it (retry {retries}): {exc}')
+                self._retry_policy.wait(retries)
+            finally:
+                if connection is not None and not super()._is_in_transaction:
+                    connection.close()
 
-        if not super()._is_in_transaction:
-            connection.close()
+        if truncated:
+            logger.warning(f'Result exceeded budget of {max_bytes_read} bytes, '
+                           f'only the first {fetched.num_rows} rows were fetched')
+        result = None
+        result_info = {}
+        if affected_rows >= 0:
+            result_info['rows_count'] = affected_rows
+        if spilled_payload is not None:
+            logger.warning(f'Result exceeded budget of {max_bytes_read} bytes, '
+                           f'all {spilled_payload.rows_count} rows were spilled to history database')
+            result_info = dict(
+                rows_count=spilled_payload.rows_count,
+                columns_count=len(spilled_payload.columns),
+                result_bytes=spilled_payload.estimated_size,
+                truncated=False,
+                spilled=True,
+            )
+        elif fetched is not None and use_arrow:
+            phase_start = time.perf_counter()
+            result = converter.from_arrow(fetched)
+            result_info = dict(
+                rows_count=fetched.num_rows,
+                columns_count=fetched.num_columns,
+                result_bytes=fetched.nbytes,
+                truncated=truncated,
+            )
+            timings['conversion_seconds'] = time.perf_counter() - phase_start
+        elif fetched is not None:
+            phase_start = time.perf_counter()
+            rows, columns = fetched
+            result = converter.from_rows(rows, columns)
+            result_info = dict(
+                rows_count=len(rows),
+                columns_count=len(columns),
+                result_bytes=converter.get_size(result) if converter.get_size is not None else None,
+            )
+            timings['conversion_seconds'] = time.perf_counter() - phase_start
+        # Arrow table is stored as is, and so is pandas DataFrame built from rows, other results are stored
+        # as rows, which are converted to pandas DataFrame only when dumped
+        stored_result = result if not use_arrow and isinstance(result, pd.DataFrame) else fetched
+        if spilled_payload is not None:
+            stored_result = spilled_payload
 
         executed_query = ExecutedSqlQuery(
             query=query_to_save,
             start_time=start_time,
-            finish_time=finish_time
+            finish_time=finish_time,
+            retries=retries + self._transaction_retries,
+            engine_url=self._engine_url,
+            elapsed_seconds=sum(timings.values()),
+            **timings,
+            **result_info,
         )
-        return result, executed_query
+        if spilled_payload is not None:
+            result = SqlResultHandle(self, executed_query.uuid, spilled_payload.columns, spilled_payload.datatypes,
+                                     spilled_payload.rows_count, spilled_payload.row_group_size)
+        if (fetched is not None or spilled_payload is not None) and sql_event_hooks.is_enabled(SqlEvent.FETCH):
+            sql_event_hooks.emit(SqlEvent.FETCH, executed_query=executed_query,
+                                 seconds=timings['fetch_seconds'], rows_count=executed_query.rows_count, context={})
+        return result, stored_result, executed_query
+
+    def _can_retry_query(self, exc: Exception, query: str, query_type: Optional[str], retries: int) -> bool:
+        # failed statement aborts the whole transaction, so it can only be replayed with run_in_transaction
+        if super()._is_in_transaction:
+            return False
+        if not super()._is_retryable(exc, retries):
+            return False
+        if self._retry_policy.retry_non_select:
+            return True
+        if query_type is None:
+            query_type = sqlparse.parse(query)[0].get_type()
+        return query_type == 'SELECT'
 
     def execute(
         self,
@@ -91,7 +318,12 @@ class SqlExecutor(SqlTransactionManager, SqlQueryPreparator, SqlHistoryManager):
         force_result_fetching: bool = False,
         dump_execution_info: bool = True,
         dump_result: bool = True,
-    ) -> Optional[pd.DataFrame]:
+        output: str = 'pandas',
+        dtype_backend: str = 'numpy',
+        max_bytes_read: Optional[int] = None,
+        spill: bool = False,
+        limit_bytes: bool = True,
+    ) -> Optional[Any]:
         """Executes a SQL statement, and when applicable,
         saves result to local database and returns it in form of pandas DataFrame.
 
@@ -108,11 +340,30 @@ class SqlExecutor(SqlTransactionManager, SqlQueryPreparator, SqlHistoryManager):
             which commit results themselves. Otherwise, InvalidTransactionTermination may be raised.
         :param force_result_fetching: If ``True``, will try to fetch rows from cursor result that is obtained
             after executing query, even when the type of query does not imply returning any rows.
-        :param dump_execution_info: If ``True``, query execution info will be dumped to history database.
+        :param dump_execution_info: If ``True``, query execution info will be dumped to history database
+            (unless history is disabled).
             If ``False``, query execution info will be logged but will not be accessible via UUID from history database.
         :param dump_result: If ``True``, query result will be dumped to history database (when query selects any rows).
             If ``False``, query result will be returned but will not be accessible via UUID from history database.
-        :return: (optional) If query selects any rows then a pandas DataFrame will be returned.
+        :param output: Type of result, one of registered in ``sql_result_converters``: 'pandas' (pandas DataFrame),
+            'arrow' (Arrow table), 'polars' (polars DataFrame) or 'records' (list of dicts).
+            Results are fetched as record batches directly when the driver supports Arrow fetch,
+            Arrow tables are stored in history database as is.
+        :param dtype_backend: 'numpy' or 'pyarrow', the latter makes pandas DataFrame backed by Arrow table
+            without copying its buffers (``pd.ArrowDtype`` columns). Dates are not parsed from strings then.
+        :param max_bytes_read: (optional) Budget in bytes of result columns (measured as Arrow buffers).
+            Rows of SELECT query are fetched by batches until the budget is reached, the rest of rows is not fetched,
+            and the result is marked as truncated in execution info. If not specified, the default value
+            from SqlExecutor instance is used. When a budget is set, LIMIT clause is not added to SELECT query,
+            unless max_rows_read is specified. Other statements are executed regardless of budget. Requires pyarrow.
+        :param spill: If ``True``, result exceeding max_bytes_read is not truncated, but is streamed from cursor
+            to history database by groups of rows of about max_bytes_read, and SqlResultHandle
+            of the stored result is returned instead, which reads it lazily.
+            Requires max_bytes_read and dumping of result to history database.
+        :param limit_bytes: If ``False``, result is fetched regardless of budget, even when it is set
+            for SqlExecutor instance, e.g. for internal queries, which should never return partial result.
+        :return: (optional) If query selects any rows then its result in requested output type
+            (pandas DataFrame by default) will be returned, or SqlResultHandle, when result was spilled.
         """
         if use_raw_query is True and add_limit is True:
             raise ValueError("Argument 'add_limit' should be set to False when 'use_raw_query' is set to True")
@@ -120,23 +371,125 @@ class SqlExecutor(SqlTransactionManager, SqlQueryPreparator, SqlHistoryManager):
             raise ValueError("Argument 'max_rows_read' cannot be set when 'add_limit' is set to False")
         if dump_execution_info is False and dump_result is True:
             raise ValueError("Argument 'dump_result' should be set to False when 'dump_execution_info' is set to False")
+        if limit_bytes is False and max_bytes_read is not None:
+            raise ValueError("Argument 'max_bytes_read' cannot be set when 'limit_bytes' is set to False")
+        converter = sql_result_converters.get(output)
+        if max_bytes_read is None and limit_bytes:
+            max_bytes_read = self._max_bytes_read
+        if max_bytes_read is not None and max_bytes_read <= 0:
+            raise ValueError(f'Argument max_bytes_read should be positive, got {max_bytes_read}')
+        if spill and max_bytes_read is None:
+            raise ValueError("Argument 'max_bytes_read' should be set when 'spill' is set to True")
+        if spill and not (dump_result and super().history_enabled):
+            raise ValueError("Argument 'spill' can be set to True only when result is dumped to history database")
+        if dtype_backend not in DTYPE_BACKENDS:
+            raise ValueError(f'Argument dtype_backend should be one of {DTYPE_BACKENDS}, got {dtype_backend}')
+        if dtype_backend == 'pyarrow':
+            if output != 'pandas':
+                raise ValueError("Argument 'dtype_backend' can be set to 'pyarrow' only when 'output' is 'pandas'")
+            converter = ARROW_BACKED_PANDAS_CONVERTER
         if isinstance(query, TextClause):
             query = query.text
-        result, executed_query = self._do_query_execution(
-            query,
-            use_raw_query,
-            add_limit,
-            max_rows_read,
-            outside_transaction,
-            force_result_fetching,
-        )
-        logger.warning(f'Executed {executed_query}')
-        if dump_execution_info and dump_result:
-            super().dump(executed_query, result)
-        elif dump_result:
-            super().dump(executed_query)
+        hook_context = {}
+        if sql_event_hooks.is_enabled(SqlEvent.BEFORE_EXECUTE):
+            sql_event_hooks.emit(SqlEvent.BEFORE_EXECUTE, query=query, db_system=self._engine.dialect.name,
+                                 context=hook_context)
+        start = time.perf_counter()
+        try:
+            result, stored_result, executed_query = self._do_query_execution(
+                query,
+                use_raw_query,
+                add_limit,
+                max_rows_read,
+                outside_transaction,
+                force_result_fetching,
+                converter,
+                max_bytes_read,
+                spill,
+            )
+        except Exception as exc:
+            if sql_event_hooks.is_enabled(SqlEvent.EXECUTE_ERROR):
+                sql_event_hooks.emit(SqlEvent.EXECUTE_ERROR, query=query, error=exc,
+                                     seconds=time.perf_counter() - start, context=hook_context)
+            raise
+        logger.warning('Executed %s', executed_query)
+        self._on_query_executed(executed_query.query_type)
+        if dump_execution_info and super().history_enabled:
+            try:
+                plan = None
+                if self._plan_capture_threshold is not None:
+                    plan = self._capture_plan(executed_query)
+                if dump_result and isinstance(stored_result, tuple):
+                    stored_result = rows_to_df(*stored_result)
+                super().dump(executed_query, stored_result if dump_result else None, plan)
+            except Exception:
+                if isinstance(stored_result, ExecutedSqlQueryPayload):
+                    # spilled result is already committed, but nothing refers to it
+                    super().discard_spill(stored_result)
+                raise
+        if sql_event_hooks.is_enabled(SqlEvent.AFTER_EXECUTE):
+            sql_event_hooks.emit(SqlEvent.AFTER_EXECUTE, query=query, executed_query=executed_query,
+                                 seconds=executed_query.elapsed_seconds, context=hook_context)
         return result
 
+    def _fetch_plan(self, explain_query: str, plan_format: str) -> str:
+        connection = super()._get_connection()
+        nested_transaction = None
+        try:
+            if super()._is_in_transaction:
+                # savepoint keeps transaction usable if EXPLAIN fails, and discards changes made by analyzing
+                nested_transaction = connection.begin_nested()
+            cursor_result = connection.execute(sqlalchemy.text(explain_query))
+            rows, columns = cursor_result.fetchall(), list(cursor_result.keys())
+        finally:
+            if nested_transaction is not None:
+                nested_transaction.rollback()
+            if not super()._is_in_transaction:
+                connection.close()
+        return self._explainer.parse(rows, columns, plan_format)
+
+    def explain(
+        self,
+        query: Union[TextClause, str],
+        analyze: bool = False,
+        buffers: bool = False,
+        format: str = 'json',
+    ) -> str:
+        """Obtains execution plan of a SQL statement. Neither the statement nor its plan are saved to history database.
+
+        :param query: query text to explain in format of str or sqlalchemy TextClause.
+        :param analyze: If ``True``, query will be actually executed to collect real timings and row counts.
+            Note that changes made by analyzed statements take effect, unless they are explained inside
+            a transaction, where they are rolled back to a savepoint.
+        :param buffers: If ``True``, buffers usage will be included (PostgreSQL only), requires analyze.
+        :param format: 'json' or 'text'
+        :return: execution plan in form of json-string or text
+        """
+        if isinstance(query, TextClause):
+            query = query.text
+        prepared_sql_query = super().prepare(query, add_limit=False)
+        explain_query = self._explainer.build(prepared_sql_query.text, analyze, buffers, format)
+        return self._fetch_plan(explain_query, format)
+
+    def _capture_plan(self, executed_query: ExecutedSqlQuery) -> Optional[ExecutedSqlQueryPlan]:
+        if executed_query.query_type not in SqlQueryExplainer.EXPLAINABLE_QUERY_TYPES:
+            return None
+        if executed_query.elapsed_seconds < self._plan_capture_threshold:
+            return None
+        plan_format = 'json'
+        try:
+            explain_query = self._explainer.build(executed_query.query, plan_format=plan_format)
+            plan = self._fetch_plan(explain_query, plan_format)
+        except Exception as exc:
+            logger.warning(f'Unable to capture plan of query {executed_query.uuid}: {exc}')
+            return None
+        return ExecutedSqlQueryPlan(
+            uuid=executed_query.uuid,
+            plan=plan,
+            plan_format=plan_format,
+            plan_fingerprint=self._explainer.fingerprint(plan, plan_format),
+        )
+
     @deprecated
     def read_query(self, query: Union[TextClause, str]) -> Optional[pd.DataFrame]:
         """Deprecated method, use execute"""
@@ -10,7 +10,10 @@ class SqlExecutorBuilder:
     """Class that defines builder for SqlExecutor class,
     creates only one instance per unique set of arguments given SqlExecutorConf
     """
-    __slots__ = ['engine', 'max_rows_read', 'history_db_name']
+    __slots__ = ['engine', 'max_rows_read', 'history_db_name', 'retry_policy', 'plan_capture_threshold',
+                 'max_bytes_read']
+    # parameters that are allowed to be set to None
+    OPTIONAL_PARAMETERS = ('history_db_name', 'plan_capture_threshold', 'max_bytes_read')
 
     def config(self, config: SqlExecutorConf) -> 'SqlExecutorBuilder':
         """Reads parameter values from config"""
@@ -18,7 +21,7 @@ class SqlExecutorBuilder:
             if not hasattr(config, parameter):
                 raise ParameterNotSpecifiedException(parameter)
             value = getattr(config, parameter)
-            if value is None:
+            if value is None and parameter not in self.OPTIONAL_PARAMETERS:
                 raise ParameterNotSpecifiedException(parameter)
             self.__setattr__(parameter, value)
         return self
@@ -34,6 +37,9 @@ class SqlExecutorBuilder:
         sql_executor = self._get_or_create_instance(
             engine=self.engine,
             max_rows_read=self.max_rows_read,
-            history_db_name=self.history_db_name
+            history_db_name=self.history_db_name,
+            retry_policy=self.retry_policy,
+            plan_capture_threshold=self.plan_capture_threshold,
+            max_bytes_read=self.max_bytes_read,
         )
         return sql_executor
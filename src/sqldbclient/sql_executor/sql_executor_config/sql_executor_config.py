@@ -2,6 +2,7 @@ from typing import Optional
 
 from sqlalchemy.engine.base import Engine
 from sqldbclient.sql_engine_factory import sql_engine_factory
+from sqldbclient.sql_retry_policy.sql_retry_policy import SqlRetryPolicy
 
 
 class SqlExecutorConf:
@@ -9,10 +10,16 @@ class SqlExecutorConf:
     def __init__(self,
                  engine: Optional[Engine] = None,
                  max_rows_read: Optional[int] = 10_000,
-                 history_db_name: Optional[str] = 'sql_executor_history_v1'):
+                 history_db_name: Optional[str] = 'sql_executor_history_v1',
+                 retry_policy: Optional[SqlRetryPolicy] = SqlRetryPolicy(),
+                 plan_capture_threshold: Optional[float] = None,
+                 max_bytes_read: Optional[int] = None):
         self.engine = engine
         self.max_rows_read = max_rows_read
         self.history_db_name = history_db_name
+        self.retry_policy = retry_policy
+        self.plan_capture_threshold = plan_capture_threshold
+        self.max_bytes_read = max_bytes_read
 
     def set(self, parameter: str, *args, **kwargs) -> 'SqlExecutorConf':
         """Sets value for parameter.
@@ -23,7 +30,17 @@ class SqlExecutorConf:
 
         - max_rows_read: default value for LIMIT clause
 
-        - history_db_name: a file name for SQLLite database
+        - history_db_name: a file name for SQLLite database or sqlalchemy URL of a server-side database
+          (e.g. PostgreSQL), the database is shared by all executors with the same name.
+          If set to None, history is disabled, and neither execution info nor results are saved
+
+        - retry_policy: SqlRetryPolicy instance, that defines how queries failed with transient errors are retried
+
+        - plan_capture_threshold: (optional) duration in seconds, execution plans of queries running longer
+          will be captured automatically and saved to history database
+
+        - max_bytes_read: (optional) default budget in bytes of SELECT query result, replacing LIMIT clause,
+          see :func:`SqlExecutor.execute <SqlExecutor.execute>`
 
         """
         if parameter == 'engine_options':
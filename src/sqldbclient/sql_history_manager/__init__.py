@@ -3,7 +3,8 @@ __docformat__ = "restructuredtext"
 # module level doc-string
 __doc__ = """
 ``SqlHistoryManager``
-   - stores information about query executions and their results in local SQLite database
+   - stores information about query executions and their results in local SQLite database,
+     shared by all executors within the process, that use the same history database name
    - provides easy access to saved data via UUID
    - performs database cleaning to keep its size limited
 
@@ -1,27 +1,42 @@
-from sqlalchemy import Table
+import threading
 
-try:
-    from sqlalchemy.orm import registry
+from sqlalchemy import Table, MetaData
 
-    mapper_registry = registry()
-    metadata = mapper_registry.metadata
+metadata = MetaData()
 
-    def orm_map(class_: type, table: Table):
-        """Wrapper around sqlalchemy mapper method for consistency between different versions"""
-        mapper_registry.map_imperatively(class_, table)
+# mapping is deferred, so that sqlalchemy ORM is neither imported nor configured along with the package
+_pending_mappings = []
+_mappings_lock = threading.Lock()
 
-except ImportError:
-    # support for legacy sqlalchemy versions (< 1.4)
 
-    from sqlalchemy.orm import mapper
-    from sqlalchemy import MetaData
+def orm_map(class_: type, table: Table):
+    """Registers class to be mapped to table. Mapping itself is performed by :func:`configure_orm_mappings`."""
+    with _mappings_lock:
+        _pending_mappings.append((class_, table))
 
-    metadata = MetaData()
 
-    def orm_map(class_: type, table: Table):
-        """Wrapper around sqlalchemy mapper method for consistency between different versions"""
-        mapper(class_, table)
+def configure_orm_mappings() -> None:
+    """Maps all registered classes to their tables.
+    Should be called before instances of the classes are created, since earlier instances lack instrumentation.
+    """
+    if not _pending_mappings:
+        return
+    with _mappings_lock:
+        try:
+            from sqlalchemy.orm import registry
+
+            map_imperatively = registry(metadata=metadata).map_imperatively
+        except ImportError:
+            # support for legacy sqlalchemy versions (< 1.4)
+            from sqlalchemy.orm import mapper as map_imperatively
+
+        while _pending_mappings:
+            class_, table = _pending_mappings.pop(0)
+            map_imperatively(class_, table)
 
 
 EXECUTED_SQL_QUERY_TABLE_NAME = 'executed_sql_query'
 EXECUTED_SQL_QUERY_RESULT_TABLE_NAME = 'executed_sql_query_result'
+EXECUTED_SQL_QUERY_PLAN_TABLE_NAME = 'executed_sql_query_plan'
+EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME = 'executed_sql_query_payload'
+EXECUTED_SQL_QUERY_CHUNK_TABLE_NAME = 'executed_sql_query_chunk'
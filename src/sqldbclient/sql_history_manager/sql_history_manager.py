@@ -1,17 +1,37 @@
-from typing import Optional, Union, List
+import logging
+from dataclasses import asdict
+from typing import Optional, Union, List, Any, Iterator, TYPE_CHECKING
 from datetime import datetime
+import time
 
 import pandas as pd
-from sqlalchemy import text
-from sqlalchemy.orm import Session
+from sqlalchemy import text, func, case, select
 
-from .orm_config import metadata
-from .tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery
+from .orm_config import metadata, configure_orm_mappings
+from .sql_history_store.sql_history_store import SqlHistoryStore
+from .tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery, executed_sql_query
 from sqldbclient.sql_history_manager.tables.executed_sql_query_result.parse_executed_sql_query_result \
     import parse_executed_sql_query_result
-from .tables.executed_sql_query_result.executed_sql_query_result import ExecutedSqlQueryResult
+from .tables.executed_sql_query_result.executed_sql_query_result import ExecutedSqlQueryResult, \
+    executed_sql_query_result
+from .tables.executed_sql_query_payload.executed_sql_query_payload import ExecutedSqlQueryPayload, \
+    executed_sql_query_payload, add_payload_references, spill_payload, claim_spilled_payload, delete_spilled_payload
+from .tables.executed_sql_query_chunk.executed_sql_query_chunk import ExecutedSqlQueryChunk, \
+    executed_sql_query_chunk, read_chunks, read_arrow_chunks, ROW_GROUP_SIZE
+from sqldbclient.utils.pandas.filter_data_frame import Filters, select_from_data_frame
+from sqldbclient.utils.arrow.arrow_result import arrow_table_to_df, import_pyarrow
+from sqldbclient.sql_query_preparator.normalize_query import get_query_fingerprint
+from .tables.executed_sql_query_plan.executed_sql_query_plan import ExecutedSqlQueryPlan
 from sqldbclient.utils.log_decorators import class_logifier
-from sqldbclient.sql_engine_factory import sql_engine_factory
+from sqldbclient.sql_instrumentation import sql_event_hooks, SqlEvent
+from sqldbclient.sql_result_converter import sql_result_converters
+from sqldbclient.sql_result_handle.sql_result_handle import SqlResultHandle
+
+if TYPE_CHECKING:
+    import pyarrow
+    from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
 
 
 @class_logifier(methods=['dump', 'get_result'])
@@ -22,38 +42,147 @@ class SqlHistoryManager:
     Methods :func:`~get_exec_info`, :func:`~get_result`, :func:`~history` are responsible for reading data
     from history database.
     Disk storage used by database can be freed up by using :func:`~delete_results`.
+    Results too large to fit in memory are stored while being fetched by :func:`~spill`,
+    and are read lazily via :class:`SqlResultHandle <SqlResultHandle>` returned by :func:`~get_result_handle`.
+    Captured execution plans are available via :func:`~get_plan` and :func:`~plan_regressions`.
+    Aggregated statistics per query fingerprint are provided by :func:`~workload_report`,
+    and timings of previous executions of a query by :func:`~get_query_timings`.
+
+    History database is shared by all instances with the same history database name within the process,
+    and is created on first dump or read. If history database name is None, history is disabled.
+    Instead of SQLite file name, sqlalchemy URL of a server-side database can be used as history database name,
+    so that history is shared by many processes and nodes. Local history can be moved there by :func:`~copy_history`.
     """
-    def __init__(self, history_db_name: str):
-        history_db_engine = sql_engine_factory.get_or_create(f'sqlite:///{history_db_name}')
-        metadata.create_all(history_db_engine)
-        self._history_db_session = Session(history_db_engine)
+    def __init__(self, history_db_name: Optional[str]):
+        self._history_db_name = history_db_name
+        self._history_store: Optional[SqlHistoryStore] = None
+        if history_db_name is not None:
+            configure_orm_mappings()
+            self._history_store = SqlHistoryStore.get_or_create(history_db_name)
+        self._history_db_session_instance: Optional['Session'] = None
         self._cached_query_results = {}
 
+    @property
+    def history_enabled(self) -> bool:
+        """Whether queries execution info and results are saved to history database"""
+        return self._history_store is not None
+
+    @property
+    def _history_db_session(self) -> 'Session':
+        if self._history_store is None:
+            raise ValueError('History is disabled, since history database name is not specified')
+        if self._history_db_session_instance is None:
+            self._history_db_session_instance = self._history_store.create_session()
+        return self._history_db_session_instance
+
     @property
     def history(self) -> pd.DataFrame:
         """Returns all ExecutedSqlQuery items, that is execution info for each executed query"""
         executed_sql_queries = self._history_db_session.query(ExecutedSqlQuery).all()
         return pd.DataFrame(executed_sql_queries)
 
-    def get_result(self, uuid: str, reload: bool = False) -> pd.DataFrame:
+    def get_result(self,
+                   uuid: str,
+                   reload: bool = False,
+                   columns: Optional[List[str]] = None,
+                   rows: Optional[slice] = None,
+                   filters: Optional[Filters] = None,
+                   output: str = 'pandas') -> Any:
         """Gets result from specified query run via UUID.
         Also performs caching looked up result in memory for easy access.
         If UUID is not found, ValueError is raised.
 
+        Part of result can be requested by columns, rows and filters, then only the chunks of stored result
+        containing requested data are read from disk and decoded, and the part is not cached::
+
+            sql_executor.get_result(uuid, columns=['id', 'name'], rows=slice(0, 100), filters=[('id', '>', 10)])
+
+        Result can be requested in another output type, e.g. as polars DataFrame, it is built from Arrow table
+        of stored chunks then (chunks stored in Arrow IPC format are not converted to pandas),
+        and it is not cached::
+
+            sql_executor.get_result(uuid, output='polars')
+
         :param uuid: UUID of executed query
         :param reload: If ``True``, cache will not be used and result will be loaded from disk.
-        :return: pandas DataFrame
+        :param columns: (optional) Names of columns to read.
+        :param rows: (optional) Slice of row positions to read, applied before filters.
+        :param filters: (optional) List of (column, operator, value) tuples combined with AND, where operator is
+            one of '==', '!=', '<', '<=', '>', '>=', 'in', 'not in'.
+        :param output: Type of result, one of registered in ``sql_result_converters``: 'pandas' (pandas DataFrame),
+            'arrow' (Arrow table), 'polars' (polars DataFrame) or 'records' (list of dicts).
+        :return: pandas DataFrame (or result in requested output type)
         """
+        if output != 'pandas':
+            converter = sql_result_converters.get(output)
+            return converter.from_arrow(self._get_arrow_result(uuid, reload, columns, rows, filters))
+        partial = columns is not None or rows is not None or filters is not None
         if not reload and uuid in self._cached_query_results:
-            return self._cached_query_results[uuid]
+            df = self._cached_query_results[uuid]
+            return select_from_data_frame(df, columns, rows, filters) if partial else df
         result = self._history_db_session.query(ExecutedSqlQueryResult).filter_by(uuid=uuid).first()
         if result is None:
             raise ValueError(f'No result found for uuid = {uuid}')
         self._history_db_session.expunge(result)
-        df = parse_executed_sql_query_result(result)
+        if result.payload_hash is None:
+            df = parse_executed_sql_query_result(result)
+            if partial:
+                return select_from_data_frame(df, columns, rows, filters)
+        else:
+            payload = self._history_db_session.query(ExecutedSqlQueryPayload).filter_by(
+                payload_hash=result.payload_hash
+            ).first()
+            self._history_db_session.expunge(payload)
+            df = read_chunks(self._history_db_session.connection(), payload, columns, rows, filters)
+            if partial:
+                return df
         self._cached_query_results[uuid] = df
         return df
 
+    def _get_arrow_result(self,
+                          uuid: str,
+                          reload: bool,
+                          columns: Optional[List[str]],
+                          rows: Optional[slice],
+                          filters: Optional[Filters]) -> 'pyarrow.Table':
+        pa = import_pyarrow()
+        if filters is not None or (not reload and uuid in self._cached_query_results):
+            # filters are applied to pandas DataFrame, Arrow-backed columns are converted without copying
+            df = self.get_result(uuid, reload, columns, rows, filters)
+            return pa.Table.from_pandas(df, preserve_index=False)
+        result = self._history_db_session.query(ExecutedSqlQueryResult).filter_by(uuid=uuid).first()
+        if result is None:
+            raise ValueError(f'No result found for uuid = {uuid}')
+        if result.payload_hash is None:
+            df = self.get_result(uuid, reload, columns, rows, filters)
+            return pa.Table.from_pandas(df, preserve_index=False)
+        payload = self._history_db_session.query(ExecutedSqlQueryPayload).filter_by(
+            payload_hash=result.payload_hash
+        ).first()
+        self._history_db_session.expunge(payload)
+        return read_arrow_chunks(self._history_db_session.connection(), payload, columns, rows)
+
+    def get_result_handle(self, uuid: str) -> SqlResultHandle:
+        """Gets lightweight handle of result from specified query run via UUID, which reads
+        stored result lazily: by groups of rows, by columns or as a whole.
+        If UUID is not found, ValueError is raised.
+
+        :param uuid: UUID of executed query
+        :return: SqlResultHandle item
+        """
+        result = self._history_db_session.query(ExecutedSqlQueryResult).filter_by(uuid=uuid).first()
+        if result is None:
+            raise ValueError(f'No result found for uuid = {uuid}')
+        if result.payload_hash is None:
+            df = self.get_result(uuid)
+            return SqlResultHandle(self, uuid, [str(c) for c in df.columns], [d.name for d in df.dtypes], len(df),
+                                   ROW_GROUP_SIZE)
+        payload = self._history_db_session.query(ExecutedSqlQueryPayload).filter_by(
+            payload_hash=result.payload_hash
+        ).first()
+        return SqlResultHandle(self, uuid, list(payload.columns), list(payload.datatypes), payload.rows_count,
+                               payload.row_group_size)
+
     def get_execution_info(self, uuid: str) -> ExecutedSqlQuery:
         """Loads execution information for specified query run via UUID.
         If UUID is not found, ValueError is raised.
@@ -75,22 +204,213 @@ class SqlHistoryManager:
         """
         return self.get_execution_info(uuid)
 
+    def get_plan(self, uuid: str) -> ExecutedSqlQueryPlan:
+        """Loads execution plan captured for specified query run via UUID.
+        If UUID is not found, ValueError is raised.
+
+        :param uuid: UUID of executed query
+        :return: ExecutedSqlQueryPlan item
+        """
+        plan = self._history_db_session.query(ExecutedSqlQueryPlan).filter_by(uuid=uuid).first()
+        if plan is None:
+            raise ValueError(f'No plan found for uuid = {uuid}')
+        self._history_db_session.expunge(plan)
+        return plan
+
+    @property
+    def plan_regressions(self) -> pd.DataFrame:
+        """Returns execution info of queries, that switched to a plan of different shape and got slower"""
+        rows = self._history_db_session.query(
+            ExecutedSqlQuery.uuid,
+            ExecutedSqlQuery.start_time,
+            ExecutedSqlQuery.query_shortened,
+            ExecutedSqlQuery.elapsed_seconds,
+            ExecutedSqlQueryPlan.plan_fingerprint,
+        ).join(
+            ExecutedSqlQueryPlan,
+            ExecutedSqlQueryPlan.uuid == ExecutedSqlQuery.uuid
+        ).filter(
+            ExecutedSqlQueryPlan.regressed.is_(True)
+        ).order_by(ExecutedSqlQuery.start_time).all()
+        return pd.DataFrame(rows, columns=['uuid', 'start_time', 'query_shortened', 'elapsed_seconds',
+                                           'plan_fingerprint'])
+
+    def workload_report(self,
+                        since: Optional[Union[datetime, str]] = None,
+                        order_by: str = 'total_seconds',
+                        limit: Optional[int] = None) -> pd.DataFrame:
+        """Aggregates execution statistics per query fingerprint, that is per queries differing only
+        in literal values and formatting. Statistics are computed by history database itself.
+
+        :param since: (optional) Datetime, queries started before it are not taken into account.
+        :param order_by: Statistic to sort fingerprints by in descending order, e.g. 'calls' or 'p95_seconds'.
+        :param limit: (optional) Maximum number of fingerprints to return.
+        :return: pandas DataFrame with calls number, total, mean and max durations, p50/p95/p99 durations,
+            total rows and bytes for each fingerprint
+        """
+        elapsed = ExecutedSqlQuery.elapsed_seconds
+        ranked = self._history_db_session.query(
+            ExecutedSqlQuery.query_fingerprint,
+            ExecutedSqlQuery.query_type,
+            ExecutedSqlQuery.query_shortened,
+            ExecutedSqlQuery.rows_count,
+            ExecutedSqlQuery.result_bytes,
+            elapsed,
+            func.row_number().over(partition_by=ExecutedSqlQuery.query_fingerprint, order_by=elapsed).label('rn'),
+            func.count().over(partition_by=ExecutedSqlQuery.query_fingerprint).label('cnt'),
+        ).filter(
+            ExecutedSqlQuery.query_fingerprint.isnot(None),
+            elapsed.isnot(None),
+        )
+        if since is not None:
+            ranked = ranked.filter(ExecutedSqlQuery.start_time >= since)
+        ranked = ranked.subquery()
+
+        def percentile(p: int):
+            # nearest-rank method: the smallest duration, which rank is not less than p percent of calls
+            return func.min(
+                case((ranked.c.rn * 100 >= ranked.c.cnt * p, ranked.c.elapsed_seconds))
+            ).label(f'p{p}_seconds')
+
+        statistics = [
+            func.count().label('calls'),
+            func.sum(ranked.c.elapsed_seconds).label('total_seconds'),
+            func.avg(ranked.c.elapsed_seconds).label('mean_seconds'),
+            percentile(50),
+            percentile(95),
+            percentile(99),
+            func.max(ranked.c.elapsed_seconds).label('max_seconds'),
+            func.sum(ranked.c.rows_count).label('total_rows'),
+            func.sum(ranked.c.result_bytes).label('total_bytes'),
+        ]
+        statistic_names = [s.name for s in statistics]
+        if order_by not in statistic_names:
+            raise ValueError(f'Argument order_by should be one of {statistic_names}, got {order_by}')
+        report = self._history_db_session.query(
+            ranked.c.query_fingerprint,
+            func.max(ranked.c.query_type).label('query_type'),
+            func.max(ranked.c.query_shortened).label('query_shortened'),
+            *statistics,
+        ).group_by(
+            ranked.c.query_fingerprint
+        ).order_by(text(f'{order_by} DESC'))
+        if limit is not None:
+            report = report.limit(limit)
+        rows = report.all()
+        return pd.DataFrame(rows, columns=['query_fingerprint', 'query_type', 'query_shortened', *statistic_names])
+
+    def get_query_timings(self, query: str, engine_url: Optional[str] = None, limit: int = 10) -> pd.DataFrame:
+        """Returns timings of the latest executions of queries having the same fingerprint as query,
+        that is differing only in literal values and formatting.
+
+        :param query: query text
+        :param engine_url: (optional) repr of sqlalchemy URL of database, queries executed in other databases
+            are not taken into account
+        :param limit: maximum number of executions to return
+        :return: pandas DataFrame with uuid, start time and elapsed seconds of executions, the latest first
+        """
+        timings = self._history_db_session.query(
+            ExecutedSqlQuery.uuid,
+            ExecutedSqlQuery.start_time,
+            ExecutedSqlQuery.elapsed_seconds,
+        ).filter(
+            ExecutedSqlQuery.query_fingerprint == get_query_fingerprint(query),
+            ExecutedSqlQuery.elapsed_seconds.isnot(None),
+        )
+        if engine_url is not None:
+            timings = timings.filter(ExecutedSqlQuery.engine_url == engine_url)
+        rows = timings.order_by(ExecutedSqlQuery.start_time.desc()).limit(limit).all()
+        return pd.DataFrame(rows, columns=['uuid', 'start_time', 'elapsed_seconds'])
+
+    def _check_plan_regression(self, executed_query: ExecutedSqlQuery, plan: ExecutedSqlQueryPlan) -> None:
+        previous = self._history_db_session.query(
+            ExecutedSqlQueryPlan.plan_fingerprint,
+            ExecutedSqlQuery.elapsed_seconds,
+        ).join(
+            ExecutedSqlQuery,
+            ExecutedSqlQueryPlan.uuid == ExecutedSqlQuery.uuid
+        ).filter(
+            ExecutedSqlQuery.query_fingerprint == executed_query.query_fingerprint
+        ).order_by(ExecutedSqlQuery.start_time.desc()).first()
+        if previous is None or previous.plan_fingerprint == plan.plan_fingerprint:
+            return
+        if executed_query.elapsed_seconds > (previous.elapsed_seconds or 0):
+            plan.regressed = True
+            logger.warning(f'Query {executed_query.uuid} switched plan from {previous.plan_fingerprint} '
+                           f'to {plan.plan_fingerprint} and got slower: '
+                           f'{previous.elapsed_seconds:.3f}s -> {executed_query.elapsed_seconds:.3f}s')
+
     def __getitem__(self, uuid: str) -> pd.DataFrame:
         return self.get_result(uuid)
 
-    def dump(self, executed_query: ExecutedSqlQuery, df: Optional[pd.DataFrame] = None) -> None:
+    def spill(self, batches: Iterator['pyarrow.Table'], max_bytes: int) -> ExecutedSqlQueryPayload:
+        """Stores result to disk while it is being fetched, one group of rows of about max_bytes at a time,
+        so that the whole result never has to fit in memory. Each group is committed as soon as it is written,
+        in a transaction separate from the session. Stored data is marked as pending (its reference count is NULL),
+        so that it is not deleted by :func:`~delete_results` until it is passed to :func:`~dump`,
+        and it is deleted if fetching fails.
+
+        :param batches: iterator of Arrow tables of the result, at least one
+        :param max_bytes: approximate size of one group of rows in bytes
+        :return: ExecutedSqlQueryPayload item of stored result
+        """
+        return spill_payload(self._history_db_session.bind, batches, max_bytes)
+
+    def discard_spill(self, payload: ExecutedSqlQueryPayload) -> None:
+        """Deletes result stored by :func:`~spill`, e.g. when its execution info failed to be dumped.
+        Result is not deleted, if execution info referring to it is already dumped.
+
+        :param payload: ExecutedSqlQueryPayload item of stored result
+        """
+        # pending changes of failed dump would otherwise keep history database locked
+        self._history_db_session.rollback()
+        with self._history_db_session.bind.begin() as connection:
+            delete_spilled_payload(connection, payload.payload_hash)
+
+    def dump(self,
+             executed_query: ExecutedSqlQuery,
+             df: Optional[Union[pd.DataFrame, 'pyarrow.Table', ExecutedSqlQueryPayload]] = None,
+             plan: Optional[ExecutedSqlQueryPlan] = None) -> None:
         """Saves query execution information and result to disk.
+        Identical results (including data types of columns) are stored only once.
+        Columns of Arrow tables and of pandas DataFrames backed by Arrow are stored in Arrow IPC format,
+        and are read back as columns of ``pd.ArrowDtype``.
 
         :param executed_query: ExecutedSqlQuery item
-        :param df: (optional) result of execution in form of pandas DataFrame
+        :param df: (optional) result of execution in form of pandas DataFrame or Arrow table,
+            or ExecutedSqlQueryPayload item of result already stored by :func:`~spill` (it is not cached)
+        :param plan: (optional) captured execution plan, it is checked for regression against
+            the previous plan of the same query
         """
-        self._history_db_session.add(executed_query)
+        start = time.perf_counter()
+        if plan is not None:
+            self._check_plan_regression(executed_query, plan)
+            self._history_db_session.add(plan)
         if df is not None:
             uuid = executed_query.uuid
-            result = ExecutedSqlQueryResult(uuid=uuid, dataframe=df)
+            connection = self._history_db_session.connection()
+            if isinstance(df, ExecutedSqlQueryPayload):
+                payload = df
+                claim_spilled_payload(connection, payload.payload_hash)
+            elif isinstance(df, pd.DataFrame):
+                payload, chunks = ExecutedSqlQueryPayload.from_data_frame(df, executed_query.result_bytes)
+                self._cached_query_results[uuid] = df
+                add_payload_references(connection, asdict(payload), chunks)
+            else:
+                payload, chunks = ExecutedSqlQueryPayload.from_arrow_table(df, executed_query.result_bytes)
+                # buffers of the table are shared, not copied
+                self._cached_query_results[uuid] = arrow_table_to_df(df)
+                add_payload_references(connection, asdict(payload), chunks)
+            result = ExecutedSqlQueryResult(uuid=uuid, payload_hash=payload.payload_hash,
+                                            estimated_size=payload.estimated_size)
             self._history_db_session.add(result)
-            self._cached_query_results[uuid] = df
+        # measured before execution info is inserted, so that it is written without another round trip
+        executed_query.dump_seconds = time.perf_counter() - start
+        self._history_db_session.add(executed_query)
         self._history_db_session.commit()
+        if sql_event_hooks.is_enabled(SqlEvent.DUMP):
+            sql_event_hooks.emit(SqlEvent.DUMP, executed_query=executed_query,
+                                 seconds=executed_query.dump_seconds, context={})
 
     def delete_results(self,
                        up_to_start_time: Optional[Union[datetime, str]] = None,
@@ -101,6 +421,7 @@ class SqlHistoryManager:
         result size, and specified UUIDS.
         They can be set together, but either one of them should be specified.
         Otherwise, ValueError is raised.
+        Stored data shared by several results is deleted when no result refers to it anymore.
 
         :param up_to_start_time: Datetime, before which results should be deleted.
         :param over_estimated_size: Minimum size to consider for removal.
@@ -120,10 +441,94 @@ class SqlHistoryManager:
         if with_uuids is not None:
             selected_queries = selected_queries.filter(ExecutedSqlQueryResult.uuid.in_(with_uuids))
 
+        payload_references = self._history_db_session.query(
+            ExecutedSqlQueryResult.payload_hash,
+            func.count(),
+        ).filter(
+            ExecutedSqlQueryResult.uuid.in_(selected_queries),
+            ExecutedSqlQueryResult.payload_hash.isnot(None),
+        ).group_by(ExecutedSqlQueryResult.payload_hash).all()
         queries_to_delete = self._history_db_session.query(ExecutedSqlQueryResult).filter(
             ExecutedSqlQueryResult.uuid.in_(selected_queries)
         )
         queries_to_delete.delete(synchronize_session=False)
+        for payload_hash, count in payload_references:
+            self._history_db_session.query(ExecutedSqlQueryPayload).filter_by(payload_hash=payload_hash).update(
+                {ExecutedSqlQueryPayload.refcount: ExecutedSqlQueryPayload.refcount - count},
+                synchronize_session=False,
+            )
+        # payloads being spilled have NULL reference count, they are not deleted
+        unreferenced_payloads = self._history_db_session.query(ExecutedSqlQueryPayload.payload_hash).filter(
+            ExecutedSqlQueryPayload.refcount.isnot(None),
+            ExecutedSqlQueryPayload.refcount <= 0,
+        )
+        self._history_db_session.query(ExecutedSqlQueryChunk).filter(
+            ExecutedSqlQueryChunk.payload_hash.in_(unreferenced_payloads)
+        ).delete(synchronize_session=False)
+        self._history_db_session.query(ExecutedSqlQueryPayload).filter(
+            ExecutedSqlQueryPayload.refcount.isnot(None),
+            ExecutedSqlQueryPayload.refcount <= 0,
+        ).delete(synchronize_session=False)
         self._history_db_session.commit()
 
-        self._history_db_session.execute(text('VACUUM'))  # free space after deletion
+        if self._history_db_session.bind.dialect.name == 'sqlite':
+            self._history_db_session.execute(text('VACUUM'))  # free space after deletion
+
+    def copy_history(self, history_db_name: str, batch_size: int = 1000) -> int:
+        """Copies execution info, results and plans to another history database,
+        e.g. from local SQLite file to a server-side database shared by a team.
+        Rows are inserted in bulk by batches, queries already present in target database are skipped.
+
+        :param history_db_name: SQLite file name or sqlalchemy URL of target history database.
+        :param batch_size: Number of queries copied in one batch.
+        :return: number of copied queries
+        """
+        target_engine = SqlHistoryStore.get_or_create(history_db_name).engine
+        uuid_column = executed_sql_query.c.uuid
+        copied = 0
+        with self._history_db_session.bind.connect() as source_connection:
+            uuids = source_connection.execute(
+                select(uuid_column).order_by(executed_sql_query.c.start_time)
+            ).scalars().all()
+            for i in range(0, len(uuids), batch_size):
+                batch = uuids[i:i + batch_size]
+                with target_engine.begin() as target_connection:
+                    existing = set(target_connection.execute(
+                        select(uuid_column).where(uuid_column.in_(batch))
+                    ).scalars())
+                    batch = [uuid for uuid in batch if uuid not in existing]
+                    if not batch:
+                        continue
+                    # parent tables go first, since other tables reference them
+                    for table in metadata.sorted_tables:
+                        if table is executed_sql_query_payload:
+                            self._copy_payloads(source_connection, target_connection, batch)
+                        if table in (executed_sql_query_payload, executed_sql_query_chunk):
+                            continue
+                        rows = source_connection.execute(
+                            select(table).where(table.c.uuid.in_(batch))
+                        ).mappings().all()
+                        if rows:
+                            target_connection.execute(table.insert(), [dict(row) for row in rows])
+                copied += len(batch)
+        logger.info(f'Copied {copied} queries to history database {target_engine.url!r}')
+        return copied
+
+    @staticmethod
+    def _copy_payloads(source_connection, target_connection, uuids: List[str]) -> None:
+        result_table, payload_table = executed_sql_query_result, executed_sql_query_payload
+        payload_references = source_connection.execute(
+            select(result_table.c.payload_hash, func.count()).where(
+                result_table.c.uuid.in_(uuids),
+                result_table.c.payload_hash.isnot(None),
+            ).group_by(result_table.c.payload_hash)
+        ).all()
+        payload_columns = [c for c in payload_table.columns if c.name != 'refcount']
+        for payload_hash, count in payload_references:
+            payload = source_connection.execute(
+                select(*payload_columns).where(payload_table.c.payload_hash == payload_hash)
+            ).mappings().first()
+            chunks = source_connection.execute(
+                select(executed_sql_query_chunk).where(executed_sql_query_chunk.c.payload_hash == payload_hash)
+            ).mappings().all()
+            add_payload_references(target_connection, dict(payload), [dict(chunk) for chunk in chunks], count)
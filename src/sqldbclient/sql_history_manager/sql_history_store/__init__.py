@@ -0,0 +1 @@
+from sqldbclient.sql_history_manager.sql_history_store.sql_history_store import SqlHistoryStore
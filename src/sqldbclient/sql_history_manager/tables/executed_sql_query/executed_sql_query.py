@@ -1,13 +1,15 @@
 import uuid
 from dataclasses import dataclass, field, fields
 from datetime import datetime, timedelta
+from typing import Optional
 import re
 
 import sqlparse
-from sqlalchemy import String, DateTime, Interval
+from sqlalchemy import String, Text, DateTime, Interval, Integer, Float, Boolean
 from sqlalchemy import Table, Column
 
 from sqldbclient.sql_history_manager.orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_TABLE_NAME
+from sqldbclient.sql_query_preparator.normalize_query import get_query_fingerprint
 
 QUERY_TEXT_HALF_MAX_REPR_SIZE = 50
 
@@ -28,32 +30,72 @@ def shorten_query(query: str) -> str:
 executed_sql_query = Table(
     EXECUTED_SQL_QUERY_TABLE_NAME,
     metadata,
-    Column('uuid', String, primary_key=True),
-    Column('query', String),
+    Column('uuid', String(32), primary_key=True),
+    Column('query', Text),
     Column('start_time', DateTime),
     Column('finish_time', DateTime),
     Column('duration', Interval),
-    Column('query_type', String),
-    Column('query_shortened', String),
+    Column('query_type', String(32)),
+    Column('query_shortened', String(128)),
+    Column('retries', Integer),
+    Column('checkout_seconds', Float),
+    Column('prepare_seconds', Float),
+    Column('execution_seconds', Float),
+    Column('fetch_seconds', Float),
+    Column('conversion_seconds', Float),
+    Column('dump_seconds', Float),
+    Column('elapsed_seconds', Float),
+    Column('rows_count', Integer),
+    Column('columns_count', Integer),
+    Column('result_bytes', Integer),
+    Column('truncated', Boolean),
+    Column('spilled', Boolean),
+    Column('query_fingerprint', String(32), index=True),
+    Column('engine_url', Text),
     extend_existing=True,
 )
 
 
 @dataclass
 class ExecutedSqlQuery:
+    """Execution information of a query.
+    Apart from wall clock start and finish times, it keeps monotonic timings (in seconds)
+    of each execution phase: connection checkout, query preparation, execution on server,
+    rows fetching, DataFrame conversion and dumping to history database,
+    along with the size of the result, whether it was truncated by byte budget or spilled to disk,
+    and URL of the database (without password) the query was executed on.
+    """
     uuid: str = field(init=False)
     query: str
     start_time: datetime
     finish_time: datetime
+    retries: int = 0
+    checkout_seconds: Optional[float] = field(default=None, repr=False)
+    prepare_seconds: Optional[float] = field(default=None, repr=False)
+    execution_seconds: Optional[float] = field(default=None, repr=False)
+    fetch_seconds: Optional[float] = field(default=None, repr=False)
+    conversion_seconds: Optional[float] = field(default=None, repr=False)
+    dump_seconds: Optional[float] = field(default=None, repr=False)
+    elapsed_seconds: Optional[float] = field(default=None, repr=False)
+    rows_count: Optional[int] = field(default=None, repr=False)
+    columns_count: Optional[int] = field(default=None, repr=False)
+    result_bytes: Optional[int] = field(default=None, repr=False)
+    truncated: Optional[bool] = field(default=None, repr=False)
+    spilled: Optional[bool] = field(default=None, repr=False)
+    engine_url: Optional[str] = field(default=None, repr=False)
     duration: timedelta = field(init=False)
     query_type: str = field(init=False)
     query_shortened: str = field(init=False, repr=False)
+    query_fingerprint: str = field(init=False, repr=False)
 
     def __post_init__(self):
-        self.duration = self.finish_time.replace(microsecond=self.start_time.microsecond) - self.start_time
+        self.duration = self.finish_time - self.start_time
         self.uuid = uuid.uuid4().hex
-        self.query_type = sqlparse.parse(self.query)[0].get_type()
+        statement = sqlparse.parse(self.query)[0]
+        self.query_type = statement.get_type()
         self.query_shortened = shorten_query(self.query)
+        # the same for queries differing only in literal values and formatting
+        self.query_fingerprint = get_query_fingerprint(statement)
 
     def __repr__(self):
         fields_name_value = []
@@ -0,0 +1,291 @@
+import io
+from dataclasses import dataclass, field
+from typing import List, Optional, Iterator, Tuple, Union, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import Column, Table, ForeignKey, select
+from sqlalchemy import String, Integer
+from sqlalchemy.engine.base import Connection
+
+from ...orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_CHUNK_TABLE_NAME, \
+    EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME
+from ..executed_sql_query_result.custom_sqlalchemy_types.compressed_text import CompressedText
+from ..executed_sql_query_result.custom_sqlalchemy_types.binary_data import BinaryData
+from sqldbclient.utils.pandas.filter_data_frame import Filters, get_filter_mask, validate_filters
+from sqldbclient.utils.arrow.arrow_result import import_pyarrow, serialize_arrow_array, deserialize_arrow_array, \
+    get_common_type
+
+if TYPE_CHECKING:
+    import pyarrow
+    from ..executed_sql_query_payload.executed_sql_query_payload import ExecutedSqlQueryPayload
+
+# number of rows stored in one chunk of a column
+ROW_GROUP_SIZE = 100_000
+
+
+executed_sql_query_chunk = Table(
+    EXECUTED_SQL_QUERY_CHUNK_TABLE_NAME,
+    metadata,
+    Column('payload_hash', String(64), ForeignKey(f"{EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME}.payload_hash"),
+           primary_key=True),
+    Column('column_index', Integer, primary_key=True),
+    Column('row_group', Integer, primary_key=True),
+    Column('data', CompressedText),
+    Column('binary_data', BinaryData),
+    extend_existing=True,
+)
+
+
+@dataclass
+class ExecutedSqlQueryChunk:
+    """Values of one column of stored result within one group of rows, serialized as single column csv
+    kept in data, or as Arrow IPC stream kept in binary_data for columns of Arrow data types"""
+    payload_hash: str
+    column_index: int
+    row_group: int
+    data: Optional[str] = field(default=None, repr=False)
+    binary_data: Optional[bytes] = field(default=None, repr=False)
+
+
+orm_map(ExecutedSqlQueryChunk, executed_sql_query_chunk)
+
+
+def is_arrow_datatype(datatype: str) -> bool:
+    """Whether data type name is a name of pandas ArrowDtype, which chunks are stored in Arrow IPC format"""
+    return datatype.endswith('[pyarrow]')
+
+
+def get_dtype(datatype: str):
+    """Converts stored data type name to pandas dtype. Names of Arrow types with parameters
+    are not always recognized by pandas, values of such types are kept as objects"""
+    try:
+        return pd.api.types.pandas_dtype(datatype)
+    except (TypeError, ValueError, NotImplementedError):
+        return object
+
+
+def get_chunk_values(payload_hash: str, column_index: int, row_group: int, data: Union[str, bytes]) -> dict:
+    """Returns values of chunk columns, csv text is kept in data column and Arrow IPC stream in binary_data column.
+    Both columns are always present, so that chunks of different columns are inserted by one statement"""
+    binary = isinstance(data, bytes)
+    return dict(payload_hash=payload_hash, column_index=column_index, row_group=row_group,
+                data=None if binary else data, binary_data=data if binary else None)
+
+
+def serialize_chunks(df: pd.DataFrame,
+                     row_group_size: int = ROW_GROUP_SIZE) -> Iterator[Tuple[int, int, Union[str, bytes]]]:
+    """Splits pandas DataFrame into chunks of columns by groups of rows.
+
+    :param df: pandas DataFrame
+    :param row_group_size: number of rows in one group
+    :return: iterator of column index, row group and csv-like data (bytes of Arrow IPC stream for Arrow data types)
+        of each chunk in column-major order
+    """
+    for column_index in range(df.shape[1]):
+        series = df.iloc[:, column_index]
+        if isinstance(series.dtype, pd.ArrowDtype):
+            # Arrow buffers are passed as is
+            array = import_pyarrow().array(series.array)
+            for row_group, start in enumerate(range(0, len(series), row_group_size)):
+                yield column_index, row_group, serialize_arrow_array(array.slice(start, row_group_size))
+            continue
+        for row_group, start in enumerate(range(0, len(series), row_group_size)):
+            chunk = series.iloc[start:start + row_group_size]
+            yield column_index, row_group, chunk.to_csv(sep='\x1F', index=False, header=False)
+
+
+def serialize_arrow_chunks(table: 'pyarrow.Table',
+                           row_group_size: int = ROW_GROUP_SIZE) -> Iterator[Tuple[int, int, bytes]]:
+    """Splits Arrow table into chunks of columns by groups of rows in Arrow IPC format, without converting it
+    to pandas DataFrame.
+
+    :param table: Arrow table
+    :param row_group_size: number of rows in one group
+    :return: iterator of column index, row group and data of each chunk in column-major order
+    """
+    for column_index in range(table.num_columns):
+        array = table.column(column_index)
+        for row_group, start in enumerate(range(0, table.num_rows, row_group_size)):
+            yield column_index, row_group, serialize_arrow_array(array.slice(start, row_group_size))
+
+
+def deserialize_chunk(data: Union[str, bytes], datatype: str) -> pd.Series:
+    """Converts data of a chunk to pandas Series of original data type"""
+    if is_arrow_datatype(datatype):
+        return pd.Series(pd.arrays.ArrowExtensionArray(deserialize_arrow_array(data)))
+    buffer = io.StringIO(data)
+    # empty values are quoted, but keep blank lines to never lose rows
+    df = pd.read_csv(buffer, sep='\x1F', header=None, skip_blank_lines=False)  # noqa
+    return df.iloc[:, 0].astype(datatype)
+
+
+def concat_arrow_chunks(chunks: List[bytes]) -> 'pyarrow.ChunkedArray':
+    """Converts data of chunks of a column stored in Arrow IPC format to one Arrow array. Chunks of results
+    spilled while being fetched may have different types (e.g. a group of nulls only), they are cast to common type.
+    """
+    pa = import_pyarrow()
+    arrays = [array for data in chunks for array in deserialize_arrow_array(data).chunks]
+    common_type = get_common_type(array.type for array in arrays)
+    return pa.chunked_array([a if a.type == common_type else a.cast(common_type) for a in arrays], type=common_type)
+
+
+def read_chunks(connection: Connection,
+                payload: 'ExecutedSqlQueryPayload',
+                columns: Optional[List[str]] = None,
+                rows: Optional[slice] = None,
+                filters: Optional[Filters] = None) -> pd.DataFrame:
+    """Reads stored result, loading and decoding only chunks of requested columns and rows.
+    Rows are selected by position first, then by filters. Chunks of other columns are read
+    only for groups of rows with at least one row satisfying filters.
+
+    :param connection: sqlalchemy connection to history database
+    :param payload: ExecutedSqlQueryPayload item of stored result
+    :param columns: (optional) names of columns to read
+    :param rows: (optional) slice of row positions
+    :param filters: (optional) list of (column, operator, value) tuples combined with AND
+    :return: pandas DataFrame
+    """
+    validate_filters(filters)
+    filters = filters or []
+    names = columns if columns is not None else payload.columns
+    unknown = [name for name in list(names) + [f[0] for f in filters] if name not in payload.columns]
+    if unknown:
+        raise ValueError(f'No columns {unknown} found in result')
+    if columns is None:
+        column_indexes = list(range(len(payload.columns)))
+    else:
+        column_indexes = [payload.columns.index(name) for name in columns]
+    # filters refer to columns by their positions, since result may contain columns with the same name
+    filters = [(payload.columns.index(name), op, value) for name, op, value in filters]
+
+    positions = range(payload.rows_count)
+    if rows is not None:
+        positions = positions[rows]
+    row_groups = _get_row_groups(positions, payload.row_group_size)
+
+    filter_indexes = list(dict.fromkeys(f[0] for f in filters))
+    df = _read_columns(connection, payload, filter_indexes, row_groups)
+    df = df.loc[pd.RangeIndex(positions.start, positions.stop, positions.step)]
+    if filters:
+        df = df[get_filter_mask(df, filters)]
+        row_groups = sorted(set(df.index // payload.row_group_size))
+
+    remaining_indexes = [i for i in dict.fromkeys(column_indexes) if i not in filter_indexes]
+    remaining = _read_columns(connection, payload, remaining_indexes, row_groups)
+    df = pd.concat([df, remaining.loc[df.index]], axis=1)[column_indexes]
+    df.columns = [payload.columns[i] for i in column_indexes]
+    return df.reset_index(drop=True)
+
+
+def read_arrow_chunks(connection: Connection,
+                      payload: 'ExecutedSqlQueryPayload',
+                      columns: Optional[List[str]] = None,
+                      rows: Optional[slice] = None) -> 'pyarrow.Table':
+    """Reads stored result as Arrow table, loading and decoding only chunks of requested columns and rows.
+    Chunks stored in Arrow IPC format are used as is, without converting them to pandas.
+
+    :param connection: sqlalchemy connection to history database
+    :param payload: ExecutedSqlQueryPayload item of stored result
+    :param columns: (optional) names of columns to read
+    :param rows: (optional) slice of row positions
+    :return: Arrow table
+    """
+    pa = import_pyarrow()
+    unknown = [name for name in columns or [] if name not in payload.columns]
+    if unknown:
+        raise ValueError(f'No columns {unknown} found in result')
+    if columns is None:
+        column_indexes = list(range(len(payload.columns)))
+    else:
+        column_indexes = [payload.columns.index(name) for name in columns]
+
+    positions = range(payload.rows_count)
+    if rows is not None:
+        positions = positions[rows]
+    row_groups = _get_row_groups(positions, payload.row_group_size)
+
+    unique_indexes = list(dict.fromkeys(column_indexes))
+    chunks = {i: [] for i in unique_indexes}
+    for column_index, data in _select_chunks(connection, payload, unique_indexes, row_groups):
+        chunks[column_index].append(data)
+    arrays = {}
+    for i in unique_indexes:
+        datatype = payload.datatypes[i]
+        if not chunks[i]:
+            # type of column is taken from an empty array, when there are no chunks to read
+            empty = pa.Array.from_pandas(pd.Series([], dtype=get_dtype(datatype)))
+            arrays[i] = pa.chunked_array([], type=empty.type)
+        elif is_arrow_datatype(datatype):
+            arrays[i] = concat_arrow_chunks(chunks[i])
+        else:
+            arrays[i] = pa.chunked_array(
+                [pa.Array.from_pandas(deserialize_chunk(data, datatype)) for data in chunks[i]]
+            )
+    table = pa.Table.from_arrays(
+        [arrays[i] for i in column_indexes],
+        names=[payload.columns[i] for i in column_indexes],
+    )
+
+    # rows are positioned relatively to the first row of the first row group read
+    offset = row_groups[0] * payload.row_group_size if row_groups else 0
+    if positions.step == 1:
+        return table.slice(positions.start - offset, len(positions))
+    return table.take(pa.array(np.arange(positions.start, positions.stop, positions.step) - offset))
+
+
+def _get_row_groups(positions: range, row_group_size: int) -> List[int]:
+    if len(positions) == 0:
+        return []
+    first, last = sorted((positions[0], positions[-1]))
+    return list(range(first // row_group_size, last // row_group_size + 1))
+
+
+def _read_columns(connection: Connection,
+                  payload: 'ExecutedSqlQueryPayload',
+                  column_indexes: List[int],
+                  row_groups: List[int]) -> pd.DataFrame:
+    """Reads chunks of columns within groups of rows, resulting DataFrame is indexed by row positions
+    and its columns are labeled by column indexes"""
+    size = payload.row_group_size
+    index = pd.Index(np.concatenate(
+        [np.arange(g * size, min((g + 1) * size, payload.rows_count)) for g in row_groups] or [np.arange(0)]
+    ))
+    if not column_indexes:
+        return pd.DataFrame(index=index)
+    chunks = {i: [] for i in column_indexes}
+    for column_index, data in _select_chunks(connection, payload, column_indexes, row_groups):
+        chunks[column_index].append(data)
+    series = []
+    for i in column_indexes:
+        datatype = payload.datatypes[i]
+        if not chunks[i]:
+            series.append(pd.Series([], dtype=get_dtype(datatype)))
+        elif is_arrow_datatype(datatype):
+            series.append(pd.Series(pd.arrays.ArrowExtensionArray(concat_arrow_chunks(chunks[i]))))
+        else:
+            series.append(pd.concat([deserialize_chunk(data, datatype) for data in chunks[i]], ignore_index=True))
+    df = pd.concat(series, axis=1, keys=column_indexes)
+    df.index = index
+    return df
+
+
+def _select_chunks(connection: Connection,
+                   payload: 'ExecutedSqlQueryPayload',
+                   column_indexes: List[int],
+                   row_groups: List[int]) -> Iterator[Tuple[int, Union[str, bytes]]]:
+    """Selects column indexes and data of chunks of columns within groups of rows, ordered by columns and rows.
+    Data is csv text, or bytes of Arrow IPC stream for columns of Arrow data types"""
+    if not column_indexes or not row_groups:
+        return iter([])
+    chunk = executed_sql_query_chunk
+    query = select(chunk.c.column_index, chunk.c.data, chunk.c.binary_data).where(
+        chunk.c.payload_hash == payload.payload_hash,
+        chunk.c.column_index.in_(column_indexes),
+    ).order_by(chunk.c.column_index, chunk.c.row_group)
+    if len(row_groups) < -(-payload.rows_count // payload.row_group_size):
+        query = query.where(chunk.c.row_group.in_(row_groups))
+    return (
+        (column_index, binary_data if binary_data is not None else data)
+        for column_index, data, binary_data in connection.execute(query)
+    )
@@ -0,0 +1,284 @@
+import hashlib
+import importlib
+import itertools
+import json
+import uuid
+from dataclasses import dataclass, asdict
+from typing import List, Optional, Tuple, Iterator, Union, TYPE_CHECKING
+
+import pandas as pd
+from sqlalchemy import Column, Table, select
+from sqlalchemy import String, Integer
+from sqlalchemy.engine.base import Connection, Engine
+
+from ...orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME
+from ..executed_sql_query_result.custom_sqlalchemy_types.data_types import DataTypes
+from ..executed_sql_query_chunk.executed_sql_query_chunk import executed_sql_query_chunk, serialize_chunks, \
+    serialize_arrow_chunks, get_chunk_values, ROW_GROUP_SIZE
+from sqldbclient.utils.arrow.arrow_result import concat_arrow_tables, get_common_type, serialize_arrow_array
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+executed_sql_query_payload = Table(
+    EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME,
+    metadata,
+    Column('payload_hash', String(64), primary_key=True),
+    Column('columns', DataTypes),
+    Column('datatypes', DataTypes),
+    Column('rows_count', Integer),
+    Column('row_group_size', Integer),
+    Column('estimated_size', Integer),
+    Column('refcount', Integer),
+    extend_existing=True,
+)
+
+
+@dataclass
+class ExecutedSqlQueryPayload:
+    """Distinct result, stored once and shared by all executed queries that returned the same data.
+    It is addressed by hash of its content, reference count is the number of results referring to it.
+    Reference count is NULL, while the result is being spilled and no result refers to it yet.
+    Data is stored in ExecutedSqlQueryChunk items, one per column and group of rows,
+    so that requested columns and rows can be read without decoding the whole result.
+    """
+    payload_hash: str
+    columns: List[str]
+    datatypes: List[str]
+    rows_count: int
+    row_group_size: int = ROW_GROUP_SIZE
+    estimated_size: Optional[int] = None
+    refcount: Optional[int] = 1
+
+    @classmethod
+    def from_data_frame(cls,
+                        df: pd.DataFrame,
+                        estimated_size: Optional[int] = None,
+                        row_group_size: int = ROW_GROUP_SIZE) -> Tuple['ExecutedSqlQueryPayload', List[dict]]:
+        """Splits pandas DataFrame into chunks and computes hash of its content
+        (including names and data types of columns).
+
+        :param df: pandas DataFrame
+        :param estimated_size: (optional) size of DataFrame in bytes, computed when not specified
+        :param row_group_size: number of rows in one chunk
+        :return: ExecutedSqlQueryPayload item and values of its chunks
+        """
+        if estimated_size is None:
+            estimated_size = int(df.memory_usage(deep=True).sum())
+        return cls._from_chunks(
+            columns=[str(c) for c in df.columns],
+            datatypes=[d.name for d in df.dtypes],
+            rows_count=len(df),
+            chunks=serialize_chunks(df, row_group_size),
+            estimated_size=estimated_size,
+            row_group_size=row_group_size,
+        )
+
+    @classmethod
+    def from_arrow_table(cls,
+                         table: 'pyarrow.Table',
+                         estimated_size: Optional[int] = None,
+                         row_group_size: int = ROW_GROUP_SIZE) -> Tuple['ExecutedSqlQueryPayload', List[dict]]:
+        """Splits Arrow table into chunks and computes hash of its content, the same way as for
+        pandas DataFrame with columns of ``pd.ArrowDtype``, which the table is read back as.
+
+        :param table: Arrow table
+        :param estimated_size: (optional) size of table buffers in bytes, computed when not specified
+        :param row_group_size: number of rows in one chunk
+        :return: ExecutedSqlQueryPayload item and values of its chunks
+        """
+        if estimated_size is None:
+            estimated_size = table.nbytes
+        return cls._from_chunks(
+            columns=[str(c) for c in table.column_names],
+            datatypes=[pd.ArrowDtype(t).name for t in table.schema.types],
+            rows_count=table.num_rows,
+            chunks=serialize_arrow_chunks(table, row_group_size),
+            estimated_size=estimated_size,
+            row_group_size=row_group_size,
+        )
+
+    @classmethod
+    def _from_chunks(cls,
+                     columns: List[str],
+                     datatypes: List[str],
+                     rows_count: int,
+                     chunks: Iterator[Tuple[int, int, Union[str, bytes]]],
+                     estimated_size: int,
+                     row_group_size: int) -> Tuple['ExecutedSqlQueryPayload', List[dict]]:
+        content_hash = hashlib.sha256(json.dumps([columns, datatypes, row_group_size]).encode('utf-8'))
+        chunk_values = []
+        for column_index, row_group, data in chunks:
+            content_hash.update(f'\x1E{column_index}\x1E{row_group}\x1E'.encode('utf-8'))
+            content_hash.update(data if isinstance(data, bytes) else data.encode('utf-8'))
+            chunk_values.append((column_index, row_group, data))
+        payload_hash = content_hash.hexdigest()
+        chunk_values = [get_chunk_values(payload_hash, *chunk) for chunk in chunk_values]
+        payload = cls(
+            payload_hash=payload_hash,
+            columns=columns,
+            datatypes=datatypes,
+            rows_count=rows_count,
+            row_group_size=row_group_size,
+            estimated_size=estimated_size,
+        )
+        return payload, chunk_values
+
+
+orm_map(ExecutedSqlQueryPayload, executed_sql_query_payload)
+
+
+def add_payload_references(connection: Connection, payload: dict, chunks: List[dict], count: int = 1) -> None:
+    """Increments reference count of stored payload, or stores payload and its chunks when it does not exist yet.
+    Upserts are used where supported, so that concurrent writers of the same payload do not conflict.
+
+    :param connection: sqlalchemy connection to history database
+    :param payload: values of payload columns, reference count is ignored
+    :param chunks: values of payload chunks columns
+    :param count: number of new references to payload
+    """
+    table = executed_sql_query_payload
+    increment = table.update().where(
+        table.c.payload_hash == payload['payload_hash']
+    ).values(refcount=table.c.refcount + count)
+    # payload already stored is not sent to database again
+    if connection.execute(increment).rowcount > 0:
+        return
+    values = dict(payload, refcount=count)
+    dialect_name = connection.dialect.name
+    if dialect_name in ('postgresql', 'sqlite'):
+        insert = importlib.import_module(f'sqlalchemy.dialects.{dialect_name}').insert
+        statement = insert(table).values(**values).on_conflict_do_update(
+            index_elements=[table.c.payload_hash],
+            set_={'refcount': table.c.refcount + count},
+        )
+        chunks_statement = insert(executed_sql_query_chunk).on_conflict_do_nothing()
+    elif dialect_name == 'mysql':
+        from sqlalchemy.dialects.mysql import insert
+
+        statement = insert(table).values(**values).on_duplicate_key_update(refcount=table.c.refcount + count)
+        chunks_statement = executed_sql_query_chunk.insert().prefix_with('IGNORE')
+    else:
+        statement = table.insert().values(**values)
+        chunks_statement = executed_sql_query_chunk.insert()
+    connection.execute(statement)
+    if chunks:
+        # chunks are determined by payload hash, so the ones stored concurrently are the same
+        connection.execute(chunks_statement, chunks)
+
+
+def spill_payload(engine: Engine,
+                  batches: Iterator['pyarrow.Table'],
+                  max_bytes: int) -> ExecutedSqlQueryPayload:
+    """Stores result, that does not fit in memory, while it is being fetched. Batches are gathered into groups
+    of rows, and chunks of each group are written and committed as soon as it is complete, so that only one group
+    of rows and one batch are held in memory, and history database is not locked for the whole fetch.
+    Size of groups is chosen by bytes per row of the first batch, for a group to take about max_bytes.
+    Since content hash is not known until the whole result is stored, spilled payload is addressed by hash
+    of random UUID, and it is not shared with other results. Its reference count is NULL until a result refers
+    to it (see :func:`claim_spilled_payload`), so that it is not deleted as unreferenced while it is being stored,
+    and it is deleted along with stored chunks, if fetching fails.
+
+    :param engine: sqlalchemy engine of history database
+    :param batches: iterator of Arrow tables of the result, at least one
+    :param max_bytes: approximate size of one group of rows in bytes
+    :return: ExecutedSqlQueryPayload item
+    """
+    first = next(batches)
+    columns = [str(c) for c in first.column_names]
+    bytes_per_row = max(first.nbytes / max(first.num_rows, 1), 1)
+    row_group_size = max(1, min(int(max_bytes // bytes_per_row), ROW_GROUP_SIZE))
+    # the first batch is not held after it is stored
+    batches, first = itertools.chain([first], batches), None
+    payload = ExecutedSqlQueryPayload(
+        payload_hash=hashlib.sha256(uuid.uuid4().bytes).hexdigest(),
+        columns=columns,
+        datatypes=[],
+        rows_count=0,
+        row_group_size=row_group_size,
+        estimated_size=0,
+        refcount=None,
+    )
+    # payload is stored first, since its chunks reference it
+    with engine.begin() as connection:
+        connection.execute(executed_sql_query_payload.insert().values(**asdict(payload)))
+    try:
+        types = [set() for _ in columns]
+        pending, pending_rows, row_group = [], 0, 0
+        for batch in batches:
+            pending.append(batch)
+            pending_rows += batch.num_rows
+            payload.rows_count += batch.num_rows
+            payload.estimated_size += batch.nbytes
+            while pending_rows >= row_group_size:
+                group = concat_arrow_tables(pending, columns)
+                with engine.begin() as connection:
+                    _insert_row_group(connection, payload.payload_hash, row_group, group.slice(0, row_group_size),
+                                      types)
+                row_group += 1
+                rest = group.slice(row_group_size)
+                pending, pending_rows = [rest], rest.num_rows
+        with engine.begin() as connection:
+            if pending_rows > 0:
+                _insert_row_group(connection, payload.payload_hash, row_group,
+                                  concat_arrow_tables(pending, columns), types)
+            # chunks of a column may have different types, they are cast to common type when read
+            payload.datatypes = [pd.ArrowDtype(get_common_type(t)).name for t in types]
+            connection.execute(executed_sql_query_payload.update().where(
+                executed_sql_query_payload.c.payload_hash == payload.payload_hash
+            ).values(datatypes=payload.datatypes, rows_count=payload.rows_count,
+                     estimated_size=payload.estimated_size))
+    except Exception:
+        # chunks stored so far are already committed
+        with engine.begin() as connection:
+            delete_spilled_payload(connection, payload.payload_hash)
+        raise
+    return payload
+
+
+def claim_spilled_payload(connection: Connection, payload_hash: str) -> None:
+    """Sets reference count of payload stored by :func:`spill_payload` to 1, when a result refers to it.
+    If payload is not found (or it is already referenced), exception is raised.
+
+    :param connection: sqlalchemy connection to history database
+    :param payload_hash: hash of spilled payload
+    """
+    table = executed_sql_query_payload
+    claimed = connection.execute(table.update().where(
+        table.c.payload_hash == payload_hash,
+        table.c.refcount.is_(None),
+    ).values(refcount=1)).rowcount
+    if claimed != 1:
+        raise ValueError(f'Spilled result {payload_hash} not found in history database')
+
+
+def delete_spilled_payload(connection: Connection, payload_hash: str) -> None:
+    """Deletes payload stored by :func:`spill_payload` along with its chunks, unless a result already refers to it
+
+    :param connection: sqlalchemy connection to history database
+    :param payload_hash: hash of spilled payload
+    """
+    table = executed_sql_query_payload
+    pending = connection.execute(select(table.c.payload_hash).where(
+        table.c.payload_hash == payload_hash,
+        table.c.refcount.is_(None),
+    )).first()
+    if pending is None:
+        return
+    connection.execute(executed_sql_query_chunk.delete().where(
+        executed_sql_query_chunk.c.payload_hash == payload_hash
+    ))
+    connection.execute(table.delete().where(table.c.payload_hash == payload_hash))
+
+
+def _insert_row_group(connection: Connection,
+                      payload_hash: str,
+                      row_group: int,
+                      table: 'pyarrow.Table',
+                      types: List[set]) -> None:
+    chunks = []
+    for column_index, array in enumerate(table.columns):
+        types[column_index].add(array.type)
+        chunks.append(get_chunk_values(payload_hash, column_index, row_group, serialize_arrow_array(array)))
+    connection.execute(executed_sql_query_chunk.insert(), chunks)
@@ -0,0 +1,33 @@
+from dataclasses import dataclass, field
+
+from sqlalchemy import Column, Table, ForeignKey
+from sqlalchemy import String, Text, Boolean
+
+from ...orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_TABLE_NAME, EXECUTED_SQL_QUERY_PLAN_TABLE_NAME
+
+
+executed_sql_query_plan = Table(
+    EXECUTED_SQL_QUERY_PLAN_TABLE_NAME,
+    metadata,
+    Column('uuid', String(32), ForeignKey(f"{EXECUTED_SQL_QUERY_TABLE_NAME}.uuid"), primary_key=True),
+    Column('plan', Text),
+    Column('plan_format', String(16)),
+    Column('plan_fingerprint', String(32)),
+    Column('regressed', Boolean),
+    extend_existing=True,
+)
+
+
+@dataclass
+class ExecutedSqlQueryPlan:
+    """Execution plan captured for executed query.
+    Flag regressed is set when the same query previously ran faster with a plan of different shape.
+    """
+    uuid: str
+    plan: str = field(repr=False)
+    plan_format: str
+    plan_fingerprint: str
+    regressed: bool = False
+
+
+orm_map(ExecutedSqlQueryPlan, executed_sql_query_plan)
@@ -0,0 +1,25 @@
+from sqlalchemy import TypeDecorator, LargeBinary
+
+
+class BinaryData(TypeDecorator):
+    """Stores bytes as is in binary column (BLOB in SQLite, BYTEA in PostgreSQL, LONGBLOB in MySQL)."""
+    impl = LargeBinary
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == 'mysql':
+            from sqlalchemy.dialects.mysql import LONGBLOB
+
+            return dialect.type_descriptor(LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_result_value(self, value, dialect):
+        """Converts buffers returned by some drivers (e.g. memoryview by psycopg2) to bytes.
+
+        :param value: bytes or buffer
+        :param dialect: sqlalchemy dialect
+        :return: bytes
+        """
+        if isinstance(value, memoryview):
+            return value.tobytes()
+        return value
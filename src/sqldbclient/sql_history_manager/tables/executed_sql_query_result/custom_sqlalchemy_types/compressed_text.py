@@ -0,0 +1,45 @@
+import zlib
+
+from sqlalchemy import TypeDecorator, Text, LargeBinary
+
+# dialects, which store text as is, others store it compressed in binary columns
+TEXT_DIALECTS = ('sqlite',)
+
+
+class CompressedText(TypeDecorator):
+    """Stores text as is in SQLite, and as zlib-compressed binary data
+    (BYTEA in PostgreSQL, LONGBLOB in MySQL, BLOB in others) in server-side databases.
+    """
+    impl = Text
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name in TEXT_DIALECTS:
+            return dialect.type_descriptor(Text())
+        if dialect.name == 'mysql':
+            from sqlalchemy.dialects.mysql import LONGBLOB
+
+            return dialect.type_descriptor(LONGBLOB())
+        return dialect.type_descriptor(LargeBinary())
+
+    def process_bind_param(self, value, dialect):
+        """Compresses text for server-side databases.
+
+        :param value: text
+        :param dialect: sqlalchemy dialect
+        :return: text or compressed bytes
+        """
+        if value is None or dialect is None or dialect.name in TEXT_DIALECTS:
+            return value
+        return zlib.compress(value.encode('utf-8'))
+
+    def process_result_value(self, value, dialect):
+        """Decompresses text stored in binary column.
+
+        :param value: text or compressed bytes
+        :param dialect: sqlalchemy dialect
+        :return: text
+        """
+        if isinstance(value, (bytes, memoryview)):
+            return zlib.decompress(value).decode('utf-8')
+        return value
@@ -1,33 +1,49 @@
 import io
 
-from sqlalchemy import TypeDecorator, String
 import pandas as pd
 
 from sqldbclient.utils.pandas.parse_dates import parse_dates
+from .compressed_text import CompressedText
 
 
-class DataFrame(TypeDecorator):
-    impl = String
+def serialize_data_frame(df: pd.DataFrame) -> str:
+    """Converts pandas DataFrame to csv-like string."""
+    return df.to_csv(sep='\x1F', index=False)
 
+
+def deserialize_data_frame(value: str) -> pd.DataFrame:
+    """Converts csv-like string to pandas DataFrame and casts columns to pandas datetime when applicable."""
+    buffer = io.StringIO(value)
+    result = pd.read_csv(buffer, sep='\x1F')  # noqa
+    result = parse_dates(result)
+    return result
+
+
+class DataFrame(CompressedText):
+    """Stores pandas DataFrame as csv-like text in SQLite, and as zlib-compressed csv-like binary data
+    in server-side databases.
+    """
     def process_literal_param(self, value, dialect):
-        """Converts value pandas DataFrame to csv-like string.
+        """Converts value pandas DataFrame to csv-like string, compressed for server-side databases.
 
         :param value: pandas DataFrame
         :param dialect: sqlalchemy dialect
-        :return: csv-like string
+        :return: csv-like string or compressed bytes
         """
-        return value.to_csv(sep='\x1F', index=False)
+        if value is None:
+            return None
+        return super().process_bind_param(serialize_data_frame(value), dialect)
 
     process_bind_param = process_literal_param
 
     def process_result_value(self, value, dialect):
-        """Converts csv-like string to pandas DataFrame and casts columns to pandas datetime when applicable.
+        """Converts csv-like string (or its compressed form) to pandas DataFrame
+        and casts columns to pandas datetime when applicable.
 
-        :param value: csv-like string
+        :param value: csv-like string or compressed bytes
         :param dialect: sqlalchemy dialect
         :return: pandas DataFrame
         """
-        buffer = io.StringIO(value)
-        result = pd.read_csv(buffer, sep='\x1F')  # noqa
-        result = parse_dates(result)
-        return result
+        if value is None:
+            return None
+        return deserialize_data_frame(super().process_result_value(value, dialect))
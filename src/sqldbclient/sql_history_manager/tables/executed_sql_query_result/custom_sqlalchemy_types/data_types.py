@@ -1,9 +1,10 @@
 import json
-from sqlalchemy import TypeDecorator, String
+from sqlalchemy import TypeDecorator, Text
 
 
 class DataTypes(TypeDecorator):
-    impl = String
+    impl = Text
+    cache_ok = True
 
     def process_literal_param(self, value, dialect):
         """Convert dict of mapping between pandas DataFrame columns and their data types to json-string.
@@ -23,4 +24,6 @@ class DataTypes(TypeDecorator):
         :param dialect:sqlalchemy dialect
         :return: dict of mapping between pandas DataFrame columns and their data types
         """
+        if value is None:
+            return None
         return json.loads(value)
@@ -1,11 +1,12 @@
 from dataclasses import field, dataclass
-from typing import List
+from typing import List, Optional
 
 import pandas as pd
 from sqlalchemy import Column, Table, ForeignKey
 from sqlalchemy import String, Integer
 
-from ...orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_TABLE_NAME, EXECUTED_SQL_QUERY_RESULT_TABLE_NAME
+from ...orm_config import metadata, orm_map, EXECUTED_SQL_QUERY_TABLE_NAME, EXECUTED_SQL_QUERY_RESULT_TABLE_NAME, \
+    EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME
 from .custom_sqlalchemy_types.data_types import DataTypes
 from .custom_sqlalchemy_types.data_frame import DataFrame
 
@@ -13,25 +14,35 @@ from .custom_sqlalchemy_types.data_frame import DataFrame
 executed_sql_query_result = Table(
     EXECUTED_SQL_QUERY_RESULT_TABLE_NAME,
     metadata,
-    Column('uuid', String, ForeignKey(f"{EXECUTED_SQL_QUERY_TABLE_NAME}.uuid"),  primary_key=True),
+    Column('uuid', String(32), ForeignKey(f"{EXECUTED_SQL_QUERY_TABLE_NAME}.uuid"),  primary_key=True),
+    # results dumped by older versions of the package keep data inline, newer ones refer to shared payloads
     Column('dataframe', DataFrame),
     Column('datatypes', DataTypes),
     Column('estimated_size', Integer),
+    Column('payload_hash', String(64), ForeignKey(f"{EXECUTED_SQL_QUERY_PAYLOAD_TABLE_NAME}.payload_hash"),
+           index=True),
     extend_existing=True,
 )
 
 
 @dataclass
 class ExecutedSqlQueryResult:
+    """Result of executed query. Data itself is stored in ExecutedSqlQueryPayload referred by payload hash,
+    apart from results dumped by older versions of the package, which keep dataframe and datatypes inline.
+    """
     uuid: str
-    dataframe: pd.DataFrame = field(repr=False)
-    datatypes: List[str] = field(init=False)
-    estimated_size: int = field(init=False)
+    payload_hash: Optional[str] = None
+    estimated_size: Optional[int] = None
+    dataframe: Optional[pd.DataFrame] = field(default=None, repr=False)
+    datatypes: Optional[List[str]] = field(default=None, repr=False)
 
     def __post_init__(self):
+        if self.dataframe is None:
+            return
         self.datatypes = [d.name for d in self.dataframe.dtypes]
-        # estimated dataframe size in bytes
-        self.estimated_size = int(self.dataframe.memory_usage(deep=True).sum())
+        if self.estimated_size is None:
+            # estimated dataframe size in bytes
+            self.estimated_size = int(self.dataframe.memory_usage(deep=True).sum())
 
 
 orm_map(ExecutedSqlQueryResult, executed_sql_query_result)
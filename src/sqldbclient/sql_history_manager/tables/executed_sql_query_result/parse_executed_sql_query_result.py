@@ -1,15 +1,26 @@
+from typing import List
+
 import pandas as pd
 from sqldbclient.sql_history_manager.tables.executed_sql_query_result.executed_sql_query_result \
     import ExecutedSqlQueryResult
 
 
-def parse_executed_sql_query_result(result: ExecutedSqlQueryResult) -> pd.DataFrame:
+def restore_data_types(df: pd.DataFrame, datatypes: List[str]) -> pd.DataFrame:
     """Restores original column data types of dumped pandas DataFrame
 
-    :param result: ExecutedSqlQueryResult
+    :param df: pandas DataFrame read from history database
+    :param datatypes: names of original data types of columns
     :return: pandas DataFrame
     """
-    df = result.dataframe
     for i, col in enumerate(df.columns):
-        df[col] = df[col].astype(result.datatypes[i])
+        df[col] = df[col].astype(datatypes[i])
     return df
+
+
+def parse_executed_sql_query_result(result: ExecutedSqlQueryResult) -> pd.DataFrame:
+    """Restores original column data types of dumped pandas DataFrame
+
+    :param result: ExecutedSqlQueryResult
+    :return: pandas DataFrame
+    """
+    return restore_data_types(result.dataframe, result.datatypes)
@@ -0,0 +1,35 @@
+import logging
+
+import sqlalchemy
+from sqlalchemy import text
+from sqlalchemy.engine.base import Connection
+
+from sqldbclient.sql_history_manager.orm_config import metadata
+
+logger = logging.getLogger(__name__)
+
+
+def upgrade_schema(connection: Connection) -> None:
+    """Adds columns and indexes, that were introduced in newer versions of the package,
+    to tables of existing history database. Tables that do not exist yet are skipped,
+    since they are created by sqlalchemy ``create_all`` method.
+
+    :param connection: sqlalchemy connection to history database, changes are made within its transaction
+    """
+    inspector = sqlalchemy.inspect(connection)
+    existing_tables = set(inspector.get_table_names())
+    for table in metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        existing_columns = {c['name'] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            column_type = column.type.compile(dialect=connection.dialect)
+            connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}'))
+            logger.info(f'Added column {column.name} to history table {table.name}')
+        existing_indexes = {i['name'] for i in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                index.create(connection)
+                logger.info(f'Created index {index.name} on history table {table.name}')
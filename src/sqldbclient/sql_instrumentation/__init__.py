@@ -0,0 +1,28 @@
+"""
+Instrumentation tools, that are used to observe what happens inside ``SqlExecutor``:
+
+- ``sql_event_hooks`` is a process-wide registry of hooks, which are called on
+  query execution, rows fetching, dumping to history database and transaction begin, commit and rollback.
+  When no hook is registered for an event, the event is not even constructed.
+- ``MetricsCollector`` is a hook, that counts queries and transactions and measures their durations
+  in a Prometheus-style ``MetricsRegistry`` with counters and histograms.
+- ``OpenTelemetryTracer`` is a hook, that creates OpenTelemetry spans for query executions and transactions
+  (requires ``opentelemetry-api`` package).
+
+  .. code-block:: python
+
+   from sqldbclient.sql_instrumentation import MetricsCollector, sql_event_hooks
+
+   metrics_collector = MetricsCollector().install(sql_event_hooks)
+   pg_executor.execute('SELECT 1')
+   print(metrics_collector.registry.render())
+
+"""
+
+from sqldbclient.sql_instrumentation.sql_event import SqlEvent
+from sqldbclient.sql_instrumentation.sql_event_hooks import SqlEventHooks
+from sqldbclient.sql_instrumentation.metrics_registry import MetricsRegistry
+from sqldbclient.sql_instrumentation.metrics_collector import MetricsCollector
+from sqldbclient.sql_instrumentation.open_telemetry_tracer import OpenTelemetryTracer
+
+sql_event_hooks = SqlEventHooks()
@@ -0,0 +1,74 @@
+from typing import Optional, Dict, Any
+
+from sqldbclient.sql_instrumentation.sql_event import SqlEvent
+from sqldbclient.sql_instrumentation.sql_event_hooks import SqlEventHooks
+from sqldbclient.sql_instrumentation.metrics_registry import MetricsRegistry
+
+
+class MetricsCollector:
+    """Hook, that collects metrics of query executions, fetching, dumping and transactions
+    into a Prometheus-style registry:
+
+    - sqldbclient_queries_total (labels: query_type, status)
+    - sqldbclient_query_duration_seconds (labels: query_type)
+    - sqldbclient_fetch_duration_seconds
+    - sqldbclient_fetched_rows_total
+    - sqldbclient_dump_duration_seconds
+    - sqldbclient_transactions_total (labels: outcome)
+    - sqldbclient_transaction_duration_seconds (labels: outcome)
+    """
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.queries = self.registry.counter(
+            'sqldbclient_queries_total', 'Number of executed queries', ('query_type', 'status'))
+        self.query_duration = self.registry.histogram(
+            'sqldbclient_query_duration_seconds', 'Duration of query executions', ('query_type',))
+        self.fetch_duration = self.registry.histogram(
+            'sqldbclient_fetch_duration_seconds', 'Duration of fetching rows')
+        self.fetched_rows = self.registry.counter(
+            'sqldbclient_fetched_rows_total', 'Number of fetched rows')
+        self.dump_duration = self.registry.histogram(
+            'sqldbclient_dump_duration_seconds', 'Duration of dumping to history database')
+        self.transactions = self.registry.counter(
+            'sqldbclient_transactions_total', 'Number of finished transactions', ('outcome',))
+        self.transaction_duration = self.registry.histogram(
+            'sqldbclient_transaction_duration_seconds', 'Duration of transactions', ('outcome',))
+        self._hooks = {
+            SqlEvent.AFTER_EXECUTE: self._on_after_execute,
+            SqlEvent.EXECUTE_ERROR: self._on_execute_error,
+            SqlEvent.FETCH: self._on_fetch,
+            SqlEvent.DUMP: self._on_dump,
+            SqlEvent.TRANSACTION_COMMIT: self._on_transaction_end,
+            SqlEvent.TRANSACTION_ROLLBACK: self._on_transaction_end,
+        }
+
+    def install(self, sql_event_hooks: SqlEventHooks) -> 'MetricsCollector':
+        """Registers collector hooks"""
+        for event, hook in self._hooks.items():
+            sql_event_hooks.register(event, hook)
+        return self
+
+    def uninstall(self, sql_event_hooks: SqlEventHooks) -> None:
+        """Removes collector hooks"""
+        for event, hook in self._hooks.items():
+            sql_event_hooks.unregister(event, hook)
+
+    def _on_after_execute(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        query_type = details['executed_query'].query_type
+        self.queries.inc(query_type=query_type, status='success')
+        self.query_duration.observe(details['seconds'], query_type=query_type)
+
+    def _on_execute_error(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        self.queries.inc(query_type='UNKNOWN', status='error')
+
+    def _on_fetch(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        self.fetch_duration.observe(details['seconds'])
+        self.fetched_rows.inc(details['rows_count'])
+
+    def _on_dump(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        self.dump_duration.observe(details['seconds'])
+
+    def _on_transaction_end(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        outcome = 'commit' if event == SqlEvent.TRANSACTION_COMMIT else 'rollback'
+        self.transactions.inc(outcome=outcome)
+        self.transaction_duration.observe(details['seconds'], outcome=outcome)
@@ -0,0 +1,141 @@
+import bisect
+import threading
+from typing import Dict, Tuple, Sequence, Optional, List, Union
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(label_names: Sequence[str], label_values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(label_names, label_values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class Counter:
+    """Monotonically increasing value, one per each combination of label values"""
+    metric_type = 'counter'
+
+    def __init__(self, name: str, description: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        """Increases counter
+
+        :param amount: non-negative value to add
+        :param labels: label values
+        """
+        key = tuple(str(labels[n]) for n in self.label_names)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        """Returns current value for label values"""
+        return self._values.get(tuple(str(labels[n]) for n in self.label_names), 0)
+
+    def samples(self) -> List[str]:
+        """Returns lines in Prometheus text exposition format"""
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.label_names, k)} {v}' for k, v in items]
+
+
+class Histogram:
+    """Distribution of observed values in cumulative buckets, one per each combination of label values"""
+    metric_type = 'histogram'
+
+    def __init__(self,
+                 name: str,
+                 description: str,
+                 label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.description = description
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # per label values: counts of each bucket (the last one is +Inf), sum and count of observations
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        """Adds observation
+
+        :param value: observed value
+        :param labels: label values
+        """
+        key = tuple(str(labels[n]) for n in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            if key not in self._values:
+                self._values[key] = ([0] * (len(self.buckets) + 1), [0.0, 0])
+            counts, totals = self._values[key]
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    def get_count(self, **labels) -> int:
+        """Returns number of observations for label values"""
+        value = self._values.get(tuple(str(labels[n]) for n in self.label_names))
+        return 0 if value is None else value[1][1]
+
+    def samples(self) -> List[str]:
+        """Returns lines in Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            items = [(k, (list(c), list(t))) for k, (c, t) in self._values.items()]
+        for key, (counts, (total, count)) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                labels = _format_labels(self.label_names, key, f'le="{le}"')
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            lines.append(f'{self.name}_sum{_format_labels(self.label_names, key)} {total}')
+            lines.append(f'{self.name}_count{_format_labels(self.label_names, key)} {count}')
+        return lines
+
+
+class MetricsRegistry:
+    """Prometheus-style registry of counters and histograms,
+    which can be rendered in text exposition format to be scraped or pushed.
+    """
+    def __init__(self):
+        self._metrics: Dict[str, Union[Counter, Histogram]] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = metric_class(name, *args, **kwargs)
+                self._metrics[name] = metric
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f'Metric {name} is already registered as {metric.metric_type}')
+            return metric
+
+    def counter(self, name: str, description: str, label_names: Sequence[str] = ()) -> Counter:
+        """Gets existing or creates new counter"""
+        return self._get_or_create(Counter, name, description, label_names)
+
+    def histogram(self,
+                  name: str,
+                  description: str,
+                  label_names: Sequence[str] = (),
+                  buckets: Optional[Sequence[float]] = None) -> Histogram:
+        """Gets existing or creates new histogram"""
+        return self._get_or_create(Histogram, name, description, label_names, buckets or DEFAULT_BUCKETS)
+
+    def render(self) -> str:
+        """Renders all metrics in Prometheus text exposition format"""
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.append(f'# HELP {metric.name} {metric.description}')
+            lines.append(f'# TYPE {metric.name} {metric.metric_type}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
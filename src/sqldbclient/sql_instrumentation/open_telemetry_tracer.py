@@ -0,0 +1,77 @@
+from typing import Optional, Dict, Any
+
+from sqldbclient.sql_instrumentation.sql_event import SqlEvent
+from sqldbclient.sql_instrumentation.sql_event_hooks import SqlEventHooks
+
+
+class OpenTelemetryTracer:
+    """Hook, that creates OpenTelemetry spans for query executions (``sqldbclient.execute``)
+    and transactions (``sqldbclient.transaction``), following database semantic conventions.
+    While a transaction is active, its span is the current one, so that execution spans become its children.
+    Requires ``opentelemetry-api`` package to be installed.
+    """
+    def __init__(self, tracer: Optional[Any] = None):
+        try:
+            from opentelemetry import trace, context
+        except ImportError:
+            raise ImportError('OpenTelemetryTracer requires opentelemetry-api package to be installed')
+        self._trace = trace
+        self._context = context
+        self._tracer = tracer if tracer is not None else trace.get_tracer('sqldbclient')
+        self._hooks = {
+            SqlEvent.BEFORE_EXECUTE: self._on_before_execute,
+            SqlEvent.AFTER_EXECUTE: self._on_after_execute,
+            SqlEvent.EXECUTE_ERROR: self._on_execute_error,
+            SqlEvent.TRANSACTION_BEGIN: self._on_transaction_begin,
+            SqlEvent.TRANSACTION_COMMIT: self._on_transaction_end,
+            SqlEvent.TRANSACTION_ROLLBACK: self._on_transaction_end,
+        }
+
+    def install(self, sql_event_hooks: SqlEventHooks) -> 'OpenTelemetryTracer':
+        """Registers tracer hooks"""
+        for event, hook in self._hooks.items():
+            sql_event_hooks.register(event, hook)
+        return self
+
+    def uninstall(self, sql_event_hooks: SqlEventHooks) -> None:
+        """Removes tracer hooks"""
+        for event, hook in self._hooks.items():
+            sql_event_hooks.unregister(event, hook)
+
+    def _on_before_execute(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        attributes = {'db.statement': details['query']}
+        if details.get('db_system'):
+            attributes['db.system'] = details['db_system']
+        details['context']['span'] = self._tracer.start_span('sqldbclient.execute', attributes=attributes)
+
+    def _on_after_execute(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        span = details['context'].pop('span', None)
+        if span is None:
+            return
+        executed_query = details['executed_query']
+        span.set_attribute('db.operation', executed_query.query_type)
+        span.set_attribute('sqldbclient.uuid', executed_query.uuid)
+        if executed_query.rows_count is not None:
+            span.set_attribute('sqldbclient.rows_count', executed_query.rows_count)
+        span.end()
+
+    def _on_execute_error(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        span = details['context'].pop('span', None)
+        if span is None:
+            return
+        span.record_exception(details['error'])
+        span.set_status(self._trace.Status(self._trace.StatusCode.ERROR, str(details['error'])))
+        span.end()
+
+    def _on_transaction_begin(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        span = self._tracer.start_span('sqldbclient.transaction')
+        details['context']['span'] = span
+        details['context']['token'] = self._context.attach(self._trace.set_span_in_context(span))
+
+    def _on_transaction_end(self, event: SqlEvent, details: Dict[str, Any]) -> None:
+        span = details['context'].pop('span', None)
+        if span is None:
+            return
+        span.set_attribute('sqldbclient.outcome', 'commit' if event == SqlEvent.TRANSACTION_COMMIT else 'rollback')
+        self._context.detach(details['context'].pop('token'))
+        span.end()
@@ -0,0 +1,26 @@
+import enum
+
+
+class SqlEvent(enum.Enum):
+    """Events, that hooks can be registered for.
+
+    Each hook is called with an event and a dict of its details, which always includes ``context`` dict,
+    shared between related events (e.g. ``BEFORE_EXECUTE`` and ``AFTER_EXECUTE`` of the same query),
+    so that hooks can keep their state there. Durations are measured with monotonic clock, in seconds.
+
+    - ``BEFORE_EXECUTE``: query
+    - ``AFTER_EXECUTE``: query, executed_query (ExecutedSqlQuery), seconds
+    - ``EXECUTE_ERROR``: query, error, seconds
+    - ``FETCH``: executed_query, seconds, rows_count
+    - ``DUMP``: executed_query, seconds
+    - ``TRANSACTION_BEGIN``
+    - ``TRANSACTION_COMMIT``, ``TRANSACTION_ROLLBACK``: seconds since transaction begin
+    """
+    BEFORE_EXECUTE = 'before_execute'
+    AFTER_EXECUTE = 'after_execute'
+    EXECUTE_ERROR = 'execute_error'
+    FETCH = 'fetch'
+    DUMP = 'dump'
+    TRANSACTION_BEGIN = 'transaction_begin'
+    TRANSACTION_COMMIT = 'transaction_commit'
+    TRANSACTION_ROLLBACK = 'transaction_rollback'
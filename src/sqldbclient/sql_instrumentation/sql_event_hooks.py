@@ -0,0 +1,59 @@
+import logging
+from typing import Callable, Dict, List, Any
+
+from sqldbclient.sql_instrumentation.sql_event import SqlEvent
+
+logger = logging.getLogger(__name__)
+
+SqlEventHook = Callable[[SqlEvent, Dict[str, Any]], None]
+
+
+class SqlEventHooks:
+    """Registry of hooks, which are called when corresponding events occur.
+    Callers check :func:`~is_enabled` before constructing event details,
+    so that instrumentation costs nothing when no hook is registered.
+    Exceptions raised by hooks are logged and do not interrupt query execution.
+    """
+    def __init__(self):
+        self._hooks: Dict[SqlEvent, List[SqlEventHook]] = {}
+
+    def register(self, event: SqlEvent, hook: SqlEventHook) -> None:
+        """Registers hook to be called on event
+
+        :param event: SqlEvent
+        :param hook: callable that takes an event and a dict of its details
+        """
+        # copy on write, so that events being emitted in other threads are not affected
+        hooks = dict(self._hooks)
+        hooks[event] = hooks.get(event, []) + [hook]
+        self._hooks = hooks
+
+    def unregister(self, event: SqlEvent, hook: SqlEventHook) -> None:
+        """Removes previously registered hook
+
+        :param event: SqlEvent
+        :param hook: registered callable
+        """
+        hooks = dict(self._hooks)
+        remaining = [h for h in hooks.get(event, []) if h is not hook]
+        if remaining:
+            hooks[event] = remaining
+        else:
+            hooks.pop(event, None)
+        self._hooks = hooks
+
+    def is_enabled(self, event: SqlEvent) -> bool:
+        """Checks whether any hook is registered for event"""
+        return event in self._hooks
+
+    def emit(self, event: SqlEvent, **details) -> None:
+        """Calls hooks registered for event
+
+        :param event: SqlEvent
+        :param details: event details passed to hooks
+        """
+        for hook in self._hooks.get(event, ()):
+            try:
+                hook(event, details)
+            except Exception as exc:
+                logger.warning(f'Hook {hook} failed on event {event.value}: {exc}')
@@ -0,0 +1,26 @@
+__docformat__ = "restructuredtext"
+
+# module level doc-string
+__doc__ = """
+``SqlLocalQueryEngine``
+   - runs SQL queries locally with DuckDB over results stored in history database,
+     e.g. joins results of several executed queries
+   - exposes stored results as tables named by their UUIDs or aliases
+   - decodes only columns referenced by queries, and lets DuckDB scan them as Arrow tables without copying
+
+Requires ``duckdb`` and ``pyarrow`` packages.
+
+  .. code-block:: python
+
+   from sqldbclient.sql_local_query_engine import SqlLocalQueryEngine
+
+   local_engine = SqlLocalQueryEngine(pg_executor).register('ce19362a9ac54e06b3be66d5cf858932', alias='orders')
+   local_engine.execute('''
+       SELECT o.customer_id, c.name, sum(o.amount) AS amount
+       FROM orders o JOIN "8f0e3b1c5d2a4e6f9a7b1c3d5e7f9a1b" c USING (customer_id)
+       GROUP BY 1, 2
+   ''')
+
+"""
+
+from sqldbclient.sql_local_query_engine.sql_local_query_engine import SqlLocalQueryEngine
@@ -0,0 +1,143 @@
+import logging
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+
+from sqldbclient.sql_history_manager.sql_history_manager import SqlHistoryManager
+from sqldbclient.utils.log_decorators import class_logifier
+
+logger = logging.getLogger(__name__)
+
+UUID_PATTERN = re.compile(r'\b[0-9a-f]{32}\b')
+# quoted identifier or a word
+IDENTIFIER_PATTERN = re.compile(r'"((?:[^"]|"")+)"|(\w+)')
+# star selecting all columns, but not count(*)
+STAR_PATTERN = re.compile(r'(^|[\s,.])\*')
+DEFAULT_MAX_CACHED_BYTES = 512 * 2 ** 20
+
+
+@class_logifier(methods=['execute'])
+class SqlLocalQueryEngine:
+    """Class that runs SQL queries with DuckDB over results stored in history database.
+    Stored results are exposed as tables named by their UUIDs (UUIDs mentioned in queries are registered
+    automatically) or by aliases given in :func:`~register`.
+    Only columns referenced by a query are read from history database as Arrow arrays (chunks stored in Arrow IPC
+    format are not converted to pandas), and DuckDB scans them in place. Arrays are kept in memory between queries
+    up to a size limit, the least recently used ones are dropped first.
+    Requires ``duckdb`` and ``pyarrow`` packages to be installed.
+    """
+    def __init__(self,
+                 history_manager: SqlHistoryManager,
+                 database: str = ':memory:',
+                 max_cached_bytes: Optional[int] = DEFAULT_MAX_CACHED_BYTES):
+        """
+        :param history_manager: SqlHistoryManager (e.g. SqlExecutor) to read stored results from
+        :param database: DuckDB database, in-memory by default
+        :param max_cached_bytes: (optional) Size limit of Arrow arrays kept in memory between queries in bytes.
+            If None, arrays are kept until the engine is closed.
+        """
+        try:
+            import duckdb
+            import pyarrow
+        except ImportError:
+            raise ImportError('SqlLocalQueryEngine requires duckdb and pyarrow packages to be installed')
+        self._pyarrow = pyarrow
+        self._connection = duckdb.connect(database)
+        self._history_manager = history_manager
+        self._tables: Dict[str, str] = {}
+        self._columns: Dict[str, List[str]] = {}
+        self._arrays: 'OrderedDict[Tuple[str, str], Any]' = OrderedDict()
+        self._max_cached_bytes = max_cached_bytes
+        self._cached_bytes = 0
+
+    @property
+    def tables(self) -> Dict[str, str]:
+        """Registered table names and UUIDs of results they expose"""
+        return dict(self._tables)
+
+    def register(self, uuid: str, alias: Optional[str] = None) -> 'SqlLocalQueryEngine':
+        """Exposes stored result as a table.
+        If UUID is not found, ValueError is raised.
+
+        :param uuid: UUID of executed query
+        :param alias: (optional) Table name, UUID is used by default.
+        :return: self
+        """
+        if uuid not in self._columns:
+            # reads no rows, only names of columns
+            self._columns[uuid] = list(self._history_manager.get_result(uuid, rows=slice(0, 0)).columns)
+        self._tables[alias or uuid] = uuid
+        return self
+
+    def execute(self, query: str) -> pd.DataFrame:
+        """Runs SQL query in DuckDB over registered results.
+
+        :param query: query text in DuckDB SQL dialect
+        :return: pandas DataFrame
+        """
+        for uuid in UUID_PATTERN.findall(query):
+            if uuid not in self._tables:
+                try:
+                    self.register(uuid)
+                except ValueError:
+                    # not an UUID of stored result, e.g. a literal
+                    pass
+        identifiers = self._get_identifiers(query)
+        select_all = STAR_PATTERN.search(query) is not None
+        registered = []
+        try:
+            for name, uuid in self._tables.items():
+                if name.lower() in identifiers:
+                    self._connection.register(name, self._get_arrow_table(uuid, identifiers, select_all))
+                    registered.append(name)
+            return self._connection.execute(query).df()
+        finally:
+            # arrays are held only by the cache between queries
+            for name in registered:
+                self._connection.unregister(name)
+            self._evict_arrays()
+
+    def clear_cache(self) -> None:
+        """Frees memory used by Arrow arrays kept between queries"""
+        self._arrays.clear()
+        self._cached_bytes = 0
+
+    def close(self) -> None:
+        """Closes DuckDB connection and frees memory used by Arrow arrays"""
+        self._connection.close()
+        self.clear_cache()
+
+    @staticmethod
+    def _get_identifiers(query: str) -> Set[str]:
+        identifiers = set()
+        for quoted, word in IDENTIFIER_PATTERN.findall(query):
+            identifiers.add((quoted.replace('""', '"') if quoted else word).lower())
+        return identifiers
+
+    def _get_arrow_table(self, uuid: str, identifiers: Set[str], select_all: bool) -> Any:
+        all_columns = self._columns[uuid]
+        columns = [c for c in all_columns if select_all or c.lower() in identifiers]
+        if not columns and all_columns:
+            # table still needs rows, e.g. for count(*)
+            columns = all_columns[:1]
+        missing = []
+        for column in dict.fromkeys(columns):
+            if (uuid, column) in self._arrays:
+                self._arrays.move_to_end((uuid, column))
+            else:
+                missing.append(column)
+        if missing:
+            table = self._history_manager.get_result(uuid, columns=missing, output='arrow')
+            for i, column in enumerate(missing):
+                self._arrays[uuid, column] = table.column(i)
+                self._cached_bytes += table.column(i).nbytes
+        return self._pyarrow.Table.from_arrays([self._arrays[uuid, c] for c in columns], names=columns)
+
+    def _evict_arrays(self) -> None:
+        if self._max_cached_bytes is None:
+            return
+        while self._arrays and self._cached_bytes > self._max_cached_bytes:
+            _, array = self._arrays.popitem(last=False)
+            self._cached_bytes -= array.nbytes
@@ -0,0 +1 @@
+from sqldbclient.sql_metadata_cache.sql_metadata_cache import SqlMetadataCache
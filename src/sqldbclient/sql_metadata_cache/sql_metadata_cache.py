@@ -0,0 +1,131 @@
+import copy
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, TYPE_CHECKING
+
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.pool import Pool
+
+if TYPE_CHECKING:
+    from sqlalchemy.engine.reflection import Inspector
+
+logger = logging.getLogger(__name__)
+
+# query types, which are known not to change database schema
+SCHEMA_PRESERVING_QUERY_TYPES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+
+def is_schema_changing(query_type: Optional[str]) -> bool:
+    """Checks if query of given type may change database schema (DDL, GRANT, COMMENT, etc.).
+    Queries, which type is unknown or was not determined, are considered changing.
+
+    :param query_type: type of query determined by SqlQueryPreparator
+    """
+    return query_type not in SCHEMA_PRESERVING_QUERY_TYPES
+
+
+class SqlMetadataCache:
+    """Cache of database catalog metadata (tables, columns, views, view dependencies and indexes),
+    shared within the process by all users of the same engine, see :func:`~get_or_create`.
+    It is used by :func:`~sqldbclient.db_inspector.inspect` and
+    :class:`~sqldbclient.dialects.postgresql.SqlViewFactory`.
+
+    Entries expire after ``ttl`` seconds. The whole cache is invalidated by SqlExecutor
+    after executing a query, which may change database schema (or after committing transaction with such query),
+    and can be invalidated explicitly with :func:`~invalidate`.
+    Cached values are deep-copied on return, so that callers may modify them.
+    Values are loaded outside of cache-wide lock, so that lookups of other keys are not blocked by catalog queries,
+    while concurrent lookups of the same key wait for a single load.
+    """
+    DEFAULT_TTL = 300.0
+
+    # like engines created by sql_engine_factory, caches live as long as the process;
+    # caches are keyed by connection pool, which engine shares with its copies having other execution options
+    _caches: Dict[Pool, 'SqlMetadataCache'] = {}
+    _caches_lock = threading.Lock()
+
+    def __init__(self, engine: Engine, ttl: float = DEFAULT_TTL):
+        self._engine = engine
+        self.ttl = ttl
+        self._entries: Dict[Tuple[str, Hashable], Tuple[float, Any]] = {}
+        self._inspector: Optional['Inspector'] = None
+        self._inspector_created: float = 0.0
+        self._lock = threading.RLock()
+        self._key_locks: Dict[Tuple[str, Hashable], threading.Lock] = {}
+        # incremented by invalidation, values loaded before it are not stored
+        self._generation = 0
+
+    @classmethod
+    def get_or_create(cls, engine: Engine) -> 'SqlMetadataCache':
+        """Returns the process-wide metadata cache of engine"""
+        with cls._caches_lock:
+            cache = cls._caches.get(engine.pool)
+            if cache is None:
+                cache = cls._caches[engine.pool] = cls(engine)
+            return cache
+
+    @classmethod
+    def find(cls, engine: Engine) -> Optional['SqlMetadataCache']:
+        """Returns metadata cache of engine if it was created, None otherwise"""
+        with cls._caches_lock:
+            return cls._caches.get(engine.pool)
+
+    def _is_expired(self, created: float) -> bool:
+        return time.monotonic() - created > self.ttl
+
+    def get(self, kind: str, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Returns cached value, loading it when it is missing or expired.
+
+        :param kind: kind of metadata, e.g. 'columns', 'views' or 'view_trees'
+        :param key: key of value within kind, e.g. (schema, table)
+        :param loader: callable that loads value from database
+        :return: copy of value
+        """
+        with self._lock:
+            entry = self._entries.get((kind, key))
+            if entry is not None and not self._is_expired(entry[0]):
+                return copy.deepcopy(entry[1])
+            key_lock = self._key_locks.setdefault((kind, key), threading.Lock())
+        with key_lock:
+            with self._lock:
+                # value may have been loaded by another thread in the meantime
+                entry = self._entries.get((kind, key))
+                if entry is not None and not self._is_expired(entry[0]):
+                    return copy.deepcopy(entry[1])
+                generation = self._generation
+            logger.debug(f'Loading {kind} metadata {key} of {self._engine.url!r}')
+            entry = (time.monotonic(), loader())
+            with self._lock:
+                if generation == self._generation:
+                    self._entries[(kind, key)] = entry
+        return copy.deepcopy(entry[1])
+
+    def get_inspector(self, factory: Callable[[Engine], 'Inspector']) -> 'Inspector':
+        """Returns sqlalchemy Inspector of engine, which own cache is cleared when it expires or is invalidated.
+
+        :param factory: callable that creates Inspector
+        """
+        with self._lock:
+            if self._inspector is None:
+                self._inspector = factory(self._engine)
+                self._inspector_created = time.monotonic()
+            elif self._is_expired(self._inspector_created):
+                self._inspector.info_cache.clear()
+                self._inspector_created = time.monotonic()
+            return self._inspector
+
+    def invalidate(self, kind: Optional[str] = None) -> None:
+        """Removes cached values.
+
+        :param kind: (optional) kind of metadata to remove, all metadata is removed when not specified
+        """
+        with self._lock:
+            self._generation += 1
+            if kind is None:
+                self._entries.clear()
+                if self._inspector is not None:
+                    self._inspector.info_cache.clear()
+            else:
+                self._entries = {k: v for k, v in self._entries.items() if k[0] != kind}
+        logger.debug(f'Invalidated {kind or "all"} metadata of {self._engine.url!r}')
@@ -0,0 +1,9 @@
+"""
+``SqlQueryExplainer``
+   - builds EXPLAIN statements for a query according to database dialect
+   - parses obtained execution plans
+   - computes fingerprints of plan shapes, that are used to detect plan changes
+
+"""
+
+from sqldbclient.sql_query_explainer.sql_query_explainer import SqlQueryExplainer
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import re
+from typing import Any, List
+
+# plan node attributes that define its shape, costs and timings are deliberately ignored
+PLAN_SHAPE_KEYS = (
+    'Node Type', 'Parent Relationship', 'Join Type', 'Strategy', 'Partial Mode',
+    'Relation Name', 'Schema', 'Index Name', 'Scan Direction', 'CTE Name', 'Subplan Name',
+    # MySQL
+    'table_name', 'access_type', 'key', 'select_id',
+    # SQLite
+    'detail',
+)
+
+PLAN_TEXT_VOLATILE_REGEX = r'\((cost|actual|rows|loops|never executed)[^)]*\)|(?<![\w.])\d+(?:\.\d+)?(?!\w)'
+
+PLAN_FINGERPRINT_SIZE = 16
+
+
+def _collect_shape(node: Any, path: str, shape: List[str]) -> None:
+    if isinstance(node, dict):
+        attributes = [f'{k}={node[k]}' for k in PLAN_SHAPE_KEYS if k in node]
+        if attributes:
+            shape.append(f'{path}:{",".join(attributes)}')
+        for key, value in sorted(node.items()):
+            if isinstance(value, (dict, list)):
+                _collect_shape(value, f'{path}/{key}', shape)
+    elif isinstance(node, list):
+        for i, item in enumerate(node):
+            _collect_shape(item, f'{path}[{i}]', shape)
+
+
+def get_plan_shape(plan: str, plan_format: str) -> str:
+    """Extracts plan shape, that is plan nodes and their structure without costs, row estimates and timings.
+
+    :param plan: execution plan text
+    :param plan_format: 'json' or 'text'
+    :return: plan shape text
+    """
+    if plan_format == 'json':
+        shape = []
+        _collect_shape(json.loads(plan), '', shape)
+        return '\n'.join(shape)
+    lines = (re.sub(PLAN_TEXT_VOLATILE_REGEX, '', line).rstrip() for line in plan.splitlines())
+    return '\n'.join(line for line in lines if line.strip())
+
+
+def get_plan_fingerprint(plan: str, plan_format: str) -> str:
+    """Computes hash of plan shape, which is equal for plans with the same structure.
+
+    :param plan: execution plan text
+    :param plan_format: 'json' or 'text'
+    :return: hex digest
+    """
+    shape = get_plan_shape(plan, plan_format)
+    return hashlib.sha1(shape.encode('utf-8')).hexdigest()[:PLAN_FINGERPRINT_SIZE]
@@ -0,0 +1,82 @@
+import json
+import logging
+from typing import Any, List, Sequence
+
+from sqldbclient.sql_query_explainer.plan_fingerprint import get_plan_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+class SqlQueryExplainer:
+    """Class that builds EXPLAIN statements according to database dialect and parses their output.
+    Supported dialects are PostgreSQL, MySQL and SQLite (which provides only ``EXPLAIN QUERY PLAN``).
+    """
+    PLAN_FORMATS = ('json', 'text')
+    EXPLAINABLE_QUERY_TYPES = ('SELECT', 'INSERT', 'UPDATE', 'DELETE')
+
+    def __init__(self, dialect_name: str):
+        self._dialect_name = dialect_name
+
+    def build(self, query: str, analyze: bool = False, buffers: bool = False, plan_format: str = 'json') -> str:
+        """Builds EXPLAIN statement for query.
+
+        :param query: query text
+        :param analyze: If ``True``, query will be actually executed to obtain real timings.
+        :param buffers: If ``True``, buffers usage will be included (PostgreSQL only), requires analyze.
+        :param plan_format: 'json' or 'text'
+        :return: EXPLAIN statement text
+        """
+        if plan_format not in self.PLAN_FORMATS:
+            raise ValueError(f'Plan format should be one of {self.PLAN_FORMATS}, got {plan_format}')
+        if buffers and not analyze:
+            raise ValueError("Argument 'buffers' can be set only when 'analyze' is set to True")
+        if self._dialect_name == 'postgresql':
+            options = [f'ANALYZE {str(analyze).upper()}', f'BUFFERS {str(buffers).upper()}',
+                       f'FORMAT {plan_format.upper()}']
+            return f'EXPLAIN ({", ".join(options)}) {query}'
+        if self._dialect_name in ('mysql', 'mariadb'):
+            if buffers:
+                raise ValueError('Buffers usage is not supported by MySQL')
+            if analyze:
+                # EXPLAIN ANALYZE supports only tree format
+                return f'EXPLAIN ANALYZE {query}'
+            return f'EXPLAIN FORMAT={"JSON" if plan_format == "json" else "TREE"} {query}'
+        if self._dialect_name == 'sqlite':
+            if analyze or buffers:
+                raise ValueError('SQLite supports only EXPLAIN QUERY PLAN, without analyzing')
+            return f'EXPLAIN QUERY PLAN {query}'
+        raise NotImplementedError(f'EXPLAIN is not supported for dialect {self._dialect_name}')
+
+    def parse(self, rows: List[Sequence[Any]], columns: List[str], plan_format: str = 'json') -> str:
+        """Converts rows returned by EXPLAIN statement to plan text.
+
+        :param rows: fetched rows
+        :param columns: column names
+        :param plan_format: 'json' or 'text'
+        :return: plan in form of json-string or text
+        """
+        if self._dialect_name == 'sqlite':
+            nodes = [dict(zip(columns, row)) for row in rows]
+            if plan_format == 'json':
+                return json.dumps(nodes)
+            depths = {0: -1}
+            lines = []
+            for node in nodes:
+                depths[node['id']] = depths.get(node['parent'], -1) + 1
+                lines.append('  ' * depths[node['id']] + node['detail'])
+            return '\n'.join(lines)
+        if plan_format == 'json' and len(rows) == 1:
+            plan = rows[0][0]
+            # some drivers (e.g. psycopg2) parse json themselves
+            return plan if isinstance(plan, str) else json.dumps(plan)
+        return '\n'.join(str(row[0]) for row in rows)
+
+    @staticmethod
+    def fingerprint(plan: str, plan_format: str = 'json') -> str:
+        """Computes fingerprint of plan shape, that does not depend on costs, row estimates and timings.
+
+        :param plan: plan text
+        :param plan_format: 'json' or 'text'
+        :return: hex digest
+        """
+        return get_plan_fingerprint(plan, plan_format)
@@ -4,7 +4,9 @@
    - determines query type
    - formats query
    - automatically adds LIMIT clause to query
+   - normalizes query text by stripping literals, to compute query fingerprint
 
 """
 
 from sqldbclient.sql_query_preparator.sql_query_preparator import SqlQueryPreparator
+from sqldbclient.sql_query_preparator.normalize_query import normalize_query, get_query_fingerprint
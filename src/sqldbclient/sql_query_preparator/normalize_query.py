@@ -0,0 +1,53 @@
+import hashlib
+import re
+from typing import Union
+
+import sqlparse
+from sqlparse.sql import Statement
+from sqlparse import tokens as T
+
+QUERY_FINGERPRINT_SIZE = 16
+
+# lists of placeholders, e.g. in "IN (1, 2, 3)" or "VALUES (1, 'a'), (2, 'b')", are collapsed to a single one
+PLACEHOLDER_LIST_REGEX = r'\(\s*\?(\s*,\s*\?)*\s*\)'
+PLACEHOLDER_TUPLES_REGEX = r'\(\?\)(\s*,\s*\(\?\))+'
+
+
+def _is_literal(token) -> bool:
+    # dollar-quoted strings have plain Literal type, while quoted identifiers are String.Symbol
+    return token.ttype in T.Number or token.ttype in T.String.Single or token.ttype is T.Literal
+
+
+def normalize_query(query: Union[str, Statement]) -> str:
+    """Normalizes query text, so that queries differing only in literal values, comments, letter case
+    of keywords and identifiers, and formatting have the same normalized text. Literals are replaced with '?'.
+
+    :param query: query text or parsed sqlparse statement
+    :return: normalized text
+    """
+    statement = sqlparse.parse(query)[0] if isinstance(query, str) else query
+    parts = []
+    for token in statement.flatten():
+        if token.ttype in T.Comment or token.is_whitespace:
+            if parts and parts[-1] != ' ':
+                parts.append(' ')
+        elif _is_literal(token):
+            parts.append('?')
+        elif token.is_keyword or token.ttype in T.Name:
+            parts.append(token.value.upper() if token.is_keyword else token.value.lower())
+        else:
+            parts.append(token.value)
+    normalized = ''.join(parts).strip().rstrip(';').strip()
+    normalized = re.sub(PLACEHOLDER_LIST_REGEX, '(?)', normalized)
+    normalized = re.sub(PLACEHOLDER_TUPLES_REGEX, '(?)', normalized)
+    return normalized
+
+
+def get_query_fingerprint(query: Union[str, Statement]) -> str:
+    """Computes hash of normalized query text, which is equal for queries of the same shape.
+
+    :param query: query text or parsed sqlparse statement
+    :return: hex digest
+    """
+    normalized = normalize_query(query)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:QUERY_FINGERPRINT_SIZE]
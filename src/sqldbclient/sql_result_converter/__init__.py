@@ -0,0 +1,28 @@
+"""
+``sql_result_converters`` is a process-wide registry of ``SqlResultConverter`` items, which build results
+of ``SqlExecutor.execute`` and ``SqlHistoryManager.get_result`` in requested output type:
+
+- 'pandas': pandas DataFrame (default)
+- 'arrow': Arrow table (requires ``pyarrow`` package)
+- 'polars': polars DataFrame (requires ``polars`` and ``pyarrow`` packages)
+- 'records': list of dicts
+
+Each output type is built directly from fetched rows or Arrow record batches, without intermediate
+pandas DataFrame. Other output types can be registered:
+
+  .. code-block:: python
+
+   from sqldbclient.sql_result_converter import SqlResultConverter, sql_result_converters
+
+   sql_result_converters.register(SqlResultConverter('numpy', from_arrow=lambda table: table.to_pandas().values))
+   pg_executor.execute('SELECT 1 AS a', output='numpy')
+
+"""
+
+from sqldbclient.sql_result_converter.sql_result_converter import SqlResultConverter
+from sqldbclient.sql_result_converter.sql_result_converters import SqlResultConverters
+from sqldbclient.sql_result_converter.builtin_converters import BUILTIN_CONVERTERS
+
+sql_result_converters = SqlResultConverters()
+for _converter in BUILTIN_CONVERTERS:
+    sql_result_converters.register(_converter)
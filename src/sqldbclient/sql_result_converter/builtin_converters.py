@@ -0,0 +1,58 @@
+from typing import Any, List, Sequence, TYPE_CHECKING
+
+import pandas as pd
+
+from sqldbclient.sql_result_converter.sql_result_converter import SqlResultConverter
+from sqldbclient.utils.arrow.arrow_result import arrow_table_to_df
+from sqldbclient.utils.pandas.cursor_result_to_df import rows_to_df
+from sqldbclient.utils.pandas.parse_dates import parse_dates
+
+if TYPE_CHECKING:
+    import pyarrow
+    import polars
+
+
+def get_data_frame_size(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True).sum())
+
+
+def arrow_table_to_polars(table: 'pyarrow.Table') -> 'polars.DataFrame':
+    """Converts Arrow table to polars DataFrame, sharing its buffers where possible"""
+    try:
+        import polars
+    except ImportError:
+        raise ImportError('Polars results require polars package to be installed')
+    return polars.from_arrow(table)
+
+
+def rows_to_records(rows: List[Sequence[Any]], columns: List[str]) -> List[dict]:
+    return [dict(zip(columns, row)) for row in rows]
+
+
+PANDAS_CONVERTER = SqlResultConverter(
+    name='pandas',
+    # dates are parsed the same way as for DataFrame built from rows
+    from_arrow=lambda table: parse_dates(arrow_table_to_df(table, dtype_backend='numpy')),
+    from_rows=rows_to_df,
+    get_size=get_data_frame_size,
+)
+# pandas DataFrame with pd.ArrowDtype columns, requested by dtype_backend='pyarrow'
+ARROW_BACKED_PANDAS_CONVERTER = SqlResultConverter(
+    name='pandas',
+    from_arrow=lambda table: arrow_table_to_df(table, dtype_backend='pyarrow'),
+)
+ARROW_CONVERTER = SqlResultConverter(
+    name='arrow',
+    from_arrow=lambda table: table,
+)
+POLARS_CONVERTER = SqlResultConverter(
+    name='polars',
+    from_arrow=arrow_table_to_polars,
+)
+RECORDS_CONVERTER = SqlResultConverter(
+    name='records',
+    from_arrow=lambda table: table.to_pylist(),
+    from_rows=rows_to_records,
+)
+
+BUILTIN_CONVERTERS = [PANDAS_CONVERTER, ARROW_CONVERTER, POLARS_CONVERTER, RECORDS_CONVERTER]
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+@dataclass(frozen=True)
+class SqlResultConverter:
+    """Builds result of one output type (e.g. pandas DataFrame) directly from fetched data,
+    either from rows fetched by DBAPI cursor, or from Arrow table fetched by drivers capable of Arrow fetch
+    or read from history database.
+
+    :param name: name of output type, used as ``output`` argument of ``execute`` and ``get_result``
+    :param from_arrow: callable, that builds result from Arrow table
+    :param from_rows: (optional) callable, that builds result from list of rows and list of column names.
+        If not specified, rows are converted to Arrow table first.
+    :param get_size: (optional) callable, that returns size of result built from rows in bytes
+    """
+    name: str
+    from_arrow: Callable[['pyarrow.Table'], Any]
+    from_rows: Optional[Callable[[List[Sequence[Any]], List[str]], Any]] = None
+    get_size: Optional[Callable[[Any], int]] = None
+
+    @property
+    def requires_arrow(self) -> bool:
+        """Whether result is built from Arrow table only"""
+        return self.from_rows is None
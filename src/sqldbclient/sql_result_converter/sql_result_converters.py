@@ -0,0 +1,47 @@
+import logging
+from typing import Dict, List
+
+from sqldbclient.sql_result_converter.sql_result_converter import SqlResultConverter
+
+logger = logging.getLogger(__name__)
+
+
+class SqlResultConverters:
+    """Registry of result converters by names of output types"""
+    def __init__(self):
+        self._converters: Dict[str, SqlResultConverter] = {}
+
+    @property
+    def names(self) -> List[str]:
+        """Names of registered output types"""
+        return list(self._converters)
+
+    def register(self, converter: SqlResultConverter) -> None:
+        """Registers converter, replacing the one registered with the same name
+
+        :param converter: SqlResultConverter
+        """
+        # copy on write, so that results being converted in other threads are not affected
+        converters = dict(self._converters)
+        converters[converter.name] = converter
+        self._converters = converters
+
+    def unregister(self, name: str) -> None:
+        """Removes previously registered converter
+
+        :param name: name of output type
+        """
+        converters = dict(self._converters)
+        converters.pop(name, None)
+        self._converters = converters
+
+    def get(self, name: str) -> SqlResultConverter:
+        """Returns converter registered for output type.
+        If output type is unknown, ValueError is raised.
+
+        :param name: name of output type
+        :return: SqlResultConverter
+        """
+        if name not in self._converters:
+            raise ValueError(f'Argument output should be one of {self.names}, got {name}')
+        return self._converters[name]
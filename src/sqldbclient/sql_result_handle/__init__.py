@@ -0,0 +1,17 @@
+"""
+``SqlResultHandle`` is a lightweight handle of a result stored in history database, which keeps only its UUID,
+schema and number of rows in memory. It is returned by ``SqlExecutor.execute`` for results spilled to disk
+while being fetched, and by ``SqlHistoryManager.get_result_handle`` for any stored result.
+Data is read on demand, decoding only chunks of requested columns and rows:
+
+  .. code-block:: python
+
+   handle = pg_executor.execute('SELECT * FROM events', max_bytes_read=2 ** 30, spill=True)
+   handle.head()
+   for df in handle[['user_id', 'amount']].iter_chunks():
+       ...
+   df = handle.to_pandas()
+
+"""
+
+from sqldbclient.sql_result_handle.sql_result_handle import SqlResultHandle
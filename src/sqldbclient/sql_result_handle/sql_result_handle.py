@@ -0,0 +1,120 @@
+from typing import Any, Iterator, List, Optional, Tuple, Union, TYPE_CHECKING
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    from sqldbclient.sql_history_manager.sql_history_manager import SqlHistoryManager
+
+
+class SqlResultHandle:
+    """Handle of a result stored in history database, which is read lazily via history manager.
+    Projection of columns returns another handle, and nothing is read until rows are requested
+    by :func:`~head`, :func:`~iter_chunks`, :func:`~to_pandas` or :func:`~to`.
+
+    :param history_manager: SqlHistoryManager instance, which history database keeps the result
+    :param uuid: UUID of executed query
+    :param columns: names of columns of the result
+    :param datatypes: names of data types of the columns
+    :param rows_count: number of rows of the result
+    :param row_group_size: number of rows stored in one chunk, the default size of chunks read by iter_chunks
+    """
+    def __init__(self,
+                 history_manager: 'SqlHistoryManager',
+                 uuid: str,
+                 columns: List[str],
+                 datatypes: List[str],
+                 rows_count: int,
+                 row_group_size: int):
+        self._history_manager = history_manager
+        self._uuid = uuid
+        self._columns = columns
+        self._datatypes = datatypes
+        self._rows_count = rows_count
+        self._row_group_size = row_group_size
+
+    @property
+    def uuid(self) -> str:
+        """UUID of executed query"""
+        return self._uuid
+
+    @property
+    def columns(self) -> List[str]:
+        """Names of columns"""
+        return list(self._columns)
+
+    @property
+    def schema(self) -> List[Tuple[str, str]]:
+        """Names of columns along with names of their data types"""
+        return list(zip(self._columns, self._datatypes))
+
+    @property
+    def rows_count(self) -> int:
+        """Number of rows"""
+        return self._rows_count
+
+    def __len__(self) -> int:
+        return self._rows_count
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}(uuid='{self._uuid}', rows_count={self._rows_count}, " \
+               f"columns={self._columns})"
+
+    def select(self, columns: List[str]) -> 'SqlResultHandle':
+        """Projects result to columns, without reading any data.
+        If any of columns is not found, ValueError is raised.
+
+        :param columns: names of columns
+        :return: SqlResultHandle item
+        """
+        unknown = [name for name in columns if name not in self._columns]
+        if unknown:
+            raise ValueError(f'No columns {unknown} found in result')
+        datatypes = [self._datatypes[self._columns.index(name)] for name in columns]
+        return SqlResultHandle(self._history_manager, self._uuid, list(columns), datatypes, self._rows_count,
+                               self._row_group_size)
+
+    def __getitem__(self, columns: Union[str, List[str]]) -> 'SqlResultHandle':
+        if isinstance(columns, str):
+            columns = [columns]
+        return self.select(columns)
+
+    def head(self, n: int = 5, output: str = 'pandas') -> Any:
+        """Reads the first n rows.
+
+        :param n: number of rows
+        :param output: Type of result, one of registered in ``sql_result_converters``
+        :return: pandas DataFrame (or result in requested output type)
+        """
+        return self._read(slice(0, n), output)
+
+    def iter_chunks(self, rows_per_chunk: Optional[int] = None, output: str = 'pandas') -> Iterator[Any]:
+        """Reads result by consecutive groups of rows, so that only one of them is held in memory at a time.
+
+        :param rows_per_chunk: (optional) number of rows in each group,
+            the number of rows stored in one chunk by default
+        :param output: Type of result, one of registered in ``sql_result_converters``
+        :return: iterator of pandas DataFrames (or results in requested output type)
+        """
+        if rows_per_chunk is None:
+            rows_per_chunk = self._row_group_size
+        if rows_per_chunk <= 0:
+            raise ValueError(f'Argument rows_per_chunk should be positive, got {rows_per_chunk}')
+        for start in range(0, self._rows_count, rows_per_chunk):
+            yield self._read(slice(start, start + rows_per_chunk), output)
+
+    def to(self, output: str) -> Any:
+        """Reads the whole result (or its projected columns) in requested output type.
+
+        :param output: Type of result, one of registered in ``sql_result_converters``: 'pandas' (pandas DataFrame),
+            'arrow' (Arrow table), 'polars' (polars DataFrame) or 'records' (list of dicts).
+        :return: result in requested output type
+        """
+        return self._read(None, output)
+
+    def to_pandas(self) -> pd.DataFrame:
+        """Reads the whole result (or its projected columns) as pandas DataFrame"""
+        return self.to('pandas')
+
+    def _read(self, rows: Optional[slice], output: str) -> Any:
+        # columns are always specified, so that result read by parts is not cached by history manager
+        return self._history_manager.get_result(self._uuid, columns=self._columns, rows=rows, output=output)
@@ -0,0 +1,9 @@
+"""
+``SqlRetryPolicy``
+   - decides whether a failed query execution can be retried,
+     using error classifiers specific to each database dialect
+   - computes exponential backoff with jitter between attempts
+
+"""
+
+from sqldbclient.sql_retry_policy.sql_retry_policy import SqlRetryPolicy
@@ -0,0 +1,69 @@
+from typing import Callable, Dict
+
+from sqlalchemy.exc import DBAPIError
+
+
+# serialization_failure, deadlock_detected, lock_not_available,
+# connection exceptions, admin_shutdown, crash_shutdown, cannot_connect_now, too_many_connections
+POSTGRESQL_TRANSIENT_SQLSTATES = frozenset((
+    '40001', '40P01', '55P03',
+    '08000', '08001', '08003', '08004', '08006',
+    '57P01', '57P02', '57P03', '53300',
+))
+
+# deadlock, lock wait timeout, server has gone away, lost connection, can't connect
+MYSQL_TRANSIENT_ERROR_CODES = frozenset((1213, 1205, 2006, 2013, 2003))
+
+SQLITE_TRANSIENT_MESSAGES = ('database is locked', 'database table is locked')
+
+
+def is_connection_invalidated(exc: BaseException) -> bool:
+    """Checks whether sqlalchemy detected that the connection was dropped while executing a query"""
+    return isinstance(exc, DBAPIError) and bool(exc.connection_invalidated)
+
+
+def is_postgresql_transient_error(exc: BaseException) -> bool:
+    """Checks whether PostgreSQL error is a serialization failure, deadlock or connection failure"""
+    if is_connection_invalidated(exc):
+        return True
+    orig = getattr(exc, 'orig', None)
+    # psycopg2 provides pgcode, psycopg and asyncpg provide sqlstate
+    sqlstate = getattr(orig, 'pgcode', None) or getattr(orig, 'sqlstate', None)
+    return sqlstate in POSTGRESQL_TRANSIENT_SQLSTATES
+
+
+def is_mysql_transient_error(exc: BaseException) -> bool:
+    """Checks whether MySQL error is a deadlock, lock wait timeout or connection failure"""
+    if is_connection_invalidated(exc):
+        return True
+    orig = getattr(exc, 'orig', None)
+    args = getattr(orig, 'args', None)
+    return bool(args) and args[0] in MYSQL_TRANSIENT_ERROR_CODES
+
+
+def is_sqlite_transient_error(exc: BaseException) -> bool:
+    """Checks whether SQLite error is caused by a locked database"""
+    if is_connection_invalidated(exc):
+        return True
+    orig = getattr(exc, 'orig', None)
+    message = str(orig).lower()
+    return any(m in message for m in SQLITE_TRANSIENT_MESSAGES)
+
+
+ERROR_CLASSIFIERS: Dict[str, Callable[[BaseException], bool]] = {
+    'postgresql': is_postgresql_transient_error,
+    'mysql': is_mysql_transient_error,
+    'mariadb': is_mysql_transient_error,
+    'sqlite': is_sqlite_transient_error,
+}
+
+
+def is_transient_error(exc: BaseException, dialect_name: str) -> bool:
+    """Checks whether error is transient, that is the failed operation may succeed if it is repeated.
+    Dialects without specific classifier are checked only for dropped connections.
+
+    :param exc: raised exception
+    :param dialect_name: sqlalchemy dialect name, e.g. 'postgresql'
+    """
+    classifier = ERROR_CLASSIFIERS.get(dialect_name, is_connection_invalidated)
+    return classifier(exc)
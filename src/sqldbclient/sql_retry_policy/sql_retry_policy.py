@@ -0,0 +1,54 @@
+import random
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from sqldbclient.sql_retry_policy.error_classifiers import is_transient_error
+
+
+@dataclass(frozen=True)
+class SqlRetryPolicy:
+    """Class that describes how failed query executions are retried.
+    Only errors classified as transient (serialization failures, deadlocks, dropped connections)
+    are retried, waiting between attempts with exponential backoff and full jitter.
+
+    :param max_retries: Maximum number of retries after the first failed attempt, ``0`` disables retrying.
+    :param initial_backoff: Delay in seconds before the first retry.
+    :param max_backoff: Upper bound of delay in seconds between retries.
+    :param backoff_multiplier: Factor by which delay grows with each retry.
+    :param jitter: If ``True``, actual delay is chosen randomly between zero and computed backoff.
+    :param retry_non_select: If ``True``, statements other than SELECT will be retried too.
+        By default, they are not, since they may be not idempotent.
+    :param error_classifier: (optional) function that takes an exception and a dialect name
+        and decides whether the error is transient. Defaults to builtin per-dialect classifiers.
+    """
+    max_retries: int = 3
+    initial_backoff: float = 0.1
+    max_backoff: float = 10.0
+    backoff_multiplier: float = 2.0
+    jitter: bool = True
+    retry_non_select: bool = False
+    error_classifier: Optional[Callable[[BaseException, str], bool]] = None
+
+    def is_retryable(self, exc: BaseException, dialect_name: str, attempt: int) -> bool:
+        """Checks whether failed attempt should be repeated.
+
+        :param exc: raised exception
+        :param dialect_name: sqlalchemy dialect name of the engine
+        :param attempt: number of retries already made
+        """
+        if attempt >= self.max_retries:
+            return False
+        classifier = self.error_classifier or is_transient_error
+        return classifier(exc, dialect_name)
+
+    def get_backoff(self, attempt: int) -> float:
+        """Computes delay in seconds before retry number attempt (starting from 1)"""
+        backoff = min(self.max_backoff, self.initial_backoff * self.backoff_multiplier ** (attempt - 1))
+        if self.jitter:
+            backoff = random.uniform(0, backoff)
+        return backoff
+
+    def wait(self, attempt: int) -> None:
+        """Sleeps before retry number attempt (starting from 1)"""
+        time.sleep(self.get_backoff(attempt))
@@ -1,6 +1,7 @@
 """
 ``SqlTransactionManager``
    - provides context manager for performing transactions
+   - replays transactions that failed with transient errors
 
 """
 
@@ -1,15 +1,20 @@
 import logging
-from typing import Optional
-from datetime import datetime
+from typing import Optional, Callable, TypeVar
+from datetime import timedelta
+import time
 
 import sqlalchemy
 from sqlalchemy.engine.base import Engine, RootTransaction
 
 from sqldbclient.utils.deprecated import deprecated
 from sqldbclient.sql_transaction_manager.not_in_transaction_exception import NotInTransActionException
+from sqldbclient.sql_retry_policy.sql_retry_policy import SqlRetryPolicy
+from sqldbclient.sql_instrumentation import sql_event_hooks, SqlEvent
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
+
 
 class SqlTransactionManager:
     """Class that is responsible for transaction management.
@@ -21,11 +26,17 @@ class SqlTransactionManager:
             sql_executor.execute('SELECT * FROM foo')
             sql_executor.commit()
 
+    Since the body of ``with`` block cannot be repeated, transactions that should be replayed
+    after transient failures (e.g. serialization failures or deadlocks) are run with
+    :func:`~run_in_transaction` method according to retry policy.
     """
-    def __init__(self, engine: Engine):
+    def __init__(self, engine: Engine, retry_policy: Optional[SqlRetryPolicy] = None):
         self._engine = engine
+        self._retry_policy = retry_policy if retry_policy is not None else SqlRetryPolicy()
         self._transaction: Optional[RootTransaction] = None
-        self._start: Optional[datetime] = None
+        self._start: Optional[float] = None
+        self._transaction_retries = 0
+        self._transaction_hook_context = {}
 
     @property
     def _is_in_transaction(self) -> bool:
@@ -44,19 +55,24 @@ class SqlTransactionManager:
             connection.execute(sqlalchemy.text('COMMIT'))
         return connection
 
+    def _is_retryable(self, exc: BaseException, attempt: int) -> bool:
+        return self._retry_policy.is_retryable(exc, self._engine.dialect.name, attempt)
+
     def __enter__(self):
         if self._is_in_transaction:
             raise NotImplementedError('Nested transaction are not supported yet')
         logger.warning('Starting transaction')
-        self._start = datetime.now()
+        self._start = time.perf_counter()
         connection = self._get_connection()
         self._transaction = connection.begin()
+        if sql_event_hooks.is_enabled(SqlEvent.TRANSACTION_BEGIN):
+            self._transaction_hook_context = {}
+            sql_event_hooks.emit(SqlEvent.TRANSACTION_BEGIN, context=self._transaction_hook_context)
         return self
 
     def __exit__(self, exc_type, exc, exc_tb):
-        finish = datetime.now()
-        finish = finish.replace(microsecond=self._start.microsecond)
-        logger.warning(f'Exiting transaction, duration = {finish - self._start}')
+        duration = timedelta(seconds=time.perf_counter() - self._start)
+        logger.warning(f'Exiting transaction, duration = {duration}')
         if self._is_in_transaction:
             self.rollback()
         self._transaction.connection.close()
@@ -67,6 +83,9 @@ class SqlTransactionManager:
             raise NotInTransActionException()
         self._transaction.commit()
         logger.warning('Transaction committed')
+        if sql_event_hooks.is_enabled(SqlEvent.TRANSACTION_COMMIT):
+            sql_event_hooks.emit(SqlEvent.TRANSACTION_COMMIT, seconds=time.perf_counter() - self._start,
+                                 context=self._transaction_hook_context)
 
     def rollback(self):
         """Rolls transaction back"""
@@ -74,6 +93,43 @@ class SqlTransactionManager:
             raise NotInTransActionException()
         self._transaction.rollback()
         logger.warning('Transaction rolled back')
+        if sql_event_hooks.is_enabled(SqlEvent.TRANSACTION_ROLLBACK):
+            sql_event_hooks.emit(SqlEvent.TRANSACTION_ROLLBACK, seconds=time.perf_counter() - self._start,
+                                 context=self._transaction_hook_context)
+
+    def run_in_transaction(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Calls func inside a transaction, which is committed when func returns.
+        If func fails with a transient error, the transaction is rolled back and replayed from the start,
+        as many times as retry policy allows. Retries are recorded in execution info of each query::
+
+            def move_funds(amount):
+                sql_executor.execute(f'UPDATE accounts SET balance = balance - {amount} WHERE id = 1')
+                sql_executor.execute(f'UPDATE accounts SET balance = balance + {amount} WHERE id = 2')
+
+            sql_executor.run_in_transaction(move_funds, 100)
+
+        :param func: callable that executes queries, it may be called several times.
+        :param args: arguments to pass to func
+        :param kwargs: keyword arguments to pass to func
+        :return: value returned by func
+        """
+        attempt = 0
+        while True:
+            self._transaction_retries = attempt
+            try:
+                with self:
+                    result = func(*args, **kwargs)
+                    if self._is_in_transaction:
+                        self.commit()
+                return result
+            except Exception as exc:
+                if not self._is_retryable(exc, attempt):
+                    raise
+                attempt += 1
+                logger.warning(f'Transaction failed with transient error, replaying it (retry {attempt}): {exc}')
+                self._retry_policy.wait(attempt)
+            finally:
+                self._transaction_retries = 0
 
     @deprecated
     def commit_transaction(self):
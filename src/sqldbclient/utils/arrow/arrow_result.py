@@ -0,0 +1,230 @@
+import itertools
+from typing import Optional, List, Sequence, Any, Union, Tuple, Iterable, Iterator, TYPE_CHECKING
+
+import pandas as pd
+
+try:
+    from sqlalchemy.engine.cursor import CursorResult
+except ImportError:
+    # support for legacy sqlalchemy versions (< 1.4)
+    from sqlalchemy.engine.result import ResultProxy as CursorResult
+
+if TYPE_CHECKING:
+    import pyarrow
+
+DTYPE_BACKENDS = ('numpy', 'pyarrow')
+# number of rows fetched in the first batch under byte budget, next batches are sized by bytes per row
+INITIAL_BATCH_ROWS = 1_000
+MAX_BATCH_ROWS = 100_000
+
+
+def import_pyarrow():
+    """Imports pyarrow, which is an optional dependency required by Arrow-native results"""
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Arrow results require pyarrow package to be installed')
+    return pyarrow
+
+
+def supports_arrow_fetch(cursor_result: CursorResult) -> bool:
+    """Whether DBAPI cursor of cursor_result fetches results as Arrow tables (e.g. ADBC drivers and DuckDB)"""
+    return callable(getattr(cursor_result.cursor, 'fetch_arrow_table', None))
+
+
+def rows_to_arrow_table(rows: List[Sequence[Any]], columns: List[str]) -> 'pyarrow.Table':
+    """Creates Arrow table from fetched rows column by column. Values of columns, which types cannot be inferred
+    (e.g. mixed integers and strings in SQLite), are converted to strings.
+
+    :param rows: list of fetched rows
+    :param columns: list of column names, may contain duplicates
+    :return: Arrow table
+    """
+    pa = import_pyarrow()
+    arrays = []
+    for values in zip(*rows) if rows else [[] for _ in columns]:
+        try:
+            arrays.append(pa.array(values))
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            arrays.append(pa.array([None if value is None else str(value) for value in values], pa.string()))
+    return pa.Table.from_arrays(arrays, names=columns)
+
+
+def fetch_arrow_table(cursor_result: CursorResult, force_result_fetching: bool = False) -> Optional['pyarrow.Table']:
+    """Fetches result as Arrow table when it returns rows. Drivers capable of Arrow fetch return
+    record batches directly, rows of other drivers are converted column by column.
+
+    :param cursor_result: CursorResult that is obtained from calling sqlalchemy execute method
+    :param force_result_fetching: If ``True``, will try to fetch rows from cursor result that is obtained
+            after executing query, even when the type of query does not imply returning any rows.
+    :return: (optional) If query selects any rows then Arrow table will be returned.
+    """
+    if not cursor_result.returns_rows and not force_result_fetching:
+        return None
+    if supports_arrow_fetch(cursor_result):
+        table = cursor_result.cursor.fetch_arrow_table()
+        cursor_result.close()
+        return table
+    return rows_to_arrow_table(cursor_result.fetchall(), list(cursor_result.keys()))
+
+
+def get_common_type(types: Iterable['pyarrow.DataType']) -> 'pyarrow.DataType':
+    """Finds type, which arrays of all types can be cast to. Null type is ignored, since arrays of nulls
+    can be cast to any type, types without common type are converted to strings.
+
+    :param types: Arrow types of arrays, e.g. of one column in batches of the same result
+    :return: Arrow type
+    """
+    pa = import_pyarrow()
+    types = list(dict.fromkeys(t for t in types if not pa.types.is_null(t)))
+    if not types:
+        return pa.null()
+    if len(types) == 1:
+        return types[0]
+    try:
+        schemas = [pa.schema([pa.field('0', t)]) for t in types]
+        return pa.unify_schemas(schemas, promote_options='permissive').field(0).type
+    except (pa.ArrowInvalid, pa.ArrowTypeError, NotImplementedError):
+        return pa.string()
+
+
+def concat_arrow_tables(tables: List['pyarrow.Table'], columns: List[str]) -> 'pyarrow.Table':
+    """Concatenates Arrow tables built from batches of the same result. Types of columns may differ between batches
+    built from rows (e.g. a batch of nulls only), they are promoted to common types, or to strings when
+    there is no common type.
+
+    :param tables: list of Arrow tables
+    :param columns: list of column names, used when there are no tables
+    :return: Arrow table
+    """
+    pa = import_pyarrow()
+    if not tables:
+        return rows_to_arrow_table([], columns)
+    types = [get_common_type(t.schema.types[i] for t in tables) for i in range(tables[0].num_columns)]
+    tables = [
+        t if t.schema.types == types else pa.Table.from_arrays(
+            [t.column(i).cast(types[i]) for i in range(t.num_columns)],
+            names=t.column_names,
+        )
+        for t in tables
+    ]
+    return pa.concat_tables(tables, promote_options='permissive')
+
+
+def iter_arrow_batches(cursor_result: CursorResult, max_bytes: int) -> Iterator['pyarrow.Table']:
+    """Fetches result as Arrow tables by batches. Batches are record batches of drivers capable of Arrow fetch,
+    or rows fetched by ``fetchmany``, which number is adapted by the number of bytes per row fetched so far:
+    batches fill the remaining budget, and once it is exhausted, each batch takes about the whole budget.
+    Cursor result is closed when batches are exhausted or the iterator is closed.
+
+    :param cursor_result: CursorResult that is obtained from calling sqlalchemy execute method
+    :param max_bytes: budget of Arrow buffers size in bytes
+    :return: iterator of Arrow tables
+    """
+    pa = import_pyarrow()
+    columns = list(cursor_result.keys())
+    reader = None
+    if callable(getattr(cursor_result.cursor, 'fetch_record_batch', None)):
+        reader = cursor_result.cursor.fetch_record_batch()
+    fetched_bytes, fetched_rows = 0, 0
+    batch_rows = INITIAL_BATCH_ROWS
+    try:
+        while True:
+            if reader is not None:
+                try:
+                    batch = pa.Table.from_batches([reader.read_next_batch()])
+                except StopIteration:
+                    break
+            else:
+                rows = cursor_result.fetchmany(batch_rows)
+                if not rows:
+                    break
+                batch = rows_to_arrow_table(rows, columns)
+            if batch.num_rows == 0:
+                continue
+            yield batch
+            fetched_bytes += batch.nbytes
+            fetched_rows += batch.num_rows
+            remaining_bytes = max_bytes - fetched_bytes if fetched_bytes < max_bytes else max_bytes
+            # one more row is requested when the budget is nearly reached, to find out whether it is exceeded
+            batch_rows = int(remaining_bytes // max(fetched_bytes / fetched_rows, 1)) + 1
+            batch_rows = min(batch_rows, MAX_BATCH_ROWS)
+    finally:
+        cursor_result.close()
+
+
+def _pop_batches(tables: List['pyarrow.Table']) -> Iterator['pyarrow.Table']:
+    """Yields tables in order, removing them from the list, so that each one is released once it is consumed"""
+    tables.reverse()
+    while tables:
+        yield tables.pop()
+
+
+def fetch_arrow_table_within_budget(
+        cursor_result: CursorResult,
+        max_bytes: int,
+        force_result_fetching: bool = False,
+) -> Optional[Tuple['pyarrow.Table', Optional[Iterator['pyarrow.Table']]]]:
+    """Fetches result as Arrow table by batches (see :func:`iter_arrow_batches`), until size of fetched column
+    arrays reaches max_bytes. Rows of the batch, that exceeds the budget, are taken only as many as fit in it.
+    Remaining rows are not fetched, unless iterator of all batches, which is returned along with truncated table,
+    is consumed (e.g. to spill the whole result to disk). Otherwise, cursor result should be closed.
+    Batches already fetched are released by the iterator as they are consumed, so the truncated table
+    should be released before consuming it, to hold no more than about max_bytes in memory.
+
+    :param cursor_result: CursorResult that is obtained from calling sqlalchemy execute method
+    :param max_bytes: budget of Arrow buffers size in bytes
+    :param force_result_fetching: If ``True``, will try to fetch rows from cursor result that is obtained
+            after executing query, even when the type of query does not imply returning any rows.
+    :return: (optional) If query selects any rows then Arrow table will be returned, along with
+        iterator of all batches of the result (including the fetched ones), when the table was truncated.
+    """
+    if not cursor_result.returns_rows and not force_result_fetching:
+        return None
+    columns = list(cursor_result.keys())
+    batches = iter_arrow_batches(cursor_result, max_bytes)
+    tables, fetched_bytes = [], 0
+    for batch in batches:
+        if fetched_bytes + batch.nbytes > max_bytes:
+            fitting_rows = int((max_bytes - fetched_bytes) // (batch.nbytes / batch.num_rows))
+            table = concat_arrow_tables(tables + [batch.slice(0, fitting_rows)], columns)
+            return table, itertools.chain(_pop_batches(tables), [batch], batches)
+        tables.append(batch)
+        fetched_bytes += batch.nbytes
+    return concat_arrow_tables(tables, columns), None
+
+
+def arrow_table_to_df(table: 'pyarrow.Table', dtype_backend: str = 'pyarrow') -> pd.DataFrame:
+    """Converts Arrow table to pandas DataFrame.
+
+    :param table: Arrow table
+    :param dtype_backend: 'pyarrow' to keep Arrow buffers as columns of ``pd.ArrowDtype`` without copying,
+        or 'numpy' to convert them to NumPy-backed columns
+    :return: pandas DataFrame
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(f'Argument dtype_backend should be one of {DTYPE_BACKENDS}, got {dtype_backend}')
+    if dtype_backend == 'pyarrow':
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+    return table.to_pandas()
+
+
+def serialize_arrow_array(array: Union['pyarrow.Array', 'pyarrow.ChunkedArray']) -> bytes:
+    """Serializes Arrow array to Arrow IPC stream, buffers are compressed when zstd is available"""
+    pa = import_pyarrow()
+    if isinstance(array, pa.ChunkedArray):
+        # the same values are always serialized the same way, regardless of how they were split into batches
+        array = array.combine_chunks()
+    table = pa.Table.from_arrays([array], names=['0'])
+    compression = 'zstd' if pa.Codec.is_available('zstd') else None
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression=compression)) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def deserialize_arrow_array(data: bytes) -> 'pyarrow.ChunkedArray':
+    """Converts Arrow IPC stream back to Arrow array"""
+    pa = import_pyarrow()
+    with pa.ipc.open_stream(data) as reader:
+        return reader.read_all().column(0)
@@ -0,0 +1,94 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor, Future, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class CyclicDependencyException(Exception):
+    """Raised when dependency graph contains a cycle"""
+    def __init__(self, keys: List[Hashable]):
+        self.keys = keys
+        super().__init__(f'Cyclic dependency found among {keys}')
+
+
+class DependencyGraph:
+    """Directed acyclic graph of items, where an item is processed only after all items it depends on.
+    Items are identified by hashable keys, dependencies on keys not added to the graph are ignored.
+    """
+    def __init__(self):
+        self._items: Dict[Hashable, Any] = {}
+        self._dependencies: Dict[Hashable, Set[Hashable]] = {}
+
+    def add(self, key: Hashable, item: Any = None, depends_on: Iterable[Hashable] = ()) -> 'DependencyGraph':
+        """Adds item to graph.
+
+        :param key: key identifying item
+        :param item: (optional) item itself, key is used when not specified
+        :param depends_on: keys of items, which should be processed before this one
+        :return: self
+        """
+        self._items[key] = key if item is None else item
+        self._dependencies.setdefault(key, set()).update(depends_on)
+        return self
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._items
+
+    def _get_dependencies(self) -> Dict[Hashable, Set[Hashable]]:
+        return {key: {d for d in dependencies if d in self._items and d != key}
+                for key, dependencies in self._dependencies.items()}
+
+    def topological_order(self) -> List[Any]:
+        """Returns items ordered so that each item goes after all items it depends on,
+        keeping the order items were added in where possible.
+        If graph contains a cycle, CyclicDependencyException is raised.
+        """
+        dependencies = self._get_dependencies()
+        ordered = []
+        done = set()
+        while len(done) < len(dependencies):
+            ready = [key for key, deps in dependencies.items() if key not in done and deps <= done]
+            if not ready:
+                raise CyclicDependencyException([key for key in dependencies if key not in done])
+            ordered.extend(ready)
+            done.update(ready)
+        return [self._items[key] for key in ordered]
+
+    def run(self, func: Callable[[Any], None], max_workers: int) -> None:
+        """Calls func for each item in a pool of threads, as soon as func has returned for all items it depends on.
+        If func raises an exception, no more items are scheduled, and the exception is raised
+        once running calls are finished.
+
+        :param func: callable, that takes item
+        :param max_workers: maximum number of concurrent calls
+        """
+        self.topological_order()  # checks graph for cycles
+        dependencies = self._get_dependencies()
+        done: Set[Hashable] = set()
+        scheduled: Set[Hashable] = set()
+        running: Dict[Future, Hashable] = {}
+        error: Optional[BaseException] = None
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='dependency_graph') as pool:
+            while True:
+                if error is None:
+                    for key, deps in dependencies.items():
+                        if key not in scheduled and deps <= done:
+                            scheduled.add(key)
+                            running[pool.submit(func, self._items[key])] = key
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    key = running.pop(future)
+                    exc = future.exception()
+                    if exc is None:
+                        done.add(key)
+                    elif error is None:
+                        logger.error(f'Processing of {key} failed: {exc}')
+                        error = exc
+        if error is not None:
+            raise error
@@ -1,30 +1,36 @@
 import inspect
-from datetime import datetime
+from datetime import timedelta
 import logging
 import functools
+import time
 
 logger = logging.getLogger(__name__)
 
 
 def time_logifier(method, class_):
-    """Counts duration of method execution"""
+    """Counts duration of method execution with monotonic clock.
+    Nothing is measured unless debug logging is enabled.
+    """
     @functools.wraps(method)
     def _logged_method(*args, **kwargs):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return method(*args, **kwargs)
         logger.debug(f'Started {method.__name__} of {class_.__name__}')
-        start = datetime.now()
+        start = time.perf_counter()
         result = method(*args, **kwargs)
-        finish = datetime.now()
-        finish = finish.replace(microsecond=start.microsecond)
-        logger.debug(f'Finished {method.__name__} of {class_.__name__}, duration = {finish - start}')
+        duration = timedelta(seconds=time.perf_counter() - start)
+        logger.debug(f'Finished {method.__name__} of {class_.__name__}, duration = {duration}')
         return result
 
+    @functools.wraps(method)
     async def _async_logged_method(*args, **kwargs):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return await method(*args, **kwargs)
         logger.debug(f'Started {method.__name__} of {class_.__name__}')
-        start = datetime.now()
+        start = time.perf_counter()
         result = await method(*args, **kwargs)
-        finish = datetime.now()
-        finish = finish.replace(microsecond=start.microsecond)
-        logger.debug(f'Finished {method.__name__} of {class_.__name__}, duration = {finish - start}')
+        duration = timedelta(seconds=time.perf_counter() - start)
+        logger.debug(f'Finished {method.__name__} of {class_.__name__}, duration = {duration}')
         return result
 
     if inspect.iscoroutinefunction(method):
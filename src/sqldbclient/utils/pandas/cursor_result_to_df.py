@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, List, Tuple, Any, Sequence
 
 import pandas as pd
 
@@ -11,6 +11,34 @@ except ImportError:
 from sqldbclient.utils.pandas.parse_dates import parse_dates
 
 
+def fetch_cursor_result(
+        cursor_result: CursorResult,
+        force_result_fetching: bool = False
+) -> Optional[Tuple[List[Sequence[Any]], List[str]]]:
+    """ Fetches rows and column names from cursor_result when it returns them.
+
+    :param cursor_result: CursorResult that is obtained from calling sqlalchemy execute method
+    :param force_result_fetching: If ``True``, will try to fetch rows from cursor result that is obtained
+            after executing query, even when the type of query does not imply returning any rows.
+    :return: (optional) If query selects any rows then a tuple of rows and column names will be returned.
+    """
+    if not cursor_result.returns_rows and not force_result_fetching:
+        return None
+    return cursor_result.fetchall(), list(cursor_result.keys())
+
+
+def rows_to_df(rows: List[Sequence[Any]], columns: List[str]) -> pd.DataFrame:
+    """ Creates pandas DataFrame from fetched rows and casts columns to pandas datetime when applicable.
+
+    :param rows: list of fetched rows
+    :param columns: list of column names
+    :return: pandas DataFrame
+    """
+    df = pd.DataFrame(rows, columns=columns)
+    df = parse_dates(df)
+    return df
+
+
 def cursor_result_to_df(cursor_result: CursorResult, force_result_fetching: bool = False) -> Optional[pd.DataFrame]:
     """ Fetches rows from cursor_result when it returns them,
     and creates pandas DataFrame.
@@ -20,8 +48,7 @@ def cursor_result_to_df(cursor_result: CursorResult, force_result_fetching: bool
             after executing query, even when the type of query does not imply returning any rows.
     :return: (optional) If query selects any rows then a pandas DataFrame will be returned.
     """
-    if not cursor_result.returns_rows and not force_result_fetching:
+    fetched = fetch_cursor_result(cursor_result, force_result_fetching)
+    if fetched is None:
         return None
-    df = pd.DataFrame(cursor_result.fetchall(), columns=list(cursor_result.keys()))
-    df = parse_dates(df)
-    return df
+    return rows_to_df(*fetched)
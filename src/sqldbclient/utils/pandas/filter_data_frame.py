@@ -0,0 +1,59 @@
+import operator
+from typing import Any, Hashable, List, Optional, Tuple
+
+import pandas as pd
+
+FILTER_OPERATORS = {
+    '==': operator.eq,
+    '!=': operator.ne,
+    '<': operator.lt,
+    '<=': operator.le,
+    '>': operator.gt,
+    '>=': operator.ge,
+    'in': lambda series, value: series.isin(value),
+    'not in': lambda series, value: ~series.isin(value),
+}
+
+Filters = List[Tuple[Hashable, str, Any]]
+
+
+def validate_filters(filters: Optional[Filters]) -> None:
+    """Raises ValueError if filters contain unknown operator"""
+    for column, op, value in filters or []:
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f'Filter operator should be one of {list(FILTER_OPERATORS)}, got {op}')
+
+
+def get_filter_mask(df: pd.DataFrame, filters: Filters) -> pd.Series:
+    """Evaluates filters combined with AND against pandas DataFrame.
+
+    :param df: pandas DataFrame
+    :param filters: list of (column, operator, value) tuples, e.g. ``[('a', '>', 1), ('b', 'in', ['x', 'y'])]``
+    :return: boolean mask of rows satisfying all filters
+    """
+    validate_filters(filters)
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        mask &= FILTER_OPERATORS[op](df[column], value)
+    return mask
+
+
+def select_from_data_frame(df: pd.DataFrame,
+                           columns: Optional[List[str]] = None,
+                           rows: Optional[slice] = None,
+                           filters: Optional[Filters] = None) -> pd.DataFrame:
+    """Selects rows by position, then rows satisfying filters, then columns from pandas DataFrame.
+
+    :param df: pandas DataFrame
+    :param columns: (optional) names of columns to select
+    :param rows: (optional) slice of row positions
+    :param filters: (optional) list of (column, operator, value) tuples combined with AND
+    :return: pandas DataFrame with reset index
+    """
+    if rows is not None:
+        df = df.iloc[rows]
+    if filters:
+        df = df[get_filter_mask(df, filters)]
+    if columns is not None:
+        df = df[columns]
+    return df.reset_index(drop=True)
@@ -0,0 +1,80 @@
+import pandas as pd
+import pytest
+
+from sqldbclient.dialects.sql_view_dialect.sql_view_dialect import sort_dependant_objects
+from sqldbclient.dialects.sql_view_dialect.view import ViewType
+from sqldbclient.dialects.postgresql.postgresql_view_dialect import load_views
+from sqldbclient.utils.dependency_graph import CyclicDependencyException
+
+
+def test_sort_dependant_objects():
+    # a <- b <- d, a <- c <- d, d <- e, x <- y is not reachable from a
+    edges = [
+        (('s', 'a'), ('s', 'b')),
+        (('s', 'a'), ('s', 'c')),
+        (('s', 'b'), ('s', 'd')),
+        (('s', 'c'), ('s', 'd')),
+        (('s', 'd'), ('t', 'e')),
+        (('s', 'x'), ('s', 'y')),
+    ]
+    assert sort_dependant_objects('a', 's', edges) == [('s', 'b'), ('s', 'c'), ('s', 'd'), ('t', 'e')]
+    # subtree is computed from the same edges without querying database again
+    assert sort_dependant_objects('c', 's', edges) == [('s', 'd'), ('t', 'e')]
+    assert sort_dependant_objects('e', 't', edges) == []
+
+
+def test_sort_dependant_objects_cycle():
+    edges = [
+        (('s', 'a'), ('s', 'b')),
+        (('s', 'b'), ('s', 'c')),
+        (('s', 'c'), ('s', 'b')),
+    ]
+    with pytest.raises(CyclicDependencyException):
+        sort_dependant_objects('a', 's', edges)
+
+
+class CatalogStub:
+    """Returns prepared catalog query results, recording executed queries"""
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, query: str, **kwargs) -> pd.DataFrame:
+        assert kwargs['dump_execution_info'] is False
+        self.queries.append(query)
+        if 'WITH RECURSIVE' in query:
+            return pd.DataFrame([
+                ('s', 'b', 's', 'a'),
+                ('s', 'c', 's', 'b'),
+                ('s', 'c', 's', 'a'),
+            ], columns=['dependent_schema', 'dependent_view', 'source_schema', 'source_table'])
+        if 'pg_get_viewdef' in query:
+            return pd.DataFrame([
+                (1, 's', 'a', 'm', 'owner', 'SELECT 1 AS id', 'table a', {'id': None}),
+                (2, 's', 'b', 'v', 'owner', 'SELECT id FROM s.a', None, {'id': 'id'}),
+                (3, 's', 'c', 'm', 'owner', 'SELECT * FROM s.a JOIN s.b USING (id)', None, {'id': None}),
+            ], columns=['oid', 'schema', 'name', 'kind', 'owner', 'definition', 'table_description',
+                        'col_descriptions'])
+        if 'grantee' in query:
+            return pd.DataFrame([
+                (1, 'owner', ['SELECT', 'UPDATE']),
+                (1, 'reader', ['SELECT']),
+                (3, 'owner', ['SELECT']),
+            ], columns=['oid', 'grantee', 'privileges'])
+        return pd.DataFrame([
+            (3, 's', 'c_idx', 'CREATE UNIQUE INDEX c_idx ON s.c USING btree (id)'),
+        ], columns=['oid', 'schema', 'name', 'definition'])
+
+
+def test_load_views():
+    catalog = CatalogStub()
+    views = load_views('a', 's', catalog)
+    assert len(catalog.queries) == 4
+    a, b, c = views[('s', 'a')], views[('s', 'b')], views[('s', 'c')]
+    assert a.view_type == ViewType.MATERIALIZED_VIEW and b.view_type == ViewType.REGULAR_VIEW
+    assert a.dependant_objects == [b, c]
+    # objects with several parents are created once
+    assert b.dependant_objects[0] is c
+    assert a.privileges == {'owner': ['SELECT', 'UPDATE'], 'reader': ['SELECT']}
+    assert b.privileges == {} and b.indexes == []
+    assert c.indexes[0]['name'] == 'c_idx'
+    assert a.table_description == 'table a'
@@ -0,0 +1,85 @@
+from dataclasses import replace
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from sqldbclient.dialects.postgresql import SqlViewFactory, SqlViewMaterializer, SqlViewMaterializerUtils
+from sqldbclient.dialects.sql_view_materializer import SqlScriptRecorder
+
+
+class SqlExecutorStub:
+    """Returns prepared catalog query results and history timings, failing on any other statement"""
+    history_enabled = True
+
+    def execute(self, query: str, **kwargs) -> pd.DataFrame:
+        assert kwargs['dump_execution_info'] is False
+        if 'WITH RECURSIVE' in query:
+            return pd.DataFrame([
+                ('s', 'b', 's', 'a'),
+                ('s', 'c', 's', 'b'),
+            ], columns=['dependent_schema', 'dependent_view', 'source_schema', 'source_table'])
+        if 'pg_total_relation_size' in query:
+            return pd.DataFrame([
+                ('s', 'a', 1000.0, 4000),
+                ('s', 'c', 500.0, 2000),
+            ], columns=['schema', 'name', 'reltuples', 'total_bytes'])
+        if 'pg_get_viewdef' in query:
+            return pd.DataFrame([
+                (1, 's', 'a', 'm', 'owner', 'SELECT 1 AS id', None, {'id': None}),
+                (2, 's', 'b', 'v', 'owner', 'SELECT id FROM s.a', None, {'id': None}),
+                (3, 's', 'c', 'm', 'owner', 'SELECT id FROM s.b', None, {'id': None}),
+            ], columns=['oid', 'schema', 'name', 'kind', 'owner', 'definition', 'table_description',
+                        'col_descriptions'])
+        if 'grantee' in query:
+            return pd.DataFrame([
+                (1, 'reader', ['SELECT']),
+                (2, 'reader', ['SELECT']),
+            ], columns=['oid', 'grantee', 'privileges'])
+        if 'pg_get_indexdef' in query:
+            return pd.DataFrame([
+                (1, 's', 'a_idx', 'CREATE UNIQUE INDEX a_idx ON s.a USING btree (id)'),
+            ], columns=['oid', 'schema', 'name', 'definition'])
+        raise AssertionError(f'Unexpected query: {query}')
+
+    def get_query_timings(self, query: str, engine_url: str, limit: int) -> pd.DataFrame:
+        rows = [('u1', pd.Timestamp('2024-01-02'), 3.0), ('u2', pd.Timestamp('2024-01-01'), 5.0)] \
+            if query == 'REFRESH MATERIALIZED VIEW "s"."a"' else []
+        return pd.DataFrame(rows, columns=['uuid', 'start_time', 'elapsed_seconds'])
+
+    engine = SimpleNamespace(url='postgresql://localhost/db', dialect=SimpleNamespace(name='postgresql'))
+
+
+def test_plan():
+    sql_executor = SqlExecutorStub()
+    view = SqlViewFactory('a', 's', sql_executor, use_cache=False).create()
+    materializer = SqlViewMaterializer(replace(view, definition='SELECT 2 AS id'), sql_executor, recreate_mode='swap')
+    plan = materializer.plan()
+    assert plan.objects_to_drop == ['"s"."c"', '"s"."b"', '"s"."a"']
+    assert plan.objects_to_create == ['"s"."a__swap"', '"s"."b"', '"s"."c"']
+    assert plan.objects_to_refresh == ['"s"."a__swap"', '"s"."c"']
+    assert plan.indexes_to_create == ['"a_idx__swap"']
+    assert plan.grants == ['GRANT SELECT ON "s"."a__swap" TO reader', 'GRANT SELECT ON "s"."b" TO reader']
+    # build and swap transactions
+    assert {statement.transaction for statement in plan.statements} == {1, 2}
+    assert plan.script.startswith('BEGIN;\nDROP MATERIALIZED VIEW IF EXISTS "s"."a__swap";\n'
+                                  'CREATE MATERIALIZED VIEW "s"."a__swap" AS\nSELECT 2 AS id\nWITH NO DATA;')
+    # median of previous refreshes, and estimate by size for objects never refreshed before
+    assert plan.estimates['estimated_seconds'].tolist() == [4.0, 2.0]
+    assert plan.estimated_seconds == 6.0
+
+
+def test_swap_drops_temporary_view_when_indexes_fail(monkeypatch):
+    def create_indexes_in_parallel(self, max_workers):
+        raise RuntimeError('index build failed')
+
+    monkeypatch.setattr(SqlViewMaterializerUtils, 'create_indexes_in_parallel', create_indexes_in_parallel)
+    sql_executor = SqlExecutorStub()
+    view = SqlViewFactory('a', 's', sql_executor, use_cache=False).create()
+    materializer = SqlViewMaterializer(replace(view, definition='SELECT 2 AS id'), sql_executor,
+                                       recreate_mode='swap', index_workers=2)
+    materializer.sql_executor = recorder = SqlScriptRecorder(sql_executor.engine)
+    with pytest.raises(RuntimeError):
+        materializer.materialize()
+    assert recorder.statements[-1].statement == 'DROP MATERIALIZED VIEW "s"."a__swap"'
+    assert not any(s.statement.startswith('DROP MATERIALIZED VIEW "s"."a"') for s in recorder.statements)
@@ -0,0 +1,103 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from sqldbclient.dialects.sql_view_dialect import View, ViewType
+from sqldbclient.dialects.sql_view_materializer import SqlViewMaterializerUtils
+from sqldbclient.dialects.postgresql.postgresql_view_dialect import PostgresqlViewDialect, is_unique_column_index, \
+    get_concurrent_index_definition
+
+PG_ENGINE_STUB = SimpleNamespace(url='postgresql://localhost/db', dialect=SimpleNamespace(name='postgresql'))
+
+
+def _index(definition: str) -> dict:
+    return dict(schema='s', name='mv_idx', definition=definition)
+
+
+def test_unique_index_detection():
+    assert is_unique_column_index(_index('CREATE UNIQUE INDEX mv_idx ON s.mv USING btree (id, name)'))
+    assert not is_unique_column_index(_index('CREATE INDEX mv_idx ON s.mv USING btree (id)'))
+    assert not is_unique_column_index(_index('CREATE UNIQUE INDEX mv_idx ON s.mv USING btree (lower(name))'))
+    assert not is_unique_column_index(_index('CREATE UNIQUE INDEX mv_idx ON s.mv USING btree (id) WHERE (id > 0)'))
+
+
+def test_temp_index():
+    temp_index = PostgresqlViewDialect().get_temp_index(
+        _index('CREATE UNIQUE INDEX mv_idx ON "s"."Mat View" USING btree (id)'), '"s"."Mat View__swap"')
+    assert temp_index == dict(
+        schema='s',
+        name='mv_idx__swap',
+        definition='CREATE UNIQUE INDEX "mv_idx__swap" ON "s"."Mat View__swap" USING btree (id)',
+    )
+
+
+def test_statements_batch():
+    view = View(
+        schema='s',
+        name='mv',
+        view_type=ViewType.MATERIALIZED_VIEW,
+        owner='owner',
+        definition=' SELECT 1 AS id;',
+        privileges={'owner': ['SELECT', 'UPDATE'], 'reader': ['SELECT'], 'analyst': ['SELECT']},
+        dependant_objects=[],
+        indexes=[_index('CREATE UNIQUE INDEX mv_idx ON s.mv USING btree (id)')],
+        table_description="Owner's view",
+        col_descriptions={'id': 'Row "id"', 'Name': None},
+    )
+    executed = []
+
+    class SqlExecutorStub:
+        engine = PG_ENGINE_STUB
+
+        def execute(self, query, **kwargs):
+            executed.append((query, kwargs))
+
+    utils = SqlViewMaterializerUtils(view, SqlExecutorStub())
+    assert utils.restore_statements() == [
+        'CREATE MATERIALIZED VIEW "s"."mv" AS\n SELECT 1 AS id\nWITH NO DATA',
+        'ALTER MATERIALIZED VIEW "s"."mv" OWNER TO owner',
+        'GRANT SELECT, UPDATE ON "s"."mv" TO owner',
+        'GRANT SELECT ON "s"."mv" TO reader, analyst',
+        'COMMENT ON MATERIALIZED VIEW "s"."mv" IS \'Owner\'\'s view\'',
+        'COMMENT ON COLUMN "s"."mv"."id" IS \'Row "id"\'',
+    ]
+    utils.restore()
+    utils.create_indexes()
+    utils.drop_indexes()
+    assert len(executed) == 3
+    assert executed[0] == (';\n'.join(utils.restore_statements()), dict(use_raw_query=True, add_limit=False))
+
+
+def test_concurrent_index_definition():
+    assert get_concurrent_index_definition(_index('CREATE UNIQUE INDEX mv_idx ON ONLY s.mv USING btree (id)')) == \
+        'CREATE UNIQUE INDEX CONCURRENTLY mv_idx ON ONLY s.mv USING btree (id)'
+
+
+def test_create_indexes_in_parallel():
+    view = View(
+        schema='s', name='mv', view_type=ViewType.MATERIALIZED_VIEW, owner='owner', definition='SELECT 1 AS id',
+        privileges={}, dependant_objects=[], table_description=None, col_descriptions={},
+        indexes=[_index(f'CREATE INDEX mv_idx{i} ON s.mv USING btree (id)') for i in range(4)],
+    )
+    barrier = threading.Barrier(2, timeout=5)
+    executed = []
+
+    class SqlExecutorStub:
+        engine = PG_ENGINE_STUB
+
+        def clone(self, autocommit=False):
+            assert autocommit
+            return self
+
+        def execute(self, query, **kwargs):
+            # fails unless two indexes are being built at the same time
+            barrier.wait()
+            executed.append(query)
+            if query.endswith('mv_idx3 ON s.mv USING btree (id)'):
+                raise ValueError('index build failed')
+
+    utils = SqlViewMaterializerUtils(view, SqlExecutorStub())
+    with pytest.raises(ValueError, match='index build failed'):
+        utils.create_indexes_in_parallel(max_workers=2, progress_interval=None)
+    assert sorted(executed) == [index['definition'] for index in view.indexes]
@@ -0,0 +1,70 @@
+from dataclasses import replace
+
+import pytest
+import sqlalchemy
+
+from sqldbclient.dialects import SqlViewFactory, SqlViewMaterializer
+from sqldbclient.dialects.sqlite.sqlite_view_dialect import get_view_definition, get_dependency_edges
+from sqldbclient.sql_executor import SqlExecutor
+
+
+@pytest.fixture
+def sql_executor():
+    engine = sqlalchemy.create_engine('sqlite://', poolclass=sqlalchemy.pool.StaticPool)
+    sql_executor = SqlExecutor(engine=engine, max_rows_read=100, history_db_name=None)
+    for query in [
+        'CREATE TABLE t (a INTEGER, b TEXT)',
+        "INSERT INTO t VALUES (1, 'x'), (2, 'y')",
+        'CREATE VIEW v1 AS SELECT a, b FROM t',
+        'CREATE VIEW "V 2" AS SELECT a FROM v1 WHERE a > 1',
+        'CREATE VIEW v3 AS SELECT v1.b FROM v1 JOIN "V 2" USING (a)',
+        'CREATE VIEW other AS SELECT b FROM t',
+    ]:
+        sql_executor.execute(query)
+    return sql_executor
+
+
+def test_dependency_edges():
+    assert get_view_definition('create view if not exists "a b" as\nselect 1;') == 'select 1'
+    edges = get_dependency_edges('main', {
+        'v1': 'SELECT a FROM t',
+        'V 2': 'SELECT a FROM V1',
+        'v3': 'SELECT v1.a FROM v1 JOIN [V 2] USING (a)',
+    })
+    assert sorted(edges) == [
+        (('main', 'V 2'), ('main', 'v3')),
+        (('main', 'v1'), ('main', 'V 2')),
+        (('main', 'v1'), ('main', 'v3')),
+    ]
+
+
+def test_view_factory_and_materializer(sql_executor):
+    view = SqlViewFactory('v1', 'main', sql_executor).create()
+    assert view.full_name == '"main"."v1"'
+    assert [obj.name for obj in view.dependant_objects] == ['V 2', 'v3']
+
+    view = replace(view, definition='SELECT a, b || b AS b FROM t')
+    materializer = SqlViewMaterializer(view, sql_executor)
+    plan = materializer.plan()
+    assert plan.objects_to_drop == ['"main"."v3"', '"main"."V 2"', '"main"."v1"']
+    assert plan.objects_to_create == ['"main"."v1"', '"main"."V 2"', '"main"."v3"']
+    assert plan.objects_to_refresh == []
+
+    materializer.materialize()
+    # dependant views are recreated and still work
+    df = sql_executor.execute('SELECT * FROM v3')
+    assert df['b'].tolist() == ['yy']
+    assert SqlViewFactory('v1', 'main', sql_executor, use_cache=False).create() == view
+
+
+def test_view_factory_ignores_byte_budget():
+    pytest.importorskip('pyarrow')
+    engine = sqlalchemy.create_engine('sqlite://', poolclass=sqlalchemy.pool.StaticPool)
+    sql_executor = SqlExecutor(engine=engine, max_rows_read=100, history_db_name=None, max_bytes_read=200)
+    sql_executor.execute('CREATE TABLE t (a INTEGER)')
+    sql_executor.execute('CREATE VIEW v0 AS SELECT a FROM t')
+    for i in range(1, 10):
+        sql_executor.execute(f'CREATE VIEW v{i} AS SELECT a FROM v{i - 1}')
+    # catalog is read as a whole, despite the budget of executor
+    view = SqlViewFactory('v0', 'main', sql_executor).create()
+    assert view.dependant_objects_number == 9
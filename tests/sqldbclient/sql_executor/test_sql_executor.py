@@ -1,9 +1,18 @@
 import sqlite3
+import json
 import os
 
+import pandas as pd
 import pytest
+import sqlalchemy
+from sqlalchemy.exc import OperationalError
 
-from sqldbclient.sql_executor import SqlExecutorConf, SqlExecutor
+from sqldbclient.sql_executor import SqlExecutorConf, SqlExecutor, SqlExecutorBuilder
+from sqldbclient.sql_query_explainer import SqlQueryExplainer
+from sqldbclient.sql_instrumentation import MetricsCollector, sql_event_hooks
+from sqldbclient.sql_history_manager import SqlHistoryManager
+from sqldbclient.sql_history_manager.sql_history_store import SqlHistoryStore
+from sqldbclient.sql_result_converter import SqlResultConverter, sql_result_converters
 
 TEST_SQLITE_DB_NAME = 'test_sqlite_tmp.db'
 TEST_HISTORY_DB_NAME = 'test_history_tmp.db'
@@ -17,6 +26,9 @@ def sql_executor():
         .set('engine_options', f'sqlite:///{TEST_SQLITE_DB_NAME}')
         .set('history_db_name', TEST_HISTORY_DB_NAME)
     ).get_or_create()
+    # builder and history stores keep created instances, while their databases are removed after each test
+    SqlExecutorBuilder._get_or_create_instance.cache_clear()
+    SqlHistoryStore.get_or_create.cache_clear()
     os.remove(TEST_SQLITE_DB_NAME)
     os.remove(TEST_HISTORY_DB_NAME)
 
@@ -30,3 +42,275 @@ def test_execute_and_transaction_management(sql_executor):
         sql_executor.commit()
     cnt_df = sql_executor.execute('SELECT count(*) AS cnt FROM t')
     assert cnt_df.cnt.iloc[0] == 1
+
+
+def test_transaction_replay_after_transient_error(sql_executor):
+    sql_executor.execute('CREATE TABLE t (c INTEGER)')
+    attempts = []
+
+    def insert_row():
+        attempts.append(1)
+        sql_executor.execute('INSERT INTO t VALUES (1)')
+        if len(attempts) == 1:
+            raise OperationalError('INSERT INTO t VALUES (1)', {}, sqlite3.OperationalError('database is locked'))
+
+    sql_executor.run_in_transaction(insert_row)
+    assert len(attempts) == 2
+    assert sql_executor.execute('SELECT count(*) AS cnt FROM t').cnt.iloc[0] == 1
+    assert sql_executor.history['retries'].tolist() == [0, 0, 1, 0]
+
+
+def test_execution_metrics_are_recorded(sql_executor):
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    sql_executor.execute("INSERT INTO t VALUES (1, 'x'), (2, 'y'), (3, 'z')")
+    sql_executor.execute('SELECT * FROM t')
+    create_info, insert_info, select_info = sql_executor.history.itertuples()
+    assert insert_info.rows_count == 3
+    assert (select_info.rows_count, select_info.columns_count) == (3, 2)
+    assert select_info.result_bytes > 0
+    assert select_info.dump_seconds > 0
+    phases = ['checkout_seconds', 'prepare_seconds', 'execution_seconds', 'fetch_seconds', 'conversion_seconds']
+    assert select_info.elapsed_seconds == pytest.approx(sum(getattr(select_info, p) for p in phases))
+
+
+def test_explain_plan_fingerprint_follows_plan_shape(sql_executor):
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    sql_executor.execute('CREATE INDEX t_a_idx ON t (a)')
+    query = 'SELECT * FROM t WHERE a = 1'
+    index_plan = sql_executor.explain(query)
+    assert 't_a_idx' in json.loads(index_plan)[0]['detail']
+    sql_executor.execute('DROP INDEX t_a_idx')
+    scan_plan = sql_executor.explain(query)
+    assert SqlQueryExplainer.fingerprint(index_plan) != SqlQueryExplainer.fingerprint(scan_plan)
+    assert SqlQueryExplainer.fingerprint(scan_plan) == SqlQueryExplainer.fingerprint(sql_executor.explain(query))
+
+
+def test_text_plan_fingerprint_keeps_digits_of_identifiers():
+    plan = 'Index Scan using idx_t1 on orders_2023  (cost=0.29..8.31 rows=1 width={})\n  Index Cond: (id = 42)'
+    fingerprint = SqlQueryExplainer.fingerprint(plan.format(4), 'text')
+    assert fingerprint == SqlQueryExplainer.fingerprint(plan.format(8).replace('42', '7'), 'text')
+    assert fingerprint != SqlQueryExplainer.fingerprint(plan.format(4).replace('idx_t1', 'idx_t2'), 'text')
+    assert fingerprint != SqlQueryExplainer.fingerprint(plan.format(4).replace('orders_2023', 'orders_2024'), 'text')
+
+
+def test_workload_report_groups_queries_by_fingerprint(sql_executor):
+    sql_executor.execute('CREATE TABLE t (a INTEGER)')
+    for i in range(10):
+        sql_executor.execute(f'INSERT INTO t VALUES ({i})')
+    for i in range(4):
+        sql_executor.execute(f'select * from t where a > {i}')
+    report = sql_executor.workload_report(order_by='calls').set_index('query_type')
+    assert report.loc['INSERT', 'calls'] == 10
+    assert report.loc['INSERT', 'total_rows'] == 10
+    assert report.loc['SELECT', 'calls'] == 4
+    assert report.loc['SELECT', 'total_rows'] == 9 + 8 + 7 + 6
+    select_stats = report.loc['SELECT']
+    assert select_stats.p50_seconds <= select_stats.p95_seconds <= select_stats.p99_seconds == select_stats.max_seconds
+    timings = sql_executor.get_query_timings('insert into t values (100)', limit=3)
+    assert len(timings) == 3 and timings.start_time.is_monotonic_decreasing
+    assert sql_executor.get_query_timings('SELECT 1', engine_url='sqlite://').empty
+
+
+def test_metrics_collector_hooks(sql_executor):
+    metrics_collector = MetricsCollector().install(sql_event_hooks)
+    try:
+        sql_executor.execute('CREATE TABLE t (c INTEGER)')
+        with sql_executor:
+            sql_executor.execute('INSERT INTO t VALUES (1)')
+            sql_executor.commit()
+        sql_executor.execute('SELECT * FROM t')
+    finally:
+        metrics_collector.uninstall(sql_event_hooks)
+    sql_executor.execute('SELECT * FROM t')
+    assert metrics_collector.queries.get(query_type='SELECT', status='success') == 1
+    assert metrics_collector.fetched_rows.get() == 1
+    assert metrics_collector.transaction_duration.get_count(outcome='commit') == 1
+    assert 'sqldbclient_query_duration_seconds_count{query_type="INSERT"} 1' in metrics_collector.registry.render()
+
+
+def test_shared_history_and_no_history_mode(sql_executor):
+    conf = SqlExecutorConf().set('engine_options', f'sqlite:///./{TEST_SQLITE_DB_NAME}')
+    other_executor = SqlExecutor.builder.config(conf.set('history_db_name', TEST_HISTORY_DB_NAME)).get_or_create()
+    sql_executor.execute('SELECT 1 AS a')
+    other_executor.execute('SELECT 2 AS a')
+    assert sql_executor.history['engine_url'].tolist() == [
+        f'sqlite:///{TEST_SQLITE_DB_NAME}',
+        f'sqlite:///./{TEST_SQLITE_DB_NAME}',
+    ]
+
+    no_history_executor = SqlExecutor.builder.config(conf.set('history_db_name', None)).get_or_create()
+    assert no_history_executor.execute('SELECT 3 AS a').a.iloc[0] == 3
+    assert not no_history_executor.history_enabled
+    with pytest.raises(ValueError):
+        no_history_executor.history
+    assert len(sql_executor.history) == 2
+
+
+def test_clone_shares_history_but_not_transaction(sql_executor):
+    sql_executor.execute('CREATE TABLE t (c INTEGER)')
+    cloned_executor = sql_executor.clone()
+    with sql_executor:
+        sql_executor.execute('INSERT INTO t VALUES (1)')
+        # sqlite locks the database for writers, but readers see committed data only
+        assert cloned_executor.execute('SELECT count(*) AS cnt FROM t').cnt.iloc[0] == 0
+        sql_executor.commit()
+    assert len(cloned_executor.history) == 3
+    autocommit_executor = sql_executor.clone(autocommit=True)
+    autocommit_executor.execute('INSERT INTO t VALUES (2)')
+    assert sql_executor.execute('SELECT count(*) AS cnt FROM t').cnt.iloc[0] == 2
+
+
+class ArrowCursor(sqlite3.Cursor):
+    """Cursor of a driver capable of Arrow fetch"""
+    fetched_tables = []
+
+    def fetch_arrow_table(self):
+        import pyarrow
+
+        columns = [d[0] for d in self.description]
+        table = pyarrow.Table.from_pylist([dict(zip(columns, row)) for row in self.fetchall()])
+        self.fetched_tables.append(table)
+        return table
+
+
+class ArrowConnection(sqlite3.Connection):
+    def cursor(self, factory=ArrowCursor):
+        return super().cursor(factory)
+
+
+def test_arrow_output(sql_executor):
+    pyarrow = pytest.importorskip('pyarrow')
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    sql_executor.execute("INSERT INTO t VALUES (1, 'x'), (2, NULL), (3, '')")
+    table = sql_executor.execute('SELECT * FROM t', output='arrow')
+    assert isinstance(table, pyarrow.Table)
+    assert table.column('b').to_pylist() == ['x', None, '']
+    df = sql_executor.execute('SELECT a FROM t WHERE a > 1', dtype_backend='pyarrow')
+    assert str(df.dtypes['a']) == 'int64[pyarrow]'
+
+    # stored Arrow buffers are read back as Arrow-backed columns
+    uuid = sql_executor.history.uuid.iloc[-2]
+    sql_executor._cached_query_results.clear()
+    stored = sql_executor.get_result(uuid)
+    assert pyarrow.Table.from_pandas(stored).equals(table)
+    assert sql_executor.get_result(uuid, columns=['b'], filters=[('a', '>', 1)]).b.isna().tolist() == [True, False]
+    with pytest.raises(ValueError):
+        sql_executor.execute('SELECT * FROM t', output='csv')
+
+    engine = sqlalchemy.create_engine(
+        f'sqlite:///{TEST_SQLITE_DB_NAME}',
+        connect_args={'factory': ArrowConnection},
+        poolclass=sqlalchemy.pool.StaticPool,
+    )
+    arrow_executor = SqlExecutor(engine=engine, max_rows_read=100, history_db_name=TEST_HISTORY_DB_NAME)
+    assert arrow_executor.execute('SELECT * FROM t', output='arrow') is ArrowCursor.fetched_tables[-1]
+
+
+def test_result_outputs(sql_executor):
+    polars = pytest.importorskip('polars')
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    sql_executor.execute("INSERT INTO t VALUES (1, 'x'), (2, NULL), (3, 'z')")
+    records = sql_executor.execute('SELECT * FROM t', output='records')
+    assert records == [{'a': 1, 'b': 'x'}, {'a': 2, 'b': None}, {'a': 3, 'b': 'z'}]
+    polars_df = sql_executor.execute('SELECT * FROM t', output='polars')
+    assert isinstance(polars_df, polars.DataFrame)
+    assert polars_df['a'].to_list() == [1, 2, 3]
+    with pytest.raises(ValueError):
+        sql_executor.execute('SELECT * FROM t', output='polars', dtype_backend='pyarrow')
+
+    # stored results are read in any output type, either stored as csv (records) or Arrow (polars)
+    sql_executor._cached_query_results.clear()
+    records_uuid, polars_uuid = sql_executor.history.uuid.iloc[-2:]
+    assert sql_executor.get_result(records_uuid, output='records') == records
+    assert sql_executor.get_result(polars_uuid, output='polars').equals(polars_df)
+    assert sql_executor.get_result(polars_uuid, columns=['b'], rows=slice(None, None, -2), output='records') == \
+        [{'b': 'z'}, {'b': 'x'}]
+    assert sql_executor.get_result(records_uuid, rows=slice(1, 1), output='arrow').num_rows == 0
+    assert sql_executor.get_result(records_uuid, filters=[('a', '>', 2)], output='records') == [{'a': 3, 'b': 'z'}]
+
+    sql_result_converters.register(SqlResultConverter('count', from_arrow=lambda table: table.num_rows))
+    try:
+        assert sql_executor.execute('SELECT * FROM t', output='count') == 3
+    finally:
+        sql_result_converters.unregister('count')
+
+
+def test_byte_budget(sql_executor):
+    pytest.importorskip('pyarrow')
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    with sql_executor.engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO t VALUES (?, ?)', [(i, 'x' * 100) for i in range(5000)])
+    # LIMIT is not added, rows are fetched until about 100 KB of columns
+    df = sql_executor.execute('SELECT * FROM t', max_bytes_read=100_000)
+    info = sql_executor.get_execution_info(sql_executor.history.uuid.iloc[-1])
+    assert 'LIMIT' not in info.query
+    assert info.truncated
+    assert 0 < len(df) < 5000 and info.result_bytes <= 100_000
+    assert df.a.tolist() == list(range(len(df)))
+
+    df = sql_executor.execute('SELECT a FROM t', max_bytes_read=10 ** 6, output='records')
+    assert len(df) == 5000
+    assert not sql_executor.history.truncated.iloc[-1]
+    with pytest.raises(ValueError):
+        sql_executor.execute('SELECT a FROM t', max_bytes_read=0)
+    with pytest.raises(ValueError):
+        sql_executor.execute('SELECT a FROM t', max_bytes_read=1000, limit_bytes=False)
+
+
+def test_byte_budget_is_applied_to_select_only(sql_executor):
+    pytest.importorskip('pyarrow')
+    stream_results = {}
+    sqlalchemy.event.listen(
+        sql_executor.engine, 'before_cursor_execute',
+        lambda conn, cursor, statement, parameters, context, executemany:
+        stream_results.setdefault(statement, context.execution_options.get('stream_results', False)),
+    )
+    sql_executor.execute('CREATE TABLE t (a INTEGER)', max_bytes_read=1000)
+    sql_executor.execute('INSERT INTO t VALUES (1)', use_raw_query=True, add_limit=False, max_bytes_read=1000)
+    assert sql_executor.execute('SELECT a FROM t', max_bytes_read=1000).a.tolist() == [1]
+    # server-side cursor is used for SELECT query only
+    assert list(stream_results.values()) == [False, False, True]
+    assert sql_executor.history.rows_count.iloc[-2] == 1
+
+
+def test_spill_to_history(sql_executor):
+    pytest.importorskip('pyarrow')
+    sql_executor.execute('CREATE TABLE t (a INTEGER, b TEXT)')
+    with sql_executor.engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO t VALUES (?, ?)',
+                                   [(i, 'x' * 100 if i >= 3000 else None) for i in range(5000)])
+    handle = sql_executor.execute('SELECT * FROM t', max_bytes_read=20_000, spill=True)
+    info = sql_executor.get_execution_info(handle.uuid)
+    assert info.spilled and not info.truncated and info.rows_count == 5000
+    assert len(handle) == 5000 and handle.columns == ['a', 'b']
+    assert handle.head(3).a.tolist() == [0, 1, 2]
+
+    chunks = list(handle['a'].iter_chunks())
+    assert len(chunks) > 1 and all(list(chunk.columns) == ['a'] for chunk in chunks)
+    assert pd.concat(chunks).a.tolist() == list(range(5000))
+    # groups of nulls only and groups of strings are read as one column
+    df = handle.to_pandas()
+    assert df.b.isna().sum() == 3000 and df.b.iloc[-1] == 'x' * 100
+    assert sql_executor.get_result_handle(handle.uuid).to('arrow').num_rows == 5000
+
+    df = sql_executor.execute('SELECT a FROM t WHERE a < 10', max_bytes_read=20_000, spill=True)
+    assert isinstance(df, pd.DataFrame) and len(df) == 10
+    with pytest.raises(ValueError):
+        sql_executor.execute('SELECT a FROM t', spill=True)
+
+
+def test_spilled_result_is_deleted_when_dump_fails(sql_executor, monkeypatch):
+    pytest.importorskip('pyarrow')
+    sql_executor.execute('CREATE TABLE t (a INTEGER)')
+    with sql_executor.engine.begin() as connection:
+        connection.exec_driver_sql('INSERT INTO t VALUES (?)', [(i,) for i in range(5000)])
+
+    def failing_dump(*args, **kwargs):
+        raise RuntimeError('dump failed')
+
+    monkeypatch.setattr(SqlHistoryManager, 'dump', failing_dump)
+    with pytest.raises(RuntimeError):
+        sql_executor.execute('SELECT * FROM t', max_bytes_read=20_000, spill=True)
+    with sqlalchemy.create_engine(f'sqlite:///{TEST_HISTORY_DB_NAME}').connect() as connection:
+        assert connection.exec_driver_sql('SELECT count(*) FROM executed_sql_query_payload').scalar() == 0
+        assert connection.exec_driver_sql('SELECT count(*) FROM executed_sql_query_chunk').scalar() == 0
@@ -0,0 +1,157 @@
+from dataclasses import asdict
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from sqldbclient.sql_history_manager import SqlHistoryManager
+from sqldbclient.sql_history_manager.orm_config import metadata
+from sqldbclient.sql_history_manager.tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery
+from sqldbclient.sql_history_manager.tables.executed_sql_query_payload.executed_sql_query_payload \
+    import ExecutedSqlQueryPayload, add_payload_references
+from sqldbclient.sql_history_manager.tables.executed_sql_query_chunk.executed_sql_query_chunk import read_chunks, \
+    executed_sql_query_chunk
+from sqldbclient.sql_history_manager.tables.executed_sql_query_result.custom_sqlalchemy_types.data_frame \
+    import DataFrame
+
+
+def test_data_frame_storage_depends_on_dialect():
+    df = pd.DataFrame({'a': [1, 2], 'b': ['x', 'y']})
+    data_frame_type = DataFrame()
+    assert isinstance(data_frame_type.process_bind_param(df, sqlite.dialect()), str)
+    value = data_frame_type.process_bind_param(df, postgresql.dialect())
+    assert isinstance(value, bytes)
+    assert data_frame_type.load_dialect_impl(postgresql.dialect()).compile(dialect=postgresql.dialect()) == 'BYTEA'
+    pd.testing.assert_frame_equal(data_frame_type.process_result_value(memoryview(value), postgresql.dialect()), df)
+
+
+def test_copy_history_to_url(tmp_path):
+    source = SqlHistoryManager(str(tmp_path / 'local_history.db'))
+    now = datetime.now()
+    executed_queries = [ExecutedSqlQuery(query=f'SELECT {i} AS a', start_time=now, finish_time=now) for i in range(3)]
+    for i, executed_query in enumerate(executed_queries):
+        source.dump(executed_query, pd.DataFrame({'a': [i]}))
+
+    target_url = f'sqlite:///{tmp_path / "shared_history.db"}'
+    assert source.copy_history(target_url, batch_size=2) == 3
+    assert source.copy_history(target_url) == 0
+
+    target = SqlHistoryManager(target_url)
+    assert len(target.history) == 3
+    assert target.get_result(executed_queries[2].uuid).a.tolist() == [2]
+
+
+def test_identical_results_are_stored_once(tmp_path):
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    now = datetime.now()
+    executed_queries = [ExecutedSqlQuery(query='SELECT 1 AS a', start_time=now, finish_time=now) for _ in range(3)]
+    for executed_query in executed_queries:
+        history_manager.dump(executed_query, pd.DataFrame({'a': [1]}))
+    session = history_manager._history_db_session
+    payloads = session.query(ExecutedSqlQueryPayload).all()
+    assert [p.refcount for p in payloads] == [3]
+
+    history_manager.delete_results(with_uuids=[executed_queries[0].uuid])
+    session.refresh(payloads[0])
+    assert payloads[0].refcount == 2
+    assert history_manager.get_result(executed_queries[1].uuid, reload=True).a.tolist() == [1]
+
+    history_manager.delete_results(with_uuids=[q.uuid for q in executed_queries[1:]])
+    assert session.query(ExecutedSqlQueryPayload).count() == 0
+
+
+def test_partial_read_of_chunked_result():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    df = pd.DataFrame({'a': range(10), 'b': [f'x{i}' for i in range(10)], 'c': [i / 2 for i in range(10)]})
+    payload, chunks = ExecutedSqlQueryPayload.from_data_frame(df, row_group_size=3)
+    assert len(chunks) == 3 * 4
+    with engine.begin() as connection:
+        add_payload_references(connection, asdict(payload), chunks)
+        pd.testing.assert_frame_equal(read_chunks(connection, payload), df)
+        pd.testing.assert_frame_equal(
+            read_chunks(connection, payload, columns=['c', 'a'], rows=slice(2, 8), filters=[('b', '!=', 'x5')]),
+            df.iloc[2:8].query("b != 'x5'")[['c', 'a']].reset_index(drop=True),
+        )
+        assert read_chunks(connection, payload, rows=slice(None, None, -4)).a.tolist() == [9, 5, 1]
+        assert read_chunks(connection, payload, filters=[('a', '>', 100)]).shape == (0, 3)
+
+
+def test_arrow_chunks_are_stored_as_bytes():
+    engine = create_engine('sqlite://')
+    metadata.create_all(engine)
+    df = pd.DataFrame({'a': pd.array([1, None, 3], dtype='int64[pyarrow]'), 'b': [1.5, 2.5, 3.5]})
+    payload, chunks = ExecutedSqlQueryPayload.from_data_frame(df)
+    assert isinstance(chunks[0]['binary_data'], bytes) and chunks[0]['data'] is None
+    assert isinstance(chunks[1]['data'], str) and chunks[1]['binary_data'] is None
+    with engine.begin() as connection:
+        add_payload_references(connection, asdict(payload), chunks)
+        pd.testing.assert_frame_equal(read_chunks(connection, payload), df)
+
+
+def test_spilled_row_groups_are_committed_while_fetching(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    reader = create_engine(f'sqlite:///{tmp_path / "history.db"}')
+    batch = pa.table({'a': list(range(100))})
+    committed_chunks = []
+
+    def batches():
+        for _ in range(5):
+            yield batch
+            with reader.connect() as connection:
+                committed_chunks.append(connection.execute(
+                    select(func.count()).select_from(executed_sql_query_chunk)).scalar())
+        raise RuntimeError('fetch failed')
+
+    with pytest.raises(RuntimeError):
+        history_manager.spill(batches(), max_bytes=batch.nbytes)
+    # groups are visible to other connections as soon as they are written
+    assert committed_chunks == [1, 2, 3, 4, 5]
+    with reader.connect() as connection:
+        assert connection.execute(select(func.count()).select_from(executed_sql_query_chunk)).scalar() == 0
+    assert history_manager._history_db_session.query(ExecutedSqlQueryPayload).count() == 0
+
+
+def test_results_deleted_while_spilling_keep_spilled_result(tmp_path):
+    pa = pytest.importorskip('pyarrow')
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    other_manager = SqlHistoryManager(f'sqlite:///{tmp_path / "history.db"}')
+    batch = pa.table({'a': list(range(100))})
+
+    def batches():
+        for _ in range(3):
+            yield batch
+            executed_query = ExecutedSqlQuery(query='SELECT 1 AS b', start_time=datetime.now(),
+                                              finish_time=datetime.now())
+            other_manager.dump(executed_query, pd.DataFrame({'b': [1]}))
+            other_manager.delete_results(with_uuids=[executed_query.uuid])
+
+    payload = history_manager.spill(batches(), max_bytes=batch.nbytes)
+    assert history_manager._history_db_session.query(ExecutedSqlQueryPayload).filter_by(
+        payload_hash=payload.payload_hash).one().refcount is None
+    executed_query = ExecutedSqlQuery(query='SELECT a FROM t', start_time=datetime.now(), finish_time=datetime.now())
+    history_manager.dump(executed_query, payload)
+    assert history_manager.get_result(executed_query.uuid, reload=True).a.tolist() == list(range(100)) * 3
+    history_manager._history_db_session.expire_all()
+    assert history_manager._history_db_session.query(ExecutedSqlQueryPayload).one().refcount == 1
+
+    # spilled result is referred to once, it is not found when dumped again
+    with pytest.raises(ValueError):
+        history_manager.dump(ExecutedSqlQuery(query='SELECT a FROM t', start_time=datetime.now(),
+                                              finish_time=datetime.now()), payload)
+    history_manager.discard_spill(payload)
+    assert len(history_manager.get_result(executed_query.uuid, reload=True)) == 300
+
+
+def test_dump_writes_execution_info_once(tmp_path):
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    statements = []
+    event.listen(history_manager._history_db_session.bind, 'before_cursor_execute',
+                 lambda conn, cursor, statement, *args: statements.append(statement))
+    executed_query = ExecutedSqlQuery(query='SELECT 1 AS a', start_time=datetime.now(), finish_time=datetime.now())
+    history_manager.dump(executed_query, pd.DataFrame({'a': [1]}))
+    assert not [s for s in statements if s.startswith('UPDATE executed_sql_query ')]
+    assert history_manager.get_execution_info(executed_query.uuid).dump_seconds > 0
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+
+from sqldbclient.sql_history_manager import SqlHistoryManager
+from sqldbclient.sql_history_manager.tables.executed_sql_query.executed_sql_query import ExecutedSqlQuery
+from sqldbclient.sql_local_query_engine import SqlLocalQueryEngine
+
+pytest.importorskip('duckdb')
+pytest.importorskip('pyarrow')
+
+
+def _dump(history_manager: SqlHistoryManager, df: pd.DataFrame) -> str:
+    now = datetime.now()
+    executed_query = ExecutedSqlQuery(query='SELECT 1', start_time=now, finish_time=now)
+    history_manager.dump(executed_query, df)
+    return executed_query.uuid
+
+
+def test_join_of_stored_results(tmp_path):
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    orders_uuid = _dump(history_manager, pd.DataFrame({'customer_id': [1, 1, 2], 'amount': [10, 20, 5],
+                                                       'comment': ['a', 'b', 'c']}))
+    customers_uuid = _dump(history_manager, pd.DataFrame({'customer_id': [1, 2], 'name': ['x', 'y']}))
+    history_manager._cached_query_results.clear()
+
+    local_engine = SqlLocalQueryEngine(history_manager).register(orders_uuid, alias='orders')
+    result = local_engine.execute(f'''
+        SELECT c.name, sum(o.amount) AS amount
+        FROM orders o JOIN "{customers_uuid}" c USING (customer_id)
+        GROUP BY 1 ORDER BY 1
+    ''')
+    assert result.to_dict('list') == {'name': ['x', 'y'], 'amount': [30, 5]}
+    assert local_engine.tables == {'orders': orders_uuid, customers_uuid: customers_uuid}
+    # unreferenced column is not read
+    assert (orders_uuid, 'comment') not in local_engine._arrays
+    assert local_engine.execute('SELECT count(*) AS cnt FROM orders').cnt.tolist() == [3]
+    local_engine.close()
+
+
+def test_cached_arrays_are_limited_by_size(tmp_path):
+    history_manager = SqlHistoryManager(str(tmp_path / 'history.db'))
+    uuid = _dump(history_manager, pd.DataFrame({'a': range(1000), 'b': ['x'] * 1000}).astype({'b': 'string[pyarrow]'}))
+    local_engine = SqlLocalQueryEngine(history_manager, max_cached_bytes=10_000)
+    assert local_engine.execute(f'SELECT sum(a) AS s FROM "{uuid}"').s.tolist() == [499500]
+    assert list(local_engine._arrays) == [(uuid, 'a')]
+    assert local_engine.execute(f'SELECT count(DISTINCT b) AS cnt FROM "{uuid}"').cnt.tolist() == [1]
+    # the least recently used array is dropped to stay within the limit
+    assert list(local_engine._arrays) == [(uuid, 'b')]
+    local_engine.close()
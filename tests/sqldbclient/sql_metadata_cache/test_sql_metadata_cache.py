@@ -0,0 +1,66 @@
+import threading
+
+import sqlalchemy
+
+from sqldbclient.db_inspector import inspect
+from sqldbclient.sql_executor import SqlExecutor
+from sqldbclient.sql_metadata_cache import SqlMetadataCache
+
+
+def test_ttl_and_copies():
+    cache = SqlMetadataCache(sqlalchemy.create_engine('sqlite://'), ttl=60)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {'columns': ['a']}
+
+    value = cache.get('columns', 't', loader)
+    value['columns'].append('b')
+    assert cache.get('columns', 't', loader) == {'columns': ['a']}
+    assert len(loads) == 1
+    cache.ttl = 0
+    cache.get('columns', 't', loader)
+    assert len(loads) == 2
+    cache.ttl = 60
+    cache.invalidate('views')
+    cache.get('columns', 't', loader)
+    assert len(loads) == 2
+    cache.invalidate()
+    cache.get('columns', 't', loader)
+    assert len(loads) == 3
+
+
+def test_invalidation_after_ddl():
+    engine = sqlalchemy.create_engine('sqlite://', poolclass=sqlalchemy.pool.StaticPool)
+    sql_executor = SqlExecutor(engine=engine, max_rows_read=100, history_db_name=None)
+    sql_executor.execute('CREATE TABLE t (a INTEGER)')
+    inspector = inspect(engine)
+    assert inspect(engine) is inspector
+    assert ' |-- a: INTEGER' in inspector.get_columns_repr('t')
+
+    # data queries keep cache, while schema changes invalidate it
+    sql_executor.execute('INSERT INTO t VALUES (1)')
+    sql_executor.execute('SELECT * FROM t', dump_execution_info=False, dump_result=False)
+    assert inspector.get_views() == []
+    sql_executor.execute('ALTER TABLE t ADD COLUMN b TEXT')
+    sql_executor.execute('CREATE VIEW v AS SELECT a FROM t')
+    assert ' |-- b: TEXT' in inspector.get_columns_repr('t')
+    assert inspector.get_views() == ['v']
+
+
+def test_loading_does_not_block_other_keys():
+    cache = SqlMetadataCache(sqlalchemy.create_engine('sqlite://'))
+    other_key_loaded = threading.Event()
+
+    def slow_loader():
+        # waits for a lookup of another key, which is made while this value is being loaded
+        assert other_key_loaded.wait(timeout=5)
+        return 'slow'
+
+    thread = threading.Thread(target=lambda: cache.get('columns', 'slow', slow_loader))
+    thread.start()
+    assert cache.get('columns', 'fast', lambda: 'fast') == 'fast'
+    other_key_loaded.set()
+    thread.join()
+    assert cache.get('columns', 'slow', lambda: 'reloaded') == 'slow'
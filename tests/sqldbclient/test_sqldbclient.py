@@ -0,0 +1,13 @@
+import subprocess
+import sys
+
+
+def test_import_is_lazy():
+    code = (
+        'import sys, sqldbclient\n'
+        'heavy = [m for m in ("pandas", "sqlalchemy.orm", "sqlparse", "IPython") if m in sys.modules]\n'
+        'assert not heavy, heavy\n'
+        'from sqldbclient import SqlExecutor, SqlExecutorConf\n'
+        'assert "pandas" in sys.modules\n'
+    )
+    subprocess.run([sys.executable, '-c', code], check=True)
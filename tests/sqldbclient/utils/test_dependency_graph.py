@@ -0,0 +1,47 @@
+import threading
+import time
+
+import pytest
+
+from sqldbclient.utils.dependency_graph import DependencyGraph, CyclicDependencyException
+
+
+def _graph() -> DependencyGraph:
+    # root -> a -> c, root -> b -> c, root -> d
+    return (DependencyGraph()
+            .add('root')
+            .add('a', depends_on=['root'])
+            .add('b', depends_on=['root'])
+            .add('c', depends_on=['a', 'b', 'root'])
+            .add('d', depends_on=['root']))
+
+
+def test_topological_order_and_cycles():
+    assert _graph().topological_order() == ['root', 'a', 'b', 'd', 'c']
+    with pytest.raises(CyclicDependencyException):
+        _graph().add('root', depends_on=['c']).topological_order()
+
+
+def test_run_respects_dependencies_and_runs_siblings_concurrently():
+    finished, running, max_running = [], set(), []
+    lock = threading.Lock()
+
+    def process(key):
+        with lock:
+            running.add(key)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(key)
+            finished.append(key)
+
+    _graph().run(process, max_workers=3)
+    assert finished[0] == 'root' and finished[-1] == 'c'
+    assert max(max_running) == 3
+
+    def fail(key):
+        if key == 'a':
+            raise RuntimeError(key)
+
+    with pytest.raises(RuntimeError):
+        _graph().run(fail, max_workers=2)